@@ -0,0 +1,48 @@
+"""
+Batch post-game analysis of an experiment summary.
+
+Scores the games of a run (typically played with --analysis deferred) with
+Stockfish and fills in the CP loss and best-move match metrics.
+"""
+
+import argparse
+import json
+from stockfish_config import get_default_stockfish_path
+from simulation.batch_analysis import analyse_experiment, BATCH_ANALYSIS_MODES
+from simulation.stockfish_pool import shutdown_stockfish_pools
+
+def main():
+    parser = argparse.ArgumentParser(description="Chess Engine Batch Analysis")
+    parser.add_argument("summary", type=str, help="Summary file written by main.py")
+    parser.add_argument("--stockfish", type=str, default=None, help="Path to Stockfish executable (default: the installed one)")
+    parser.add_argument("--jobs", type=int, default=1, help="Games analysed at once, each in its own process with its own Stockfish (0 for all cores)")
+    parser.add_argument("--analysis", choices=BATCH_ANALYSIS_MODES, default="multipv", help="One multipv search per move, or two searches")
+    parser.add_argument("--sf-threads", type=int, default=None, help="Stockfish Threads option")
+    parser.add_argument("--sf-hash", type=int, default=None, help="Stockfish Hash option in MB")
+    parser.add_argument("--output", type=str, default=None, help="Output file (default: update the summary file)")
+
+    args = parser.parse_args()
+
+    stockfish_path = args.stockfish or get_default_stockfish_path()
+    if not stockfish_path:
+        parser.error("Stockfish not found; pass --stockfish")
+
+    with open(args.summary) as f:
+        summary = json.load(f)
+    if not summary.get("games"):
+        parser.error(f"{args.summary} has no game records to analyse")
+
+    stockfish_options = {}
+    if args.sf_threads is not None:
+        stockfish_options["threads"] = args.sf_threads
+    if args.sf_hash is not None:
+        stockfish_options["hash_mb"] = args.sf_hash
+
+    try:
+        analyse_experiment(summary, stockfish_path, jobs=args.jobs or None, stockfish_options=stockfish_options,
+                           mode=args.analysis, output_file=args.output or args.summary)
+    finally:
+        shutdown_stockfish_pools()
+
+if __name__ == "__main__":
+    main()
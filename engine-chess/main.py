@@ -5,46 +5,105 @@ Entry point for the Chess Engine project.
 import argparse
 import os
 from simulation.game_runner import run_experiment
+from simulation.stockfish_pool import shutdown_stockfish_pools
 
 def main():
     parser = argparse.ArgumentParser(description="Chess Engine Experiment Runner")
-    parser.add_argument("--stockfish", type=str, required=False, help="Path to Stockfish executable (required for minimax/hybrid modes)")
+    parser.add_argument("--stockfish", type=str, required=False, help="Path to Stockfish executable (required for minimax/hybrid/mcts modes)")
     parser.add_argument("--games", type=int, default=10, help="Number of games to run")
     parser.add_argument("--depth", type=int, default=3, help="Search depth for engine")
-    parser.add_argument("--mode", type=str, choices=["minimax", "hybrid", "h2h"], default="minimax", help="Engine mode")
+    parser.add_argument("--mode", type=str, choices=["minimax", "hybrid", "mcts", "h2h"], default="minimax", help="Engine mode")
     parser.add_argument("--rollouts", type=int, default=30, help="Number of MC rollouts (hybrid mode)")
+    parser.add_argument("--mcts-iterations", type=int, default=None, help="MCTS iterations per move (mcts mode, or --challenger mcts)")
+    parser.add_argument("--mcts-time", type=float, default=None, help="MCTS thinking time per move in seconds (mcts mode, or --challenger mcts)")
+    parser.add_argument("--challenger", choices=["hybrid", "minimax", "mcts"], default="hybrid", help="Engine playing the Hybrid side in h2h mode (minimax: no MC, to A/B test search options against Baseline)")
+    parser.add_argument("--jobs", type=int, default=1, help="Games played at once, each in its own process (0 for all cores)")
+    parser.add_argument("--sf-threads", type=int, default=None, help="Stockfish Threads option")
+    parser.add_argument("--sf-hash", type=int, default=None, help="Stockfish Hash option in MB")
+    parser.add_argument("--analysis", choices=["multipv", "two-pass", "reuse", "deferred"], default="reuse", help="How Stockfish scores the engine's moves: reusing its own move searches, one multipv search, two searches, or later with analyze.py")
     parser.add_argument("--output", type=str, default="results/summary.json", help="Output file for summary")
+    parser.add_argument("--null-move", action="store_true", help="Enable null-move pruning (Hybrid side in h2h mode)")
+    parser.add_argument("--lmr", action="store_true", help="Enable late-move reductions (Hybrid side in h2h mode)")
+    parser.add_argument("--workers", type=int, default=1, help="Processes for root-parallel search or MCTS (Hybrid side in h2h mode)")
+    parser.add_argument("--evaluator", choices=["static", "pst"], default="static", help="Static evaluation: material only or tapered piece-square tables (Hybrid side in h2h mode)")
+    parser.add_argument("--mc-workers", type=int, default=1, help="Processes for Monte Carlo rollouts in hybrid mode (Hybrid side in h2h mode)")
+    parser.add_argument("--mc-backend", choices=["engine", "vector"], default="engine", help="Rollout implementation in hybrid mode: one game at a time or NumPy lockstep batches (Hybrid side in h2h mode)")
+    parser.add_argument("--adaptive-rollouts", action="store_true", help="Stop the rollouts of a leaf early once their mean is certain enough (Hybrid side in h2h mode)")
+    parser.add_argument("--selective-mc", action="store_true", help="Run rollouts only on leaves the static evaluation cannot settle (Hybrid side in h2h mode)")
 
     args = parser.parse_args()
 
     # Validate stockfish argument
     if args.mode != "h2h" and not args.stockfish:
-        parser.error("--stockfish is required for minimax and hybrid modes")
+        parser.error("--stockfish is required for minimax, hybrid and mcts modes")
+
+    search_options = {}
+    if args.null_move:
+        search_options["null_move"] = True
+    if args.lmr:
+        search_options["lmr"] = True
+    if args.workers != 1:
+        search_options["workers"] = args.workers
+    if args.mc_workers != 1:
+        search_options["mc_workers"] = args.mc_workers
+    if args.mc_backend != "engine":
+        search_options["mc_backend"] = args.mc_backend
+    if args.adaptive_rollouts:
+        search_options["adaptive_rollouts"] = True
+    if args.selective_mc:
+        search_options["selective_mc"] = True
+    if args.evaluator != "static":
+        search_options["evaluator"] = args.evaluator
+
+    mcts_options = None
+    if args.mode == "mcts" or (args.mode == "h2h" and args.challenger == "mcts"):
+        mcts_options = {"iterations": args.mcts_iterations, "time_limit": args.mcts_time}
+        if args.workers != 1:
+            mcts_options["workers"] = args.workers
 
     if args.mode == "h2h":
         from simulation.game_runner import run_h2h_experiment
+        if args.challenger == "minimax":
+            search_options["use_mc"] = False
         print(f"Running H2H Experiment: Games={args.games}, Depth={args.depth}, Rollouts={args.rollouts}")
         summary = run_h2h_experiment(
             n_games=args.games,
             depth=args.depth,
             rollouts=args.rollouts,
-            output_file=args.output
+            output_file=args.output,
+            hybrid_options=search_options,
+            mcts_options=mcts_options,
+            jobs=args.jobs or None
         )
         print(f"H2H Results: {summary['results']}")
         return
 
+    stockfish_options = {}
+    if args.sf_threads is not None:
+        stockfish_options["threads"] = args.sf_threads
+    if args.sf_hash is not None:
+        stockfish_options["hash_mb"] = args.sf_hash
+
     use_mc = (args.mode == "hybrid")
     
     print(f"Running Experiment: Mode={args.mode}, Games={args.games}, Depth={args.depth}")
     
-    summary = run_experiment(
-        n_games=args.games,
-        stockfish_path=args.stockfish,
-        engine_depth=args.depth,
-        use_mc=use_mc,
-        rollout_count=args.rollouts,
-        output_file=args.output
-    )
+    try:
+        summary = run_experiment(
+            n_games=args.games,
+            stockfish_path=args.stockfish,
+            engine_depth=args.depth,
+            use_mc=use_mc,
+            rollout_count=args.rollouts,
+            output_file=args.output,
+            search_options=search_options,
+            mcts_options=mcts_options,
+            jobs=args.jobs or None,
+            stockfish_options=stockfish_options,
+            analysis=args.analysis
+        )
+    finally:
+        shutdown_stockfish_pools()
     
     # Generate charts
     from simulation.charts import generate_charts
@@ -0,0 +1,77 @@
+"""
+Bounded LRU cache of leaf evaluations.
+Entries are keyed by the Polyglot Zobrist hash of the position plus the
+evaluator configuration that produced the score, so one cache can be kept
+for a whole game (or web worker) and shared between engine settings.
+"""
+
+import threading
+from collections import OrderedDict
+
+# Rough size of one cached entry (dict slot, key tuple, score) in bytes,
+# used to turn a memory budget into an entry count
+ENTRY_BYTES = 200
+
+DEFAULT_MAX_ENTRIES = 2 ** 17
+
+
+class EvalCache:
+    """
+    Least-recently-used evaluation cache.
+
+    Args:
+        max_entries: Number of entries kept before the least recently used
+            one is evicted.
+        max_bytes: Memory budget instead of max_entries (approximate, see ENTRY_BYTES).
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=None):
+        if max_bytes is not None:
+            max_entries = max_bytes // ENTRY_BYTES
+        if max_entries <= 0:
+            raise ValueError("Evaluation cache size must be positive")
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        # Web workers may serve several requests from threads
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, config):
+        """
+        Returns the score cached for position key under config, or None.
+        """
+        with self._lock:
+            score = self._entries.get((key, config))
+            if score is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((key, config))
+            self.hits += 1
+            return score
+
+    def put(self, key, config, score):
+        with self._lock:
+            self._entries[(key, config)] = score
+            self._entries.move_to_end((key, config))
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        if not lookups:
+            return 0.0
+        return self.hits / lookups
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
@@ -4,6 +4,12 @@ Monte Carlo evaluator using random rollouts.
 
 import chess
 import random
+import time
+from .rollout import RolloutEngine
+from .rollout_vector import VectorRollouts
+
+# Rollouts of evaluate_mc when no engine is passed in
+default_engine = RolloutEngine()
 
 def simulate_random(board: chess.Board, max_steps=20) -> float:
     """
@@ -39,13 +45,44 @@ def simulate_random(board: chess.Board, max_steps=20) -> float:
     # But strictly following "Return nilai float -1 sampai 1", 0.0 is safe for unfinished.
     return 0.0
 
-def evaluate_mc(board: chess.Board, rollout_count=30) -> float:
+def evaluate_mc(board: chess.Board, rollout_count=30, engine=None) -> float:
     """
     Runs multiple random simulations and returns the average score.
     Range: -1.0 (Black wins all) to 1.0 (White wins all).
+    The games are played by a RolloutEngine (default_engine unless given),
+    which plays them like simulate_random, only faster. Any rollout backend
+    with the same evaluate() works as engine, e.g. VectorRollouts, which
+    plays all rollout_count games in lockstep on NumPy bitboards.
     """
-    total_score = 0.0
-    for _ in range(rollout_count):
-        total_score += simulate_random(board)
-    
-    return total_score / rollout_count
+    if engine is None:
+        engine = default_engine
+    return engine.evaluate(board, rollout_count)
+
+def measure_rollout_speed(fens, rollouts=200, max_steps=20):
+    """
+    Compares simulate_random with RolloutEngine and VectorRollouts on fens.
+    Returns {"reference", "fast", "vector": rollouts/sec, "fast_plies", "vector_plies": plies/sec}.
+    """
+    boards = [chess.Board(fen) for fen in fens]
+
+    start = time.perf_counter()
+    for board in boards:
+        for _ in range(rollouts):
+            simulate_random(board, max_steps)
+    reference = len(boards) * rollouts / (time.perf_counter() - start)
+
+    engine = RolloutEngine()
+    for board in boards:
+        engine.evaluate(board, rollouts, max_steps)
+
+    vector = VectorRollouts()
+    vector.evaluate_many(boards, rollouts, max_steps)
+
+    print(f"simulate_random: {reference:.0f} rollouts/s")
+    print(f"RolloutEngine:   {engine.rollouts_per_sec:.0f} rollouts/s, {engine.plies_per_sec:.0f} plies/s "
+          f"(x{engine.rollouts_per_sec / reference:.1f})")
+    print(f"VectorRollouts:  {vector.rollouts_per_sec:.0f} rollouts/s, {vector.plies_per_sec:.0f} plies/s "
+          f"(x{vector.rollouts_per_sec / reference:.1f})")
+    return {"reference": reference, "fast": engine.rollouts_per_sec, "fast_plies": engine.plies_per_sec,
+            "vector": vector.rollouts_per_sec, "vector_plies": vector.plies_per_sec}
+
@@ -0,0 +1,272 @@
+"""
+Tapered piece-square-table evaluator.
+Midgame and endgame scores are summed separately from PeSTO-style tables and
+blended by game phase. Output is in evaluate_static units (Pawn=10), so
+search margins and mate scores carry over.
+"""
+
+import chess
+from .evaluator_static import MATE_SCORE
+
+# Piece values in centipawns, indexed by piece type (index 0 unused)
+MG_VALUES = [0, 82, 337, 365, 477, 1025, 0]
+EG_VALUES = [0, 94, 281, 297, 512, 936, 0]
+
+# Game phase weight per piece type; 24 is the full opening phase
+PHASE_WEIGHTS = [0, 0, 1, 1, 2, 4, 0]
+MAX_PHASE = 24
+
+# Centipawns per evaluate_static unit
+SCALE = 10
+
+# Tables from White's point of view, a8 first (flip with square ^ 56 for White)
+MG_PAWN = [
+      0,   0,   0,   0,   0,   0,  0,   0,
+     98, 134,  61,  95,  68, 126, 34, -11,
+     -6,   7,  26,  31,  65,  56, 25, -20,
+    -14,  13,   6,  21,  23,  12, 17, -23,
+    -27,  -2,  -5,  12,  17,   6, 10, -25,
+    -26,  -4,  -4, -10,   3,   3, 33, -12,
+    -35,  -1, -20, -23, -15,  24, 38, -22,
+      0,   0,   0,   0,   0,   0,  0,   0,
+]
+EG_PAWN = [
+      0,   0,   0,   0,   0,   0,   0,   0,
+    178, 173, 158, 134, 147, 132, 165, 187,
+     94, 100,  85,  67,  56,  53,  82,  84,
+     32,  24,  13,   5,  -2,   4,  17,  17,
+     13,   9,  -3,  -7,  -7,  -8,   3,  -1,
+      4,   7,  -6,   1,   0,  -5,  -1,  -8,
+     13,   8,   8,  10,  13,   0,   2,  -7,
+      0,   0,   0,   0,   0,   0,   0,   0,
+]
+MG_KNIGHT = [
+    -167, -89, -34, -49,  61, -97, -15, -107,
+     -73, -41,  72,  36,  23,  62,   7,  -17,
+     -47,  60,  37,  65,  84, 129,  73,   44,
+      -9,  17,  19,  53,  37,  69,  18,   22,
+     -13,   4,  16,  13,  28,  19,  21,   -8,
+     -23,  -9,  12,  10,  19,  17,  25,  -16,
+     -29, -53, -12,  -3,  -1,  18, -14,  -19,
+    -105, -21, -58, -33, -17, -28, -19,  -23,
+]
+EG_KNIGHT = [
+    -58, -38, -13, -28, -31, -27, -63, -99,
+    -25,  -8, -25,  -2,  -9, -25, -24, -52,
+    -24, -20,  10,   9,  -1,  -9, -19, -41,
+    -17,   3,  22,  22,  22,  11,   8, -18,
+    -18,  -6,  16,  25,  16,  17,   4, -18,
+    -23,  -3,  -1,  15,  10,  -3, -20, -22,
+    -42, -20, -10,  -5,  -2, -20, -23, -44,
+    -29, -51, -23, -15, -22, -18, -50, -64,
+]
+MG_BISHOP = [
+    -29,   4, -82, -37, -25, -42,   7,  -8,
+    -26,  16, -18, -13,  30,  59,  18, -47,
+    -16,  37,  43,  40,  35,  50,  37,  -2,
+     -4,   5,  19,  50,  37,  37,   7,  -2,
+     -6,  13,  13,  26,  34,  12,  10,   4,
+      0,  15,  15,  15,  14,  27,  18,  10,
+      4,  15,  16,   0,   7,  21,  33,   1,
+    -33,  -3, -14, -21, -13, -12, -39, -21,
+]
+EG_BISHOP = [
+    -14, -21, -11,  -8,  -7,  -9, -17, -24,
+     -8,  -4,   7, -12,  -3, -13,  -4, -14,
+      2,  -8,   0,  -1,  -2,   6,   0,   4,
+     -3,   9,  12,   9,  14,  10,   3,   2,
+     -6,   3,  13,  19,   7,  10,  -3,  -9,
+    -12,  -3,   8,  10,  13,   3,  -7, -15,
+    -14, -18,  -7,  -1,   4,  -9, -15, -27,
+    -23,  -9, -23,  -5,  -9, -16,  -5, -17,
+]
+MG_ROOK = [
+     32,  42,  32,  51,  63,   9,  31,  43,
+     27,  32,  58,  62,  80,  67,  26,  44,
+     -5,  19,  26,  36,  17,  45,  61,  16,
+    -24, -11,   7,  26,  24,  35,  -8, -20,
+    -36, -26, -12,  -1,   9,  -7,   6, -23,
+    -45, -25, -16, -17,   3,   0,  -5, -33,
+    -44, -16, -20,  -9,  -1,  11,  -6, -71,
+    -19, -13,   1,  17,  16,   7, -37, -26,
+]
+EG_ROOK = [
+     13,  10,  18,  15,  12,  12,   8,   5,
+     11,  13,  13,  11,  -3,   3,   8,   3,
+      7,   7,   7,   5,   4,  -3,  -5,  -3,
+      4,   3,  13,   1,   2,   1,  -1,   2,
+      3,   5,   8,   4,  -5,  -6,  -8, -11,
+     -4,   0,  -5,  -1,  -7, -12,  -8, -16,
+     -6,  -6,   0,   2,  -9,  -9, -11,  -3,
+     -9,   2,   3,  -1,  -5, -13,   4, -20,
+]
+MG_QUEEN = [
+    -28,   0,  29,  12,  59,  44,  43,  45,
+    -24, -39,  -5,   1, -16,  57,  28,  54,
+    -13, -17,   7,   8,  29,  56,  47,  57,
+    -27, -27, -16, -16,  -1,  17,  -2,   1,
+     -9, -26,  -9, -10,  -2,  -4,   3,  -3,
+    -14,   2, -11,  -2,  -5,   2,  14,   5,
+    -35,  -8,  11,   2,   8,  15,  -3,   1,
+     -1, -18,  -9,  10, -15, -25, -31, -50,
+]
+EG_QUEEN = [
+     -9,  22,  22,  27,  27,  19,  10,  20,
+    -17,  20,  32,  41,  58,  25,  30,   0,
+    -20,   6,   9,  49,  47,  35,  19,   9,
+      3,  22,  24,  45,  57,  40,  57,  36,
+    -18,  28,  19,  47,  31,  34,  39,  23,
+    -16, -27,  15,   6,   9,  17,  10,   5,
+    -22, -23, -30, -16, -16, -23, -36, -32,
+    -33, -28, -22, -43,  -5, -32, -20, -41,
+]
+MG_KING = [
+    -65,  23,  16, -15, -56, -34,   2,  13,
+     29,  -1, -20,  -7,  -8,  -4, -38, -29,
+     -9,  24,   2, -16, -20,   6,  22, -22,
+    -17, -20, -12, -27, -30, -25, -14, -36,
+    -49,  -1, -27, -39, -46, -44, -33, -51,
+    -14, -14, -22, -46, -44, -30, -15, -27,
+      1,   7,  -8, -64, -43, -16,   9,   8,
+    -15,  36,  12, -54,   8, -28,  24,  14,
+]
+EG_KING = [
+    -74, -35, -18, -18, -11,  15,   4, -17,
+    -12,  17,  14,  17,  17,  38,  23,  11,
+     10,  17,  23,  15,  20,  45,  44,  13,
+     -8,  22,  24,  27,  26,  33,  26,   3,
+    -18,  -4,  21,  24,  27,  23,   9, -11,
+    -19,  -3,  11,  21,  23,  16,   7,  -9,
+    -27, -11,   4,  13,  14,   4,  -5, -17,
+    -53, -34, -21, -11, -28, -14, -24, -43,
+]
+
+MG_TABLES = [None, MG_PAWN, MG_KNIGHT, MG_BISHOP, MG_ROOK, MG_QUEEN, MG_KING]
+EG_TABLES = [None, EG_PAWN, EG_KNIGHT, EG_BISHOP, EG_ROOK, EG_QUEEN, EG_KING]
+
+
+def _build_flat_table(values, tables):
+    """
+    Flat array of signed piece value + table bonus, indexed by
+    (color * 7 + piece_type) * 64 + square. Black entries are negative.
+    """
+    flat = [0] * (2 * 7 * 64)
+    for piece_type in chess.PIECE_TYPES:
+        for square in chess.SQUARES:
+            flat[(chess.WHITE * 7 + piece_type) * 64 + square] = values[piece_type] + tables[piece_type][square ^ 56]
+            flat[(chess.BLACK * 7 + piece_type) * 64 + square] = -(values[piece_type] + tables[piece_type][square])
+    return flat
+
+MG_FLAT = _build_flat_table(MG_VALUES, MG_TABLES)
+EG_FLAT = _build_flat_table(EG_VALUES, EG_TABLES)
+
+
+def pst_state(board: chess.Board):
+    """
+    Returns (midgame, endgame, phase) of board, midgame/endgame in centipawns
+    from White's point of view.
+    """
+    mg = eg = phase = 0
+    for color in chess.COLORS:
+        for piece_type in chess.PIECE_TYPES:
+            offset = (color * 7 + piece_type) * 64
+            for square in chess.scan_forward(board.pieces_mask(piece_type, color)):
+                mg += MG_FLAT[offset + square]
+                eg += EG_FLAT[offset + square]
+                phase += PHASE_WEIGHTS[piece_type]
+    return mg, eg, phase
+
+
+def tapered_score(mg, eg, phase):
+    """Blends midgame and endgame scores by phase, in evaluate_static units."""
+    phase = min(phase, MAX_PHASE)
+    return (mg * phase + eg * (MAX_PHASE - phase)) / (MAX_PHASE * SCALE)
+
+
+def evaluate_pst(board: chess.Board) -> float:
+    """
+    Tapered piece-square-table score of the board.
+    Positive for White advantage, negative for Black advantage.
+    """
+    if board.is_game_over():
+        if board.is_checkmate():
+            return -MATE_SCORE if board.turn == chess.WHITE else MATE_SCORE
+        return 0 # Draw
+    return tapered_score(*pst_state(board))
+
+
+def pst_delta(board: chess.Board, move: chess.Move):
+    """
+    Change of pst_state caused by move, computed before it is pushed.
+    Returns (midgame, endgame, phase) differences.
+    """
+    color = board.turn
+    piece_type = board.piece_type_at(move.from_square)
+    own = color * 7 * 64
+    other = (not color) * 7 * 64
+
+    if board.is_castling(move):
+        rank = chess.square_rank(move.from_square)
+        kingside = board.is_kingside_castling(move)
+        king_to = chess.square(6 if kingside else 2, rank)
+        rook_from = chess.square(7 if kingside else 0, rank) if move.to_square == king_to else move.to_square
+        rook_to = chess.square(5 if kingside else 3, rank)
+        king = own + chess.KING * 64
+        rook = own + chess.ROOK * 64
+        mg = (MG_FLAT[king + king_to] - MG_FLAT[king + move.from_square]
+              + MG_FLAT[rook + rook_to] - MG_FLAT[rook + rook_from])
+        eg = (EG_FLAT[king + king_to] - EG_FLAT[king + move.from_square]
+              + EG_FLAT[rook + rook_to] - EG_FLAT[rook + rook_from])
+        return mg, eg, 0
+
+    moved_to = own + (move.promotion or piece_type) * 64 + move.to_square
+    moved_from = own + piece_type * 64 + move.from_square
+    mg = MG_FLAT[moved_to] - MG_FLAT[moved_from]
+    eg = EG_FLAT[moved_to] - EG_FLAT[moved_from]
+    phase = 0
+    if move.promotion:
+        phase += PHASE_WEIGHTS[move.promotion]
+
+    if board.is_en_passant(move):
+        captured_square = move.to_square - 8 if color == chess.WHITE else move.to_square + 8
+        captured_type = chess.PAWN
+    else:
+        captured_square = move.to_square
+        captured_type = board.piece_type_at(move.to_square)
+    if captured_type:
+        captured = other + captured_type * 64 + captured_square
+        mg -= MG_FLAT[captured]
+        eg -= EG_FLAT[captured]
+        phase -= PHASE_WEIGHTS[captured_type]
+    return mg, eg, phase
+
+
+class PSTTracker:
+    """
+    Keeps pst_state up to date across push/pop during a search.
+    """
+
+    def __init__(self):
+        self.mg = self.eg = self.phase = 0
+        self._deltas = []
+
+    def reset(self, board: chess.Board):
+        self.mg, self.eg, self.phase = pst_state(board)
+        self._deltas = []
+
+    def push(self, board: chess.Board, move: chess.Move):
+        """Call before board.push(move)."""
+        delta = pst_delta(board, move)
+        self.mg += delta[0]
+        self.eg += delta[1]
+        self.phase += delta[2]
+        self._deltas.append(delta)
+
+    def pop(self):
+        delta = self._deltas.pop()
+        self.mg -= delta[0]
+        self.eg -= delta[1]
+        self.phase -= delta[2]
+
+    def score(self):
+        return tapered_score(self.mg, self.eg, self.phase)
@@ -15,23 +15,74 @@ PIECE_VALUES = {
     chess.KING: 900
 }
 
+# Score of a checkmate (positive when White delivers it)
+MATE_SCORE = 9999
+
 def evaluate_static(board: chess.Board) -> int:
     """
     Calculates the material score of the board.
     Positive for White advantage, negative for Black advantage.
     """
+    return evaluate_material(board, material_score(board))
+
+def evaluate_material(board: chess.Board, material: int) -> int:
+    """
+    evaluate_static with the material balance already known, e.g. kept up
+    to date incrementally with material_delta during a search.
+    """
     if board.is_game_over():
         if board.is_checkmate():
-            return -9999 if board.turn == chess.WHITE else 9999
+            return -MATE_SCORE if board.turn == chess.WHITE else MATE_SCORE
         return 0 # Draw
+    return material
 
+def material_score(board: chess.Board) -> int:
+    """
+    White material minus Black material, from bitboard popcounts.
+    """
     score = 0
-    for square in chess.SQUARES:
-        piece = board.piece_at(square)
-        if piece:
-            value = PIECE_VALUES[piece.piece_type]
-            if piece.color == chess.WHITE:
-                score += value
-            else:
-                score -= value
+    for piece_type, value in PIECE_VALUES.items():
+        score += value * (chess.popcount(board.pieces_mask(piece_type, chess.WHITE))
+                          - chess.popcount(board.pieces_mask(piece_type, chess.BLACK)))
     return score
+
+def material_delta(board: chess.Board, move: chess.Move) -> int:
+    """
+    Change of material_score caused by move, computed before it is pushed.
+    """
+    delta = 0
+    if board.is_en_passant(move):
+        delta = PIECE_VALUES[chess.PAWN]
+    else:
+        captured = board.piece_type_at(move.to_square)
+        # Castling is encoded as the king capturing its own rook
+        if captured and board.color_at(move.to_square) != board.turn:
+            delta = PIECE_VALUES[captured]
+    if move.promotion:
+        delta += PIECE_VALUES[move.promotion] - PIECE_VALUES[chess.PAWN]
+    return delta if board.turn == chess.WHITE else -delta
+
+class MaterialTracker:
+    """
+    Keeps material_score up to date across push/pop during a search.
+    """
+
+    def __init__(self):
+        self.material = 0
+        self._deltas = []
+
+    def reset(self, board: chess.Board):
+        self.material = material_score(board)
+        self._deltas = []
+
+    def push(self, board: chess.Board, move: chess.Move):
+        """Call before board.push(move)."""
+        delta = material_delta(board, move)
+        self.material += delta
+        self._deltas.append(delta)
+
+    def pop(self):
+        self.material -= self._deltas.pop()
+
+    def score(self):
+        return self.material
@@ -0,0 +1,232 @@
+"""
+Monte Carlo Tree Search (UCT) engine.
+
+Every iteration walks down the tree from the root, picking children by the
+UCT formula, expands one untried move, scores the new node with a random
+rollout (the games of simulate_random, played by a RolloutEngine) and backs
+the result up the path. The move played is the most visited root child.
+
+An MCTS object keeps its tree between searches: the next search re-roots it
+on the node of the new position (found up to REUSE_PLIES below the old root,
+by Zobrist key), so the statistics of the line actually played are kept.
+With workers > 1 a search is root-parallel instead (see minimax.parallel_mcts).
+"""
+
+import chess
+import math
+import random
+import time
+
+from .rollout import RolloutEngine
+from .stats import SearchStats, SearchResult
+from .transposition import position_key
+
+# UCT exploration constant (results are in [-1, 1])
+EXPLORATION = 1.4
+
+# Iterations of a search given neither iterations nor a time limit
+MCTS_ITERATIONS = 1000
+
+# Plies below the old root searched for the new position (our move + reply)
+REUSE_PLIES = 2
+
+
+def _game_result(board: chess.Board):
+    """Result of a finished game from White's point of view, None if not finished."""
+    outcome = board.outcome()
+    if outcome is None:
+        return None
+    if outcome.winner is None:
+        return 0.0
+    return 1.0 if outcome.winner == chess.WHITE else -1.0
+
+
+class MCTSNode:
+    """
+    One position of the tree. value sums the results of the visits from the
+    point of view of the side that played move (so parents maximize it).
+    """
+
+    __slots__ = ("move", "parent", "children", "untried", "visits", "value", "result")
+
+    def __init__(self, board: chess.Board, move=None, parent=None, rng=random):
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.result = _game_result(board)
+        self.untried = [] if self.result is not None else list(board.legal_moves)
+        rng.shuffle(self.untried)
+        self.visits = 0
+        self.value = 0.0
+
+    def uct_child(self, exploration):
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda child: child.value / child.visits
+                   + exploration * math.sqrt(log_visits / child.visits))
+
+    def most_visited(self):
+        return max(self.children, key=lambda child: child.visits)
+
+    def height(self) -> int:
+        """Plies of the deepest expanded line below this node."""
+        return 1 + max((child.height() for child in self.children), default=-1)
+
+
+class MCTS:
+    """
+    UCT search with a tree kept across moves.
+
+    Args:
+        exploration: UCT exploration constant.
+        max_steps: Plies of each rollout (as simulate_random).
+        engine: RolloutEngine playing the rollouts (default: a new one).
+        rng: random.Random for the expansion order (default: the random module).
+    """
+
+    def __init__(self, exploration=EXPLORATION, max_steps=20, engine=None, rng=None):
+        self.exploration = exploration
+        self.max_steps = max_steps
+        self.rng = rng if rng is not None else random
+        self.engine = engine if engine is not None else RolloutEngine(rng)
+        self.root = None
+        self.root_board = None
+
+    def reset(self):
+        """Drops the tree, e.g. at the start of a new game."""
+        self.root = None
+        self.root_board = None
+
+    def _reroot(self, board: chess.Board):
+        """
+        Makes the node of board the root, keeping its subtree if board is
+        at most REUSE_PLIES below the current root; starts a new tree otherwise.
+        """
+        key = position_key(board)
+        if self.root is not None:
+            frontier = [(self.root, [])]
+            for _ in range(REUSE_PLIES + 1):
+                next_frontier = []
+                for node, path in frontier:
+                    position = self.root_board.copy(stack=False)
+                    for move in path:
+                        position.push(move)
+                    if position_key(position) == key:
+                        node.parent = None
+                        node.move = None
+                        self.root = node
+                        self.root_board = board.copy()
+                        return
+                    next_frontier.extend((child, path + [child.move]) for child in node.children)
+                frontier = next_frontier
+        self.root = MCTSNode(board, rng=self.rng)
+        self.root_board = board.copy()
+
+    def _iterate(self):
+        """One selection-expansion-rollout-backpropagation pass."""
+        # Walk on the root board itself and undo the moves afterwards: no copy
+        # per iteration, and the game history stays there for repetitions
+        node = self.root
+        board = self.root_board
+        plies = 0
+        while not node.untried and node.children:
+            node = node.uct_child(self.exploration)
+            board.push(node.move)
+            plies += 1
+
+        if node.untried:
+            move = node.untried.pop()
+            board.push(move)
+            plies += 1
+            child = MCTSNode(board, move, node, self.rng)
+            node.children.append(child)
+            node = child
+
+        result = node.result
+        if result is None:
+            result = self.engine.rollout(board, self.max_steps)
+
+        # board.turn is the side to move at node; the parent's mover is the other one
+        mover_is_white = board.turn == chess.BLACK
+        for _ in range(plies):
+            board.pop()
+        while node is not None:
+            node.visits += 1
+            node.value += result if mover_is_white else -result
+            mover_is_white = not mover_is_white
+            node = node.parent
+
+    def search(self, board: chess.Board, iterations=None, time_limit=None, stats=None, workers=1) -> SearchResult:
+        """
+        Grows the tree from board for iterations iterations and/or time_limit
+        seconds, whichever ends first (MCTS_ITERATIONS if neither is given).
+        Returns a SearchResult whose score is the mean result of the chosen
+        move from White's point of view in MC units (evaluate_mc * 1000) and
+        whose depth is the height of the tree.
+
+        workers > 1 (or None for all cores) grows independent trees in worker
+        processes and merges their root statistics (see minimax.parallel_mcts);
+        this tree is then left as it is.
+        """
+        if workers != 1:
+            from .parallel_mcts import search_mcts_parallel
+            return search_mcts_parallel(board, iterations, time_limit, workers, self.rng.getrandbits(32),
+                                        self.exploration, self.max_steps, stats)
+
+        start_time = time.time()
+        if stats is None:
+            stats = SearchStats()
+        if iterations is None and time_limit is None:
+            iterations = MCTS_ITERATIONS
+        deadline = None if time_limit is None else start_time + time_limit
+        rollouts = self.engine.rollouts
+        plies = self.engine.plies
+        elapsed = self.engine.elapsed
+
+        self._reroot(board)
+        count = 0
+        if self.root.untried or self.root.children:
+            while iterations is None or count < iterations:
+                if deadline is not None and time.time() >= deadline:
+                    break
+                self._iterate()
+                count += 1
+
+        stats.nodes += count
+        stats.mc_evaluations += self.engine.rollouts - rollouts
+        stats.rollouts += self.engine.rollouts - rollouts
+        stats.rollout_plies += self.engine.plies - plies
+        stats.rollout_time += self.engine.elapsed - elapsed
+        return self._result(board, stats, time.time() - start_time)
+
+    def _result(self, board, stats, elapsed):
+        if not self.root.children:
+            return SearchResult(None, None, 0, [], elapsed, stats)
+        best = self.root.most_visited()
+        score = 1000 * best.value / best.visits
+        if board.turn == chess.BLACK:
+            score = -score
+        pv = []
+        node = self.root
+        while node.children:
+            node = node.most_visited()
+            pv.append(node.move)
+        return SearchResult(best.move, score, self.root.height(), pv, elapsed, stats)
+
+
+def mcts_search(board: chess.Board, iterations=None, time_limit=None, tree=None, stats=None, workers=1,
+                **options):
+    """
+    Runs an MCTS search on board. Pass the same MCTS as tree on every move
+    of a game to reuse it; options (exploration, max_steps, ...) configure a
+    new tree when none is given. workers as in MCTS.search.
+    """
+    if tree is None:
+        tree = MCTS(**options)
+    return tree.search(board, iterations, time_limit, stats, workers)
+
+
+def select_best_move_mcts(board: chess.Board, iterations=None, time_limit=None, tree=None, workers=1, **options):
+    """
+    Returns the best move of mcts_search().
+    """
+    return mcts_search(board, iterations, time_limit, tree, workers=workers, **options).best_move
@@ -5,69 +5,789 @@ Supports switching between Static Evaluation and Monte Carlo Evaluation.
 
 import chess
 import math
-from .evaluator_static import evaluate_static
+import time
+from .evaluator_static import PIECE_VALUES, MATE_SCORE, MaterialTracker
+from .evaluator_pst import PSTTracker
 from .evaluator_mc import evaluate_mc
+from .rollout import RolloutEngine, ROLLOUT_TOLERANCE
+from .rollout_vector import VectorRollouts
+from .transposition import TranspositionTable, position_key, EXACT, LOWER, UPPER
+from .move_ordering import MoveOrderer, mvv_lva
+from .stats import SearchStats, SearchResult
 
-def minimax(board: chess.Board, depth: int, alpha: float, beta: float, maximizing: bool, use_mc=False, rollout_count=30):
+# Upper bound on iterative deepening when only a time budget is given
+MAX_DEPTH = 64
 
-    if depth == 0 or board.is_game_over():
-        if use_mc:
-            return evaluate_mc(board, rollout_count) * 1000 
+# Quiescence search: nodes allowed per horizon leaf, and the safety margin
+# (in evaluate_static units) for delta pruning
+QSEARCH_NODE_LIMIT = 400
+DELTA_MARGIN = 20
+
+# Half-width of the root aspiration window around the previous iteration's
+# score, in evaluate_static units and in MC units (evaluate_mc * 1000)
+ASPIRATION_WINDOW = 5
+MC_ASPIRATION_WINDOW = 100
+
+# Mate score in MC units: a finished rollout scores +-1 in evaluate_mc
+MC_MATE_SCORE = 1000
+
+# Selective hybrid: leaves whose static score is within MC_BAND (evaluate_static
+# units) of equality get rollouts; clearer ones are scored statically, scaled
+# so that a queen up maps to a certain win (1000 in MC units)
+MC_BAND = 10
+MC_PER_STATIC = 1000 / PIECE_VALUES[chess.QUEEN]
+
+# Null-move pruning: depth reduction and the shallowest depth it is tried at
+NULL_MOVE_REDUCTION = 2
+NULL_MOVE_MIN_DEPTH = 3
+
+# Late-move reductions: moves searched at full depth before reducing,
+# the shallowest depth reductions apply at, and the reduction in plies
+LMR_FULL_DEPTH_MOVES = 3
+LMR_MIN_DEPTH = 3
+LMR_REDUCTION = 1
+
+# Squares on a rank, file or diagonal through each square: a piece off every
+# line through its own king cannot be pinned
+ALIGNED = [
+    sum(chess.BB_SQUARES[other] for other in chess.SQUARES if other != square and chess.BB_RAYS[square][other])
+    for square in chess.SQUARES
+]
+
+# Static evaluators selectable with evaluator=..., each kept up to date
+# incrementally on push/pop ("static" = evaluate_static, "pst" = evaluate_pst)
+EVALUATORS = {
+    "static": MaterialTracker,
+    "pst": PSTTracker,
+}
+
+# Serial rollout backends selectable with mc_backend=...: one game at a time
+# (RolloutEngine, the default) or all rollouts of a batch in lockstep
+MC_BACKENDS = ("engine", "vector")
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the deadline has passed."""
+
+class SearchContext:
+    """
+    State shared by every node of one search: evaluator settings, transposition
+    table, deadline, move ordering tables and counters.
+    """
+
+    def __init__(self, use_mc=False, rollout_count=30, tt=None, deadline=None, orderer=None, stats=None,
+                 quiescence=False, qsearch_node_limit=QSEARCH_NODE_LIMIT, null_move=False, lmr=False,
+                 evaluator="static", eval_cache=None, rollout_backend=None,
+                 adaptive_rollouts=False, rollout_tolerance=ROLLOUT_TOLERANCE,
+                 selective_mc=False, mc_band=MC_BAND, root_bound=None):
+        if evaluator not in EVALUATORS:
+            raise ValueError(f"Unknown evaluator: {evaluator}")
+        self.use_mc = use_mc
+        self.rollout_count = rollout_count
+        self.tt = tt
+        self.deadline = deadline
+        self.orderer = orderer
+        self.stats = stats if stats is not None else SearchStats()
+        self.quiescence = quiescence
+        self.qsearch_node_limit = qsearch_node_limit
+        self.qsearch_nodes_left = 0
+        self.null_move = null_move
+        self.lmr = lmr
+        self.evaluator = evaluator
+        # Static score of the searched position (White's point of view)
+        self.tracker = EVALUATORS[evaluator]()
+        # EvalCache for Monte Carlo leaf scores, which cost far more than a hash
+        self.eval_cache = eval_cache
+        # RolloutEngine, or a ParallelRollouts backend running on worker processes
+        self.rollout_engine = rollout_backend if rollout_backend is not None else RolloutEngine()
+        # Stop the rollouts of a leaf early (see RolloutEngine.evaluate_adaptive)
+        self.adaptive_rollouts = adaptive_rollouts and rollout_backend is None
+        self.rollout_tolerance = rollout_tolerance
+        # Rollouts only on leaves the static evaluation cannot settle
+        self.selective_mc = selective_mc
+        self.mc_band = mc_band
+        # Score the children of depth-1 nodes in one batch: one round trip to
+        # the workers for parallel rollouts, one lockstep batch for vector
+        # rollouts (static leaves are already O(1) with the trackers)
+        self.batch_frontier = use_mc and rollout_backend is not None and not quiescence
+        # Callable returning the current beta of ply-1 nodes, polled before each
+        # of their moves: root-parallel workers searching one root move each
+        # tighten their window as other workers raise the best root score
+        self.root_bound = root_bound
+
+    @property
+    def aspiration_window(self):
+        return MC_ASPIRATION_WINDOW if self.use_mc else ASPIRATION_WINDOW
+
+    def set_root(self, board):
+        """Starts incremental evaluation from board."""
+        self.tracker.reset(board)
+
+    def push(self, board, move):
+        self.tracker.push(board, move)
+        board.push(move)
+
+    def pop(self, board):
+        self.tracker.pop()
+        board.pop()
+
+    @property
+    def eval_config(self):
+        """Evaluator settings that cached scores depend on."""
+        if self.adaptive_rollouts:
+            return ("mc", self.rollout_count, self.rollout_tolerance)
+        return ("mc", self.rollout_count)
+
+    @property
+    def mate_score(self):
+        return MC_MATE_SCORE if self.use_mc else MATE_SCORE
+
+    def evaluate(self, board, low=-math.inf, high=math.inf):
+        """
+        Score of a position that is not game over, from White's point of view.
+        Terminal positions are detected by the search itself (see _terminal_score).
+        (low, high) is the window of scores that matter to the caller, also
+        from White's point of view; adaptive rollouts stop once outside it.
+        """
+        if self.use_mc:
+            if self.selective_mc:
+                static = self.tracker.score()
+                if not _needs_rollouts(board, static, self.mc_band):
+                    self.stats.mc_skipped += 1
+                    return _static_to_mc(static)
+            if self.eval_cache is None:
+                return self._rollout_score(board, low, high)[0]
+            key = position_key(board)
+            score = self.eval_cache.get(key, self.eval_config)
+            if score is None:
+                score, exact = self._rollout_score(board, low, high)
+                # A score cut off by the window is only a bound for this search
+                if exact:
+                    self.eval_cache.put(key, self.eval_config, score)
+            return score
+        # Same as evaluate_static/evaluate_pst, kept up to date on push/pop
+        return self.tracker.score()
+
+    def _rollout_score(self, board, low, high):
+        """
+        Monte Carlo score of board in search units; returns (score, exact).
+        """
+        self.stats.mc_evaluations += 1
+        if self.adaptive_rollouts:
+            mean, _, outside = self.rollout_engine.evaluate_adaptive(
+                board, self.rollout_count, low / 1000, high / 1000, self.rollout_tolerance
+            )
+            return mean * 1000, not outside
+        return evaluate_mc(board, self.rollout_count, self.rollout_engine) * 1000, True
+
+    def evaluate_many(self, boards, statics):
+        """
+        evaluate() of several positions at once, from White's point of view
+        (hybrid mode with a batching rollout backend); statics are their
+        static scores, taken from the tracker while they were on the board.
+        """
+        scores = [None] * len(boards)
+        keys = [None] * len(boards)
+        if self.selective_mc:
+            for index, (board, static) in enumerate(zip(boards, statics)):
+                if not _needs_rollouts(board, static, self.mc_band):
+                    self.stats.mc_skipped += 1
+                    scores[index] = _static_to_mc(static)
+        if self.eval_cache is not None:
+            for index, board in enumerate(boards):
+                if scores[index] is None:
+                    keys[index] = position_key(board)
+                    scores[index] = self.eval_cache.get(keys[index], self.eval_config)
+        missing = [index for index, score in enumerate(scores) if score is None]
+        missing_boards = [boards[index] for index in missing]
+        if hasattr(self.rollout_engine, "evaluate_many"):
+            self.stats.mc_evaluations += len(missing_boards)
+            results = [result * 1000 for result in self.rollout_engine.evaluate_many(missing_boards, self.rollout_count)]
         else:
-            return evaluate_static(board)
+            results = [self._rollout_score(board, -math.inf, math.inf)[0] for board in missing_boards]
+        for index, result in zip(missing, results):
+            scores[index] = result
+            if self.eval_cache is not None:
+                self.eval_cache.put(keys[index], self.eval_config, scores[index])
+        return scores
+
+    def collect_rollout_stats(self):
+        """Adds the rollout counters of this search to stats."""
+        self.stats.rollouts += self.rollout_engine.rollouts
+        self.stats.rollout_plies += self.rollout_engine.plies
+        self.stats.rollout_time += self.rollout_engine.elapsed
+        self.rollout_engine.reset_stats()
+
+    def evaluate_relative(self, board, alpha=-math.inf, beta=math.inf):
+        """evaluate() from the side to move's point of view, with the window (alpha, beta)."""
+        if board.turn == chess.WHITE:
+            return self.evaluate(board, alpha, beta)
+        return -self.evaluate(board, -beta, -alpha)
 
-    legal_moves = list(board.legal_moves)
-    
+    def order_moves(self, board, moves, ply, hash_move=None):
+        if self.orderer is not None:
+            return self.orderer.order_moves(board, moves, ply, hash_move)
+        # Without an orderer only the hash move is moved to the front
+        if hash_move is not None and hash_move in moves:
+            moves.remove(hash_move)
+            moves.insert(0, hash_move)
+        return moves
+
+    def staged_moves(self, board, ply, hash_move=None):
+        if self.orderer is not None:
+            return self.orderer.staged_moves(board, ply, hash_move)
+        return self.order_moves(board, list(board.legal_moves), ply, hash_move)
+
+def minimax(board: chess.Board, depth: int, alpha: float, beta: float, maximizing: bool, use_mc=False, rollout_count=30, tt=None, deadline=None, quiescence=False):
+    """
+    Alpha-beta search of board to depth. Scores are from White's point of view.
+    maximizing must match the side to move (True for White); the search
+    itself runs as negamax.
+    """
+    context = SearchContext(use_mc, rollout_count, tt, deadline, MoveOrderer(), quiescence=quiescence)
+    context.set_root(board)
     if maximizing:
-        max_eval = -math.inf
-        for move in legal_moves:
-            board.push(move)
-            eval_val = minimax(board, depth - 1, alpha, beta, False, use_mc, rollout_count)
-            board.pop()
-            max_eval = max(max_eval, eval_val)
+        return _negamax(board, depth, alpha, beta, 0, context)
+    return -_negamax(board, depth, -beta, -alpha, 0, context)
+
+def _negamax(board, depth, alpha, beta, ply, context):
+    """
+    Principal variation search. Scores are from the side to move's point of view.
+    """
+    context.stats.nodes += 1
+
+    if context.deadline is not None and time.time() >= context.deadline:
+        raise SearchTimeout()
+
+    if _is_automatic_draw(board):
+        return 0
+
+    if depth == 0:
+        if context.quiescence:
+            context.qsearch_nodes_left = context.qsearch_node_limit
+            return _quiescence(board, alpha, beta, context)
+        if not _has_legal_move(board):
+            return _terminal_score(board, context)
+        return context.evaluate_relative(board, alpha, beta)
+
+    tt = context.tt
+    hash_move = None
+    alpha_orig = alpha
+    if tt is not None:
+        key = position_key(board)
+        entry = tt.probe(key)
+        if entry is not None:
+            hash_move = entry.best_move
+            if entry.depth >= depth:
+                if entry.flag == EXACT:
+                    return entry.score
+                if entry.flag == LOWER:
+                    alpha = max(alpha, entry.score)
+                elif entry.flag == UPPER:
+                    beta = min(beta, entry.score)
+                if beta <= alpha:
+                    return entry.score
+
+    in_check = board.is_check()
+    null_window = beta - alpha <= 1
+
+    if (context.null_move and null_window and not in_check and depth >= NULL_MOVE_MIN_DEPTH
+            and _can_null_move(board)):
+        # If passing still fails high, a real move will too
+        board.push(chess.Move.null())
+        eval_val = -_negamax(board, depth - 1 - NULL_MOVE_REDUCTION, -beta, -beta + 1, ply + 1, context)
+        board.pop()
+        if eval_val >= beta:
+            context.stats.null_move_cutoffs += 1
+            return eval_val
+
+    reduce_late_moves = context.lmr and not in_check and depth >= LMR_MIN_DEPTH
+
+    moves = context.staged_moves(board, ply, hash_move)
+    if depth == 1 and context.batch_frontier:
+        best_eval, best_move = _batched_frontier(board, moves, alpha, beta, ply, context)
+    else:
+        best_eval = -math.inf
+        best_move = None
+        for index, move in enumerate(moves):
+            if ply == 1 and index > 0 and context.root_bound is not None:
+                beta = min(beta, context.root_bound())
+                if best_eval >= beta:
+                    break
+            quiet = reduce_late_moves and not move.promotion and not board.is_capture(move)
+            context.push(board, move)
+            if index == 0:
+                eval_val = -_negamax(board, depth - 1, -beta, -alpha, ply + 1, context)
+            else:
+                if quiet and index >= LMR_FULL_DEPTH_MOVES and not board.is_check():
+                    # Late quiet move: reduced null-window probe first
+                    context.stats.lmr_reductions += 1
+                    eval_val = -_negamax(board, depth - 1 - LMR_REDUCTION, -alpha - 1, -alpha, ply + 1, context)
+                    if eval_val > alpha:
+                        context.stats.lmr_researches += 1
+                else:
+                    eval_val = math.inf
+                if eval_val > alpha:
+                    # Null-window probe: only re-search if the move might beat alpha
+                    eval_val = -_negamax(board, depth - 1, -alpha - 1, -alpha, ply + 1, context)
+                    if alpha < eval_val < beta:
+                        eval_val = -_negamax(board, depth - 1, -beta, -alpha, ply + 1, context)
+            context.pop(board)
+
+            if eval_val > best_eval:
+                best_eval = eval_val
+                best_move = move
             alpha = max(alpha, eval_val)
-            if beta <= alpha:
+            if alpha >= beta:
+                _record_cutoff(board, move, index, ply, depth, context)
                 break
-        return max_eval
+
+    if best_move is None:
+        # The move generation found nothing: checkmate or stalemate
+        return _terminal_score(board, context)
+
+    if tt is not None:
+        if best_eval <= alpha_orig:
+            flag = UPPER
+        elif best_eval >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        tt.store(key, depth, best_eval, flag, best_move)
+
+    return best_eval
+
+def _batched_frontier(board, moves, alpha, beta, ply, context):
+    """
+    Move loop of a depth-1 node with the children scored by one
+    SearchContext.evaluate_many() call. The first (usually best) move is
+    searched on its own, since it often cuts off; the rest are batched. Leaf
+    scores do not depend on the window, so alpha-beta then runs over the
+    precomputed scores and stops at the first move reaching beta, as the
+    regular loop would. Returns (best_eval, best_move).
+    """
+    moves = iter(moves)
+    first_move = next(moves, None)
+    if first_move is None:
+        return -math.inf, None
+    context.push(board, first_move)
+    best_eval = -_negamax(board, 0, -beta, -alpha, ply + 1, context)
+    context.pop(board)
+    best_move = first_move
+    alpha = max(alpha, best_eval)
+    if alpha >= beta:
+        _record_cutoff(board, first_move, 0, ply, 1, context)
+        return best_eval, best_move
+
+    moves = list(moves)
+    scores = [0] * len(moves)
+    leaf_boards = []
+    leaf_statics = []
+    leaves = []
+    for index, move in enumerate(moves):
+        context.push(board, move)
+        if _is_automatic_draw(board):
+            scores[index] = 0
+        elif not _has_legal_move(board):
+            scores[index] = -_terminal_score(board, context)
+        else:
+            leaf_boards.append(board.copy(stack=False))
+            leaf_statics.append(context.tracker.score())
+            leaves.append(index)
+        context.pop(board)
+    context.stats.nodes += len(moves)
+
+    sign = 1 if board.turn == chess.WHITE else -1
+    for index, score in zip(leaves, context.evaluate_many(leaf_boards, leaf_statics)):
+        scores[index] = sign * score
+
+    for index, (move, eval_val) in enumerate(zip(moves, scores), 1):
+        if eval_val > best_eval:
+            best_eval = eval_val
+            best_move = move
+        alpha = max(alpha, eval_val)
+        if alpha >= beta:
+            _record_cutoff(board, move, index, ply, 1, context)
+            break
+    return best_eval, best_move
+
+def _needs_rollouts(board, static, band):
+    """
+    Selective hybrid test: True when the static score is within band of
+    equality, or the position is tactically unclear (side to move in check,
+    or able to capture a more valuable piece or a hanging piece other than a pawn).
+    """
+    if abs(static) <= band or board.is_check():
+        return True
+    # Captures of pawns are left out, en passant included (its target square
+    # is empty): they never win more than a pawn
+    for move in board.generate_pseudo_legal_captures(chess.BB_ALL, board.occupied & ~board.pawns):
+        victim = board.piece_type_at(move.to_square)
+        attacker = board.piece_type_at(move.from_square)
+        if PIECE_VALUES[victim] > PIECE_VALUES[attacker] or not board.is_attacked_by(not board.turn, move.to_square):
+            return True
+    return False
+
+def _static_to_mc(static):
+    """Static score in MC units, kept short of the MC mate score."""
+    return max(-999.0, min(999.0, static * MC_PER_STATIC))
+
+def _is_automatic_draw(board):
+    """
+    The draws board.is_game_over() detects besides stalemate, with each
+    expensive check guarded by a cheap necessary condition.
+    """
+    if board.halfmove_clock >= 150:
+        return True
+    # Insufficient material needs a board without pawns, rooks and queens
+    if not (board.pawns | board.rooks | board.queens) and board.is_insufficient_material():
+        return True
+    # Five occurrences of a position need at least 16 reversible plies
+    return board.halfmove_clock >= 16 and board.is_fivefold_repetition()
+
+def _has_legal_move(board, in_check=None):
+    """
+    any(board.generate_legal_moves()) without starting the move generator in
+    the common case: out of check, a knight, bishop, rook or queen that
+    cannot be pinned and reaches a square not taken by its own side has a
+    legal move. in_check is board.is_check() if the caller knows it.
+    """
+    if in_check is None:
+        in_check = board.is_check()
+    if not in_check:
+        us = board.occupied_co[board.turn]
+        free = us & ~(board.pawns | board.kings) & ~ALIGNED[board.king(board.turn)]
+        for square in chess.scan_forward(free):
+            if board.attacks_mask(square) & ~us:
+                return True
+    return any(board.generate_legal_moves())
+
+def _terminal_score(board, context):
+    """
+    Score of a position without legal moves, from the side to move's point of view.
+    """
+    return -context.mate_score if board.is_check() else 0
+
+def _can_null_move(board):
+    """
+    Null-move guard: not right after another null move, and never when the side
+    to move has only king and pawns, where zugzwang makes passing unsound.
+    """
+    if board.move_stack and not board.move_stack[-1]:
+        return False
+    return bool(board.occupied_co[board.turn] & ~(board.pawns | board.kings))
+
+def _quiescence(board, alpha, beta, context):
+    """
+    Capture-only search below the horizon, so leaves are scored in quiet positions.
+    The side to move may stand pat on the static score; when in check every
+    evasion is searched instead. Delta pruning skips captures that cannot
+    bring the score back above alpha (static evaluation only, since MC
+    scores are not in material units). Once the node budget of the current
+    leaf is used up, remaining nodes return their stand-pat score.
+    """
+    context.stats.qnodes += 1
+    context.qsearch_nodes_left -= 1
+
+    if _is_automatic_draw(board):
+        return 0
+
+    in_check = board.is_check()
+    if in_check:
+        moves = list(board.legal_moves)
+        if not moves:
+            return -context.mate_score
     else:
-        min_eval = math.inf
-        for move in legal_moves:
-            board.push(move)
-            eval_val = minimax(board, depth - 1, alpha, beta, True, use_mc, rollout_count)
-            board.pop()
-            min_eval = min(min_eval, eval_val)
-            beta = min(beta, eval_val)
-            if beta <= alpha:
-                break
-        return min_eval
+        moves = list(board.generate_legal_captures())
+        # Without captures, stalemate needs a look at the quiet moves too
+        if not moves and not _has_legal_move(board, False):
+            return 0
+
+    stand_pat = context.evaluate_relative(board, alpha, beta)
+    if context.qsearch_nodes_left <= 0:
+        return stand_pat
+
+    if in_check:
+        best_eval = -math.inf
+    else:
+        if stand_pat >= beta:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+        best_eval = stand_pat
+        moves.sort(key=lambda move: mvv_lva(board, move), reverse=True)
+
+    delta_pruning = not in_check and not context.use_mc
+    for move in moves:
+        if delta_pruning:
+            gain = PIECE_VALUES[chess.PAWN] if board.is_en_passant(move) else PIECE_VALUES[board.piece_type_at(move.to_square)]
+            if move.promotion:
+                gain += PIECE_VALUES[move.promotion] - PIECE_VALUES[chess.PAWN]
+            if stand_pat + gain + DELTA_MARGIN <= alpha:
+                continue
+
+        context.push(board, move)
+        eval_val = -_quiescence(board, -beta, -alpha, context)
+        context.pop(board)
+
+        best_eval = max(best_eval, eval_val)
+        alpha = max(alpha, eval_val)
+        if alpha >= beta:
+            break
+
+    return best_eval
+
+def _record_cutoff(board, move, index, ply, depth, context):
+    context.stats.cutoffs += 1
+    if index == 0:
+        context.stats.first_move_cutoffs += 1
+    if context.orderer is not None:
+        context.orderer.record_cutoff(board, move, ply, depth)
 
-def select_best_move(board: chess.Board, depth=3, use_mc=False, rollout_count=30):
+def _search_root(board, depth, context, first_move=None, alpha=-math.inf, beta=math.inf):
+    """
+    Searches every root move to the given depth inside (alpha, beta).
+    Returns (best_move, best_eval) with the score from the side to move's
+    point of view; raises SearchTimeout past the deadline.
+    """
     best_move = None
-    max_eval = -math.inf
-    min_eval = math.inf
-    alpha = -math.inf
-    beta = math.inf
-    
-    maximizing = board.turn == chess.WHITE
-    legal_moves = list(board.legal_moves)
-    
-    # Simple move ordering: captures first could be added here for optimization
-    # legal_moves.sort(key=...) 
-
-    for move in legal_moves:
-        board.push(move)
-        eval_val = minimax(board, depth - 1, alpha, beta, not maximizing, use_mc, rollout_count)
-        board.pop()
-        
-        if maximizing:
-            if eval_val > max_eval:
-                max_eval = eval_val
+    best_eval = -math.inf
+    alpha_orig = alpha
+
+    tt = context.tt
+    hash_move = None
+    if tt is not None:
+        key = position_key(board)
+        entry = tt.probe(key)
+        if entry is not None:
+            hash_move = entry.best_move
+    # The best move of the previous iteration takes priority over the hash move
+    if first_move is not None:
+        hash_move = first_move
+    legal_moves = context.order_moves(board, list(board.legal_moves), 0, hash_move)
+
+    context.stats.nodes += 1
+    context.set_root(board)
+    root_ply = len(board.move_stack)
+    try:
+        for index, move in enumerate(legal_moves):
+            context.push(board, move)
+            if index == 0:
+                eval_val = -_negamax(board, depth - 1, -beta, -alpha, 1, context)
+            else:
+                eval_val = -_negamax(board, depth - 1, -alpha - 1, -alpha, 1, context)
+                if alpha < eval_val < beta:
+                    eval_val = -_negamax(board, depth - 1, -beta, -alpha, 1, context)
+            context.pop(board)
+
+            if eval_val > best_eval:
+                best_eval = eval_val
                 best_move = move
             alpha = max(alpha, eval_val)
+            if alpha >= beta:
+                break
+    except SearchTimeout:
+        # Unwind the moves pushed by the interrupted search
+        while len(board.move_stack) > root_ply:
+            board.pop()
+        raise
+
+    if tt is not None and best_move is not None and alpha_orig < best_eval < beta:
+        tt.store(key, depth, best_eval, EXACT, best_move)
+
+    return best_move, best_eval
+
+def _aspiration_search(board, depth, context, previous_move, previous_eval):
+    """
+    Root search in a narrow window around the previous iteration's score,
+    widened to the full window on the failing side when the score falls outside it.
+    """
+    if previous_eval is None or math.isinf(previous_eval):
+        return _search_root(board, depth, context, previous_move)
+
+    window = context.aspiration_window
+    alpha = previous_eval - window
+    beta = previous_eval + window
+    while True:
+        best_move, best_eval = _search_root(board, depth, context, previous_move, alpha, beta)
+        if best_eval <= alpha:
+            context.stats.aspiration_researches += 1
+            alpha = -math.inf
+        elif best_eval >= beta:
+            context.stats.aspiration_researches += 1
+            previous_move = best_move
+            beta = math.inf
         else:
-            if eval_val < min_eval:
-                min_eval = eval_val
-                best_move = move
-            beta = min(beta, eval_val)
-            
-    return best_move
+            return best_move, best_eval
+
+def extract_pv(board: chess.Board, tt, max_length):
+    """
+    Follows best moves stored in the transposition table from board.
+    Stops at a missing or illegal move, or when a position repeats.
+    """
+    pv = []
+    seen = set()
+    while len(pv) < max_length:
+        key = position_key(board)
+        entry = tt.lookup(key)
+        if entry is None or entry.best_move is None or key in seen or not board.is_legal(entry.best_move):
+            break
+        seen.add(key)
+        pv.append(entry.best_move)
+        board.push(entry.best_move)
+    for _ in pv:
+        board.pop()
+    return pv
+
+def search(board: chess.Board, depth=3, use_mc=False, rollout_count=30, tt=None, use_tt=True,
+           time_limit=None, deadline=None, use_ordering=True, stats=None,
+           quiescence=False, qsearch_node_limit=QSEARCH_NODE_LIMIT, null_move=False, lmr=False,
+           workers=1, evaluator="static", eval_cache=None,
+           mc_workers=1, mc_seed=0, adaptive_rollouts=False,
+           rollout_tolerance=ROLLOUT_TOLERANCE, selective_mc=False, mc_band=MC_BAND,
+           mc_backend="engine") -> SearchResult:
+    """
+    Searches board and returns a SearchResult (best move, score, depth
+    reached, principal variation, nodes, NPS, cutoff and TT hit rates).
+
+    A fresh TranspositionTable is used unless one is passed in; pass the same
+    table across calls to reuse results between moves of a game (only with
+    the same evaluator settings, since stored scores depend on them).
+    use_tt=False searches without a table.
+
+    With time_limit (seconds) or deadline (a time.time() timestamp) the search
+    deepens iteratively from depth 1 up to depth (unbounded if depth is None)
+    and returns the best move of the deepest iteration that completed.
+
+    use_ordering=False disables MVV-LVA/killer/history move ordering.
+    Pass a SearchStats as stats to collect the counters into an existing object.
+
+    quiescence=True extends every horizon leaf with a capture-only search of
+    at most qsearch_node_limit nodes, in both static and hybrid (use_mc) mode.
+
+    null_move=True enables null-move pruning (skipped in king-and-pawn
+    positions of the side to move) and lmr=True enables late-move reductions
+    with a full-depth re-search on fail-high. Both are off by default.
+
+    evaluator selects the static evaluation: "static" (material, as
+    evaluate_static) or "pst" (tapered piece-square tables, as evaluate_pst).
+    eval_cache (an EvalCache) memoizes Monte Carlo leaf evaluations; keep one
+    per game to reuse them across moves. Static evaluation is incremental
+    and cheaper than hashing, so it bypasses the cache.
+
+    mc_workers > 1 (or None for all cores) runs the rollouts of hybrid mode
+    on a persistent process pool (see minimax.parallel_mc), with the children
+    of depth-1 nodes sent to it as one batch; mc_seed seeds its generators.
+    mc_backend="vector" instead plays the rollouts in this process on NumPy
+    bitboards (see minimax.rollout_vector), all children of a depth-1 node
+    in one lockstep batch.
+
+    adaptive_rollouts=True treats rollout_count as a maximum: the rollouts of
+    a leaf stop once the confidence interval of their mean is within
+    +-rollout_tolerance, or entirely outside the alpha-beta window. The
+    rollouts actually used per leaf are reported in the stats. Applies to
+    RolloutEngine rollouts only (not with mc_workers or mc_backend="vector").
+
+    selective_mc=True runs rollouts only on leaves whose static score (of
+    the chosen evaluator) is within mc_band of equality or that are
+    tactically unclear (check, hanging pieces); other leaves keep their
+    static score, scaled to MC units.
+
+    workers > 1 (or None for all cores) runs a fixed-depth search with the
+    root moves split across processes (see minimax.parallel); tt, use_tt,
+    use_ordering, eval_cache, mc_workers and the time budget do not apply there.
+
+    A position without legal moves returns at once: no move, depth 0 and
+    the checkmate or stalemate score.
+    """
+    if mc_backend not in MC_BACKENDS:
+        raise ValueError(f"Unknown rollout backend: {mc_backend}")
+    if not _has_legal_move(board):
+        # Checkmate or stalemate: nothing to search, whatever the depth or time budget
+        score = 0
+        if board.is_check():
+            score = -(MC_MATE_SCORE if use_mc else MATE_SCORE)
+            if board.turn == chess.BLACK:
+                score = -score
+        if stats is None:
+            stats = SearchStats()
+        stats.nodes += 1
+        return SearchResult(None, score, 0, [], 0.0, stats)
+    if workers != 1 and time_limit is None and deadline is None:
+        from .parallel import search_parallel
+        return search_parallel(board, depth, workers, use_mc, rollout_count, stats,
+                               quiescence, qsearch_node_limit, null_move, lmr, evaluator,
+                               adaptive_rollouts, rollout_tolerance, selective_mc, mc_band, mc_backend)
+
+    start_time = time.time()
+    if not use_tt:
+        tt = None
+    elif tt is None:
+        tt = TranspositionTable()
+    if stats is None:
+        stats = SearchStats()
+    tt_probes = tt.probes if tt is not None else 0
+    tt_hits = tt.hits if tt is not None else 0
+    cache_hits = eval_cache.hits if eval_cache is not None else 0
+    cache_misses = eval_cache.misses if eval_cache is not None else 0
+
+    if time_limit is not None:
+        limit_deadline = start_time + time_limit
+        deadline = limit_deadline if deadline is None else min(deadline, limit_deadline)
+
+    rollout_backend = None
+    if use_mc and mc_workers != 1:
+        from .parallel_mc import get_rollout_backend
+        rollout_backend = get_rollout_backend(mc_workers, mc_seed)
+    elif use_mc and mc_backend == "vector":
+        rollout_backend = VectorRollouts()
+
+    orderer = MoveOrderer() if use_ordering else None
+    context = SearchContext(use_mc, rollout_count, tt, deadline, orderer, stats,
+                            quiescence, qsearch_node_limit, null_move, lmr, evaluator,
+                            eval_cache, rollout_backend, adaptive_rollouts, rollout_tolerance,
+                            selective_mc, mc_band)
+
+    if deadline is None:
+        best_move, best_eval = _search_root(board, depth, context)
+        completed_depth = depth
+    else:
+        max_depth = MAX_DEPTH if depth is None else depth
+        best_move = None
+        best_eval = None
+        completed_depth = 0
+        for current_depth in range(1, max_depth + 1):
+            try:
+                best_move, best_eval = _aspiration_search(board, current_depth, context, best_move, best_eval)
+            except SearchTimeout:
+                break
+            completed_depth = current_depth
+
+        if best_move is None:
+            # Not even depth 1 finished; fall back to the first legal move
+            best_move = next(iter(board.legal_moves), None)
+
+    context.collect_rollout_stats()
+    if eval_cache is not None:
+        stats.eval_cache_hits += eval_cache.hits - cache_hits
+        stats.eval_cache_misses += eval_cache.misses - cache_misses
+    if tt is not None:
+        stats.tt_probes += tt.probes - tt_probes
+        stats.tt_hits += tt.hits - tt_hits
+        pv = extract_pv(board, tt, max(completed_depth, 1))
+    else:
+        pv = []
+    if best_move is not None and (not pv or pv[0] != best_move):
+        pv = [best_move]
+
+    score = None
+    if best_eval is not None and not math.isinf(best_eval):
+        score = best_eval if board.turn == chess.WHITE else -best_eval
+
+    return SearchResult(best_move, score, completed_depth, pv, time.time() - start_time, stats)
+
+def select_best_move(board: chess.Board, depth=3, use_mc=False, rollout_count=30, **options):
+    """
+    Returns the best move for the side to move.
+    Takes the same options as search(), which also reports the score,
+    principal variation and search statistics.
+    """
+    return search(board, depth, use_mc, rollout_count, **options).best_move
@@ -0,0 +1,135 @@
+"""
+Move ordering for the alpha-beta search.
+Order: hash/PV move, captures by MVV-LVA, promotions, killer moves, then
+quiet moves by history score.
+
+staged_moves() yields the same order lazily: each stage is only generated
+once the moves of the previous one failed to produce a cutoff.
+"""
+
+import chess
+
+# Sort keys per move class; quiet moves use their raw history score
+CAPTURE_SCORE = 3_000_000
+PROMOTION_SCORE = 2_000_000
+KILLER_SCORE = 1_000_000
+
+# History scores are halved once any entry passes this, so they stay below KILLER_SCORE
+HISTORY_LIMIT = 500_000
+
+KILLERS_PER_PLY = 2
+
+
+def mvv_lva(board: chess.Board, move: chess.Move) -> int:
+    """
+    Most Valuable Victim - Least Valuable Attacker score of a capture.
+    Higher is better: PxQ scores highest, KxP lowest.
+    """
+    if board.is_en_passant(move):
+        victim = chess.PAWN
+    else:
+        victim = board.piece_type_at(move.to_square)
+    attacker = board.piece_type_at(move.from_square)
+    return victim * 10 - attacker
+
+
+class MoveOrderer:
+    """
+    Holds the killer and history tables of one search and sorts moves with them.
+    """
+
+    def __init__(self):
+        self.killers = []
+        self.history = [0] * (2 * 64 * 64)
+
+    def _history_index(self, color, move):
+        return (color * 64 + move.from_square) * 64 + move.to_square
+
+    def killers_at(self, ply):
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        return self.killers[ply]
+
+    def score_move(self, board: chess.Board, move: chess.Move, killers) -> int:
+        if board.is_capture(move):
+            return CAPTURE_SCORE + mvv_lva(board, move)
+        if move.promotion:
+            return PROMOTION_SCORE + move.promotion
+        if move in killers:
+            return KILLER_SCORE - killers.index(move)
+        return self.history[self._history_index(board.turn, move)]
+
+    def order_moves(self, board: chess.Board, moves, ply=0, hash_move=None):
+        """
+        Returns the moves sorted best-first, with hash_move (if legal here) at the front.
+        """
+        killers = self.killers_at(ply)
+        ordered = sorted(moves, key=lambda move: self.score_move(board, move, killers), reverse=True)
+        if hash_move is not None and hash_move in ordered:
+            ordered.remove(hash_move)
+            ordered.insert(0, hash_move)
+        return ordered
+
+    def staged_moves(self, board: chess.Board, ply=0, hash_move=None):
+        """
+        Yields the legal moves of board stage by stage: hash move, captures
+        (MVV-LVA), quiet promotions, killers, then the remaining quiet moves.
+        The board must be back in the same position whenever the next move is requested.
+        """
+        if hash_move is not None and board.is_legal(hash_move):
+            yield hash_move
+        else:
+            hash_move = None
+
+        captures = [move for move in board.generate_legal_captures() if move != hash_move]
+        captures.sort(key=lambda move: mvv_lva(board, move), reverse=True)
+        yield from captures
+
+        # Every non-capture; en passant was already generated with the captures
+        # (own squares stay in the mask: castling targets the rook square)
+        quiet_mask = ~board.occupied_co[not board.turn] & chess.BB_ALL
+        promotion_rank = chess.BB_RANK_7 if board.turn == chess.WHITE else chess.BB_RANK_2
+        promoting_pawns = board.pawns & board.occupied_co[board.turn] & promotion_rank
+        promotions = [
+            move for move in board.generate_legal_moves(promoting_pawns, quiet_mask)
+            if move != hash_move
+        ]
+        promotions.sort(key=lambda move: move.promotion, reverse=True)
+        yield from promotions
+
+        killers = self.killers_at(ply)
+        tried_killers = []
+        for killer in list(killers):
+            if (killer != hash_move and not killer.promotion
+                    and not board.is_capture(killer) and board.is_legal(killer)):
+                tried_killers.append(killer)
+                yield killer
+
+        quiets = [
+            move for move in board.generate_legal_moves(chess.BB_ALL & ~promoting_pawns, quiet_mask)
+            if move != hash_move and move not in tried_killers and not board.is_en_passant(move)
+        ]
+        quiets.sort(key=lambda move: self.history[self._history_index(board.turn, move)], reverse=True)
+        yield from quiets
+
+    def record_cutoff(self, board: chess.Board, move: chess.Move, ply, depth):
+        """
+        Updates killers and history after move caused a beta cutoff.
+        Captures and promotions are already ordered well, so only quiet moves count.
+        """
+        if board.is_capture(move) or move.promotion:
+            return
+
+        killers = self.killers_at(ply)
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[KILLERS_PER_PLY:]
+
+        index = self._history_index(board.turn, move)
+        self.history[index] += depth * depth
+        if self.history[index] > HISTORY_LIMIT:
+            self.history = [value // 2 for value in self.history]
+
+    def clear(self):
+        self.killers = []
+        self.history = [0] * (2 * 64 * 64)
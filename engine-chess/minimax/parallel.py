@@ -0,0 +1,197 @@
+"""
+Root-parallel alpha-beta search across worker processes.
+
+The first root move is searched on its own to establish a score, then the
+remaining root moves are spread over a ProcessPoolExecutor. Workers rebuild
+the position from its FEN and share the best root score found so far
+through a multiprocessing.Value: each task starts from it as its alpha
+bound and re-reads it between the replies it searches, so a better score
+found by another worker narrows the window of searches already running.
+"""
+
+import chess
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .minimax_ab import SearchContext, QSEARCH_NODE_LIMIT, MC_BAND, extract_pv, _negamax
+from .rollout import ROLLOUT_TOLERANCE
+from .rollout_vector import VectorRollouts
+from .move_ordering import MoveOrderer
+from .stats import SearchStats, SearchResult
+from .transposition import TranspositionTable
+
+# Shared best root score (side to move's point of view), set in each worker
+_shared_alpha = None
+
+_pool = None
+_pool_workers = 0
+_pool_alpha = None
+_pool_lock = threading.Lock()
+
+
+def _init_worker(shared_alpha):
+    global _shared_alpha
+    _shared_alpha = shared_alpha
+
+
+def _get_pool(workers):
+    """
+    Returns the persistent pool, recreating it if the worker count changed.
+    """
+    global _pool, _pool_workers, _pool_alpha
+    if _pool is None or _pool_workers != workers:
+        shutdown_pool()
+        _pool_alpha = multiprocessing.Value("d", -math.inf)
+        _pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(_pool_alpha,))
+        _pool_workers = workers
+    return _pool, _pool_alpha
+
+
+def shutdown_pool():
+    """Stops the worker processes of the persistent pool."""
+    global _pool, _pool_workers, _pool_alpha
+    if _pool is not None:
+        _pool.shutdown()
+    _pool = None
+    _pool_workers = 0
+    _pool_alpha = None
+
+
+def _search_move(fen, moves, move_uci, depth, options, alpha, shared_alpha=None):
+    """
+    Searches one root move; returns (score, pv, stats). The window is
+    (alpha - 1, inf) so a move tying the best score gets an exact value;
+    alpha follows shared_alpha (a multiprocessing.Value) if given.
+    """
+    board = chess.Board(fen)
+    for uci in moves:
+        board.push_uci(uci)
+    tt = TranspositionTable()
+    rollout_backend = VectorRollouts() if options["use_mc"] and options["mc_backend"] == "vector" else None
+    context = SearchContext(
+        options["use_mc"], options["rollout_count"], tt, None, MoveOrderer(), SearchStats(),
+        options["quiescence"], options["qsearch_node_limit"], options["null_move"], options["lmr"],
+        options["evaluator"], rollout_backend=rollout_backend,
+        adaptive_rollouts=options["adaptive_rollouts"], rollout_tolerance=options["rollout_tolerance"],
+        selective_mc=options["selective_mc"], mc_band=options["mc_band"],
+        root_bound=None if shared_alpha is None else lambda: -(shared_alpha.value - 1)
+    )
+    move = chess.Move.from_uci(move_uci)
+    board.push(move)
+    context.set_root(board)
+    score = -_negamax(board, depth - 1, -math.inf, -(alpha - 1), 1, context)
+    pv = [move_uci] + [reply.uci() for reply in extract_pv(board, tt, depth - 1)]
+    context.collect_rollout_stats()
+    context.stats.tt_probes = tt.probes
+    context.stats.tt_hits = tt.hits
+    return score, pv, context.stats
+
+
+def _search_move_task(fen, moves, move_uci, depth, options):
+    score, pv, stats = _search_move(fen, moves, move_uci, depth, options, _shared_alpha.value, _shared_alpha)
+    with _shared_alpha.get_lock():
+        if score > _shared_alpha.value:
+            _shared_alpha.value = score
+    return move_uci, score, pv, stats
+
+
+def search_parallel(board: chess.Board, depth=3, workers=None, use_mc=False, rollout_count=30,
+                    stats=None, quiescence=False, qsearch_node_limit=QSEARCH_NODE_LIMIT,
+                    null_move=False, lmr=False, evaluator="static",
+                    adaptive_rollouts=False, rollout_tolerance=ROLLOUT_TOLERANCE,
+                    selective_mc=False, mc_band=MC_BAND, mc_backend="engine") -> SearchResult:
+    """
+    Fixed-depth root-parallel search over workers processes (default: all cores).
+
+    Root moves are ordered as in select_best_move and ties go to the earlier
+    move, so with the exact search (no null_move/lmr, static evaluation) the
+    result matches the serial search at the same depth.
+    The returned SearchResult counts the nodes of all workers.
+    """
+    start_time = time.time()
+    if stats is None:
+        stats = SearchStats()
+    legal_moves = MoveOrderer().order_moves(board, list(board.legal_moves), 0)
+    if not legal_moves:
+        return SearchResult(None, None, depth, [], time.time() - start_time, stats)
+
+    workers = workers or os.cpu_count() or 1
+    options = {
+        "use_mc": use_mc,
+        "rollout_count": rollout_count,
+        "quiescence": quiescence,
+        "qsearch_node_limit": qsearch_node_limit,
+        "null_move": null_move,
+        "lmr": lmr,
+        "evaluator": evaluator,
+        "adaptive_rollouts": adaptive_rollouts,
+        "rollout_tolerance": rollout_tolerance,
+        "selective_mc": selective_mc,
+        "mc_band": mc_band,
+        "mc_backend": mc_backend,
+    }
+    fen = board.root().fen()
+    moves = [move.uci() for move in board.move_stack]
+
+    # The first move is searched alone so the workers start with a real bound
+    first_score, first_pv, first_stats = _search_move(fen, moves, legal_moves[0].uci(), depth, options, -math.inf)
+    results = {legal_moves[0].uci(): (first_score, first_pv)}
+    stats.merge(first_stats)
+
+    if len(legal_moves) > 1:
+        with _pool_lock:
+            pool, shared_alpha = _get_pool(workers)
+            shared_alpha.value = first_score
+            futures = [
+                pool.submit(_search_move_task, fen, moves, move.uci(), depth, options)
+                for move in legal_moves[1:]
+            ]
+            for future in futures:
+                move_uci, score, pv, worker_stats = future.result()
+                results[move_uci] = (score, pv)
+                stats.merge(worker_stats)
+    stats.nodes += 1
+
+    best_move = None
+    best_eval = -math.inf
+    best_pv = []
+    for move in legal_moves:
+        score, pv = results[move.uci()]
+        if score > best_eval:
+            best_eval = score
+            best_move = move
+            best_pv = pv
+
+    score = None
+    if not math.isinf(best_eval):
+        score = best_eval if board.turn == chess.WHITE else -best_eval
+    pv = [chess.Move.from_uci(uci) for uci in best_pv]
+    return SearchResult(best_move, score, depth, pv, time.time() - start_time, stats)
+
+
+def select_best_move_parallel(board: chess.Board, depth=3, workers=None, **options):
+    """
+    Returns the best move of search_parallel().
+    """
+    return search_parallel(board, depth, workers, **options).best_move
+
+
+def measure_speedup(fens, depth=4, worker_counts=(1, 2, 4, 8, 16)):
+    """
+    Times select_best_move_parallel on fens for each worker count.
+    Returns {workers: seconds}; the pool start-up is excluded from the timing.
+    """
+    timings = {}
+    for workers in worker_counts:
+        _get_pool(workers)
+        start = time.time()
+        for fen in fens:
+            select_best_move_parallel(chess.Board(fen), depth=depth, workers=workers)
+        timings[workers] = time.time() - start
+        print(f"{workers:>3} workers: {timings[workers]:.2f}s (speedup x{timings[worker_counts[0]] / timings[workers]:.2f})")
+    shutdown_pool()
+    return timings
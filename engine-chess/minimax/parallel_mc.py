@@ -0,0 +1,128 @@
+"""
+Monte Carlo rollouts spread over worker processes.
+
+ParallelRollouts is a drop-in replacement for RolloutEngine in evaluate_mc:
+the rollouts of one position are split across the workers of a persistent
+ProcessPoolExecutor, and evaluate_many() sends many leaf positions per task
+so one round trip covers a whole batch.
+
+Each leaf is played out with its own random.Random, seeded from the backend's
+seed, the leaf's FEN and the index of its rollout chunk. A score therefore
+depends only on the position, not on which worker runs it, how the leaves were
+batched or how much the shared backend was used before.
+"""
+
+import chess
+import math
+import os
+import random
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from .rollout import RolloutEngine
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def _rollout_task(fens, rollout_count, max_steps, seed, chunk=0):
+    """
+    Evaluates each FEN with rollout_count rollouts.
+    Returns (scores, rollouts, plies, elapsed).
+    """
+    engine = RolloutEngine()
+    scores = []
+    for fen in fens:
+        engine.rng = random.Random(f"{seed}:{fen}:{chunk}")
+        scores.append(engine.evaluate(chess.Board(fen), rollout_count, max_steps))
+    return scores, engine.rollouts, engine.plies, engine.elapsed
+
+
+class ParallelRollouts:
+    """
+    Rollout backend running on a process pool.
+
+    Args:
+        workers: Number of processes (default: all cores).
+        seed: Base seed of the per-leaf random generators.
+    """
+
+    def __init__(self, workers=None, seed=0):
+        self.workers = workers or os.cpu_count() or 1
+        self.seed = seed
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        # Counters in the same form as RolloutEngine; elapsed is summed over workers
+        self.rollouts = 0
+        self.plies = 0
+        self.elapsed = 0.0
+
+    def _submit(self, fens, rollout_count, max_steps, chunk=0):
+        return self._executor.submit(_rollout_task, fens, rollout_count, max_steps, self.seed, chunk)
+
+    def _collect(self, future):
+        scores, rollouts, plies, elapsed = future.result()
+        self.rollouts += rollouts
+        self.plies += plies
+        self.elapsed += elapsed
+        return scores
+
+    def evaluate(self, board: chess.Board, rollout_count=30, max_steps=20) -> float:
+        """
+        Average of rollout_count rollouts from board, split over the workers.
+        """
+        fen = board.fen()
+        tasks = min(self.workers, rollout_count)
+        counts = [rollout_count // tasks + (1 if index < rollout_count % tasks else 0) for index in range(tasks)]
+        futures = [self._submit([fen], count, max_steps, index) for index, count in enumerate(counts)]
+        total_score = 0.0
+        for count, future in zip(counts, futures):
+            total_score += self._collect(future)[0] * count
+        return total_score / rollout_count
+
+    def evaluate_many(self, boards, rollout_count=30, max_steps=20):
+        """
+        evaluate_mc() of each board, with the boards batched into one task per worker.
+        """
+        if not boards:
+            return []
+        fens = [board.fen() for board in boards]
+        chunk_size = math.ceil(len(fens) / self.workers)
+        futures = [
+            self._submit(fens[start:start + chunk_size], rollout_count, max_steps)
+            for start in range(0, len(fens), chunk_size)
+        ]
+        scores = []
+        for future in futures:
+            scores.extend(self._collect(future))
+        return scores
+
+    def reset_stats(self):
+        self.rollouts = 0
+        self.plies = 0
+        self.elapsed = 0.0
+
+    def shutdown(self):
+        self._executor.shutdown()
+
+
+def get_rollout_backend(workers=None, seed=0):
+    """
+    Returns the persistent ParallelRollouts, recreating it if workers or seed changed.
+    """
+    global _backend
+    workers = workers or os.cpu_count() or 1
+    with _backend_lock:
+        if _backend is None or _backend.workers != workers or _backend.seed != seed:
+            if _backend is not None:
+                _backend.shutdown()
+            _backend = ParallelRollouts(workers, seed)
+        return _backend
+
+
+def shutdown_rollout_backend():
+    """Stops the worker processes of the persistent backend."""
+    global _backend
+    with _backend_lock:
+        if _backend is not None:
+            _backend.shutdown()
+        _backend = None
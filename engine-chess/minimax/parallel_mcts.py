@@ -0,0 +1,142 @@
+"""
+Root-parallel MCTS across worker processes.
+
+Each worker grows its own tree from the same position with its own seed for
+the same iteration share or time budget; the parent sums the visits and
+values of the root children over the trees and plays the most visited move.
+The workers run on a persistent ProcessPoolExecutor, so the pool start-up is
+paid once and not on every move.
+"""
+
+import chess
+import os
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .mcts import MCTS, EXPLORATION, MCTS_ITERATIONS
+from .stats import SearchStats, SearchResult
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers):
+    """
+    Returns the persistent pool, recreating it if the worker count changed.
+    """
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        shutdown_pool()
+        _pool = ProcessPoolExecutor(max_workers=workers)
+        _pool_workers = workers
+    return _pool
+
+
+def shutdown_pool():
+    """Stops the worker processes of the persistent pool."""
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.shutdown()
+    _pool = None
+    _pool_workers = 0
+
+
+def _grow_tree(fen, moves, iterations, time_limit, seed, exploration, max_steps):
+    """
+    Grows one tree from the position. Returns ({move_uci: (visits, value)}
+    of the root children, tree height, principal variation, stats).
+    """
+    board = chess.Board(fen)
+    for uci in moves:
+        board.push_uci(uci)
+    tree = MCTS(exploration, max_steps, rng=random.Random(seed))
+    result = tree.search(board, iterations, time_limit)
+    children = {child.move.uci(): (child.visits, child.value) for child in tree.root.children}
+    return children, result.depth, [move.uci() for move in result.pv], result.stats
+
+
+def search_mcts_parallel(board: chess.Board, iterations=None, time_limit=None, workers=None, seed=0,
+                         exploration=EXPLORATION, max_steps=20, stats=None) -> SearchResult:
+    """
+    Root-parallel MCTS over workers processes (default: all cores).
+
+    iterations are split across the workers, so the total matches a serial
+    search; time_limit is the budget of every worker. The score and the
+    principal variation are those of the chosen move over all trees, and the
+    returned SearchResult counts the iterations of all workers.
+    """
+    start_time = time.time()
+    if stats is None:
+        stats = SearchStats()
+    if board.is_game_over():
+        return SearchResult(None, None, 0, [], time.time() - start_time, stats)
+    if iterations is None and time_limit is None:
+        iterations = MCTS_ITERATIONS
+
+    workers = workers or os.cpu_count() or 1
+    shares = [None] * workers
+    if iterations is not None:
+        shares = [iterations // workers + (1 if index < iterations % workers else 0) for index in range(workers)]
+        shares = [share for share in shares if share] or [0]
+    fen = board.root().fen()
+    moves = [move.uci() for move in board.move_stack]
+
+    totals = {}
+    height = 0
+    pvs = []
+    with _pool_lock:
+        pool = _get_pool(workers)
+        futures = [
+            pool.submit(_grow_tree, fen, moves, share, time_limit, f"{seed}:{index}", exploration, max_steps)
+            for index, share in enumerate(shares)
+        ]
+        for future in futures:
+            children, tree_height, pv, worker_stats = future.result()
+            for move_uci, (visits, value) in children.items():
+                total_visits, total_value = totals.get(move_uci, (0, 0.0))
+                totals[move_uci] = (total_visits + visits, total_value + value)
+            height = max(height, tree_height)
+            pvs.append((children.get(pv[0], (0, 0.0))[0] if pv else 0, pv))
+            stats.merge(worker_stats)
+
+    if not totals:
+        return SearchResult(None, None, height, [], time.time() - start_time, stats)
+    best_uci = max(totals, key=lambda move_uci: totals[move_uci][0])
+    visits, value = totals[best_uci]
+    score = 1000 * value / visits
+    if board.turn == chess.BLACK:
+        score = -score
+    # The line of the tree that visited the chosen move the most
+    pv = max((entry for entry in pvs if entry[1] and entry[1][0] == best_uci), default=(0, [best_uci]))[1]
+    pv = [chess.Move.from_uci(uci) for uci in pv]
+    return SearchResult(pv[0], score, height, pv, time.time() - start_time, stats)
+
+
+def select_best_move_mcts_parallel(board: chess.Board, iterations=None, time_limit=None, workers=None, **options):
+    """
+    Returns the best move of search_mcts_parallel().
+    """
+    return search_mcts_parallel(board, iterations, time_limit, workers, **options).best_move
+
+
+def measure_mcts_scaling(fens, time_limit=1.0, worker_counts=(1, 2, 4, 8, 16)):
+    """
+    Runs search_mcts_parallel for time_limit seconds on fens for each worker
+    count. Returns {workers: iterations per second}; the pool start-up is
+    excluded from the timing.
+    """
+    throughput = {}
+    for workers in worker_counts:
+        _get_pool(workers)
+        stats = SearchStats()
+        start = time.time()
+        for fen in fens:
+            search_mcts_parallel(chess.Board(fen), time_limit=time_limit, workers=workers, stats=stats)
+        throughput[workers] = stats.nodes / (time.time() - start)
+        print(f"{workers:>3} workers: {throughput[workers]:.0f} iterations/s "
+              f"(x{throughput[workers] / throughput[worker_counts[0]]:.2f})")
+    shutdown_pool()
+    return throughput
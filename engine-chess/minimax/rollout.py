@@ -0,0 +1,251 @@
+"""
+Fast random rollouts for the Monte Carlo evaluator.
+
+Plays the same uniformly random games as evaluator_mc.simulate_random, with
+less work per ply:
+- the board is copied without its move stack,
+- pseudo-legal moves are counted from attack bitboards and only the one
+  drawn at random is built and checked for legality (rejection sampling,
+  still uniform over the legal moves),
+- game end is tested with cheap guards instead of is_game_over(); the full
+  move list is only generated when the side to move is in check.
+
+Repetitions are only counted within the rollout, since the copy has no history.
+"""
+
+import chess
+import math
+import random
+import time
+
+
+# Tries at drawing a legal move by rejection before listing all moves
+MAX_REJECTIONS = 16
+
+# Adaptive evaluation: rollouts played before stopping early, the z-value of
+# the confidence interval and its default half-width (results are in [-1, 1])
+MIN_ROLLOUTS = 10
+CONFIDENCE_Z = 1.96
+ROLLOUT_TOLERANCE = 0.1
+
+PROMOTIONS = (chess.QUEEN, chess.ROOK, chess.BISHOP, chess.KNIGHT)
+
+
+def _move_groups(board: chess.Board):
+    """
+    Pseudo-legal moves of board as (target mask, from square, shift, moves
+    per target, move count) groups, without creating Move objects. Pawn
+    groups cover all pawns moving in one direction: from square is None and
+    the origin of each target is target - shift.
+    En passant and castling candidates are returned as a separate list;
+    castling candidates only have a clear path and are fully checked once drawn.
+    """
+    us = board.turn
+    our = board.occupied_co[us]
+    not_ours = ~our & chess.BB_ALL
+    their = board.occupied_co[not us]
+    occupied = board.occupied
+    empty = ~occupied & chess.BB_ALL
+    groups = []
+
+    for square in chess.scan_forward(board.knights & our):
+        targets = chess.BB_KNIGHT_ATTACKS[square] & not_ours
+        if targets:
+            groups.append((targets, square, 0, 1, targets.bit_count()))
+    for square in chess.scan_forward((board.bishops | board.queens) & our):
+        targets = chess.BB_DIAG_ATTACKS[square][chess.BB_DIAG_MASKS[square] & occupied] & not_ours
+        if targets:
+            groups.append((targets, square, 0, 1, targets.bit_count()))
+    for square in chess.scan_forward((board.rooks | board.queens) & our):
+        targets = (chess.BB_RANK_ATTACKS[square][chess.BB_RANK_MASKS[square] & occupied]
+                   | chess.BB_FILE_ATTACKS[square][chess.BB_FILE_MASKS[square] & occupied]) & not_ours
+        if targets:
+            groups.append((targets, square, 0, 1, targets.bit_count()))
+    king = board.king(us)
+    if king is not None:
+        targets = chess.BB_KING_ATTACKS[king] & not_ours
+        if targets:
+            groups.append((targets, king, 0, 1, targets.bit_count()))
+
+    pawns = board.pawns & our
+    if us == chess.WHITE:
+        single = (pawns << 8) & empty
+        double = ((single & chess.BB_RANK_3) << 8) & empty
+        left = ((pawns & ~chess.BB_FILE_A) << 7) & their
+        right = ((pawns & ~chess.BB_FILE_H) << 9) & their
+        pawn_groups = ((single, 8), (double, 16), (left, 7), (right, 9))
+        last_rank = chess.BB_RANK_8
+    else:
+        single = (pawns >> 8) & empty
+        double = ((single & chess.BB_RANK_6) >> 8) & empty
+        left = ((pawns & ~chess.BB_FILE_A) >> 9) & their
+        right = ((pawns & ~chess.BB_FILE_H) >> 7) & their
+        pawn_groups = ((single, -8), (double, -16), (left, -9), (right, -7))
+        last_rank = chess.BB_RANK_1
+    for targets, shift in pawn_groups:
+        if targets & ~last_rank:
+            moves = targets & ~last_rank
+            groups.append((moves, None, shift, 1, moves.bit_count()))
+        if targets & last_rank:
+            promotions = targets & last_rank
+            groups.append((promotions, None, shift, len(PROMOTIONS), promotions.bit_count() * len(PROMOTIONS)))
+
+    specials = []
+    if board.ep_square is not None:
+        specials.extend(board.generate_pseudo_legal_ep())
+    if king is not None:
+        for rook in chess.scan_forward(board.castling_rights & our):
+            if not chess.between(king, rook) & occupied:
+                file = 6 if rook > king else 2
+                specials.append(chess.Move(king, chess.square(file, chess.square_rank(king))))
+    return groups, specials
+
+
+def _pick_move(groups, specials, total, rng):
+    """Returns pseudo-legal move number rng.randrange(total) of the groups."""
+    index = rng.randrange(total)
+    for targets, from_square, shift, weight, count in groups:
+        if index >= count:
+            index -= count
+            continue
+        target_index, promotion_index = divmod(index, weight)
+        for _ in range(target_index):
+            targets &= targets - 1
+        to_square = chess.lsb(targets)
+        if from_square is None:
+            from_square = to_square - shift
+        promotion = PROMOTIONS[promotion_index] if weight > 1 else None
+        return chess.Move(from_square, to_square, promotion)
+    return specials[index]
+
+
+def _random_legal_move(board: chess.Board, rng):
+    """
+    Returns a uniformly random legal move of board, or None if there is none.
+    Pseudo-legal moves are drawn until one is legal; after MAX_REJECTIONS
+    failures (e.g. stalemate) the legal moves are listed instead.
+    """
+    if not board.is_check():
+        groups, specials = _move_groups(board)
+        total = len(specials)
+        for group in groups:
+            total += group[4]
+        if total:
+            for _ in range(MAX_REJECTIONS):
+                move = _pick_move(groups, specials, total, rng)
+                # Castling candidates still need the attacked-squares test of is_legal()
+                legal = board.is_legal(move) if move in specials else not board.is_into_check(move)
+                if legal:
+                    return move
+
+    # In check most pseudo-legal moves are illegal; evasions are cheap to list
+    moves = list(board.generate_legal_moves())
+    return rng.choice(moves) if moves else None
+
+
+def _mate_result(board: chess.Board) -> float:
+    """Result of a checkmate against the side to move."""
+    return -1.0 if board.turn == chess.WHITE else 1.0
+
+
+def play_out(board: chess.Board, max_steps=20, rng=random):
+    """
+    Plays random moves on board (modified in place) for up to max_steps plies.
+    Returns (result, plies) with result as in simulate_random.
+    """
+    plies = 0
+    while True:
+        if board.halfmove_clock >= 150:
+            # The 75-move rule, unless the last move delivered mate
+            if board.is_check() and not any(board.generate_legal_moves()):
+                return _mate_result(board), plies
+            return 0.0, plies
+        if not (board.pawns | board.rooks | board.queens) and board.is_insufficient_material():
+            return 0.0, plies
+        if board.halfmove_clock >= 16 and board.is_fivefold_repetition():
+            return 0.0, plies
+
+        if plies >= max_steps:
+            # Unfinished games score 0, so only a mate on the board matters
+            if board.is_check() and not any(board.generate_legal_moves()):
+                return _mate_result(board), plies
+            return 0.0, plies
+
+        move = _random_legal_move(board, rng)
+        if move is None:
+            return (_mate_result(board) if board.is_check() else 0.0), plies
+        board.push(move)
+        plies += 1
+
+
+class RolloutEngine:
+    """
+    Runs rollouts and counts their throughput.
+
+    Args:
+        rng: random.Random instance (default: the random module).
+    """
+
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random
+        self.rollouts = 0
+        self.plies = 0
+        self.elapsed = 0.0
+
+    def rollout(self, board: chess.Board, max_steps=20) -> float:
+        """One random game from board; same result range as simulate_random."""
+        start = time.perf_counter()
+        result, plies = play_out(board.copy(stack=False), max_steps, self.rng)
+        self.elapsed += time.perf_counter() - start
+        self.rollouts += 1
+        self.plies += plies
+        return result
+
+    def evaluate(self, board: chess.Board, rollout_count=30, max_steps=20) -> float:
+        """Average result of rollout_count rollouts from board."""
+        total_score = 0.0
+        for _ in range(rollout_count):
+            total_score += self.rollout(board, max_steps)
+        return total_score / rollout_count
+
+    def evaluate_adaptive(self, board: chess.Board, max_rollouts=30, low=-math.inf, high=math.inf,
+                          tolerance=ROLLOUT_TOLERANCE, min_rollouts=MIN_ROLLOUTS, max_steps=20):
+        """
+        Like evaluate(), but stops after min_rollouts once the confidence
+        interval of the mean is within +-tolerance, or lies entirely outside
+        (low, high), the window the caller cares about.
+        Returns (mean, rollouts used, outside) where outside tells that the
+        mean is only good as a bound.
+        """
+        total_score = 0.0
+        total_squares = 0.0
+        for count in range(1, max_rollouts + 1):
+            result = self.rollout(board, max_steps)
+            total_score += result
+            total_squares += result * result
+            if min_rollouts <= count < max_rollouts:
+                mean = total_score / count
+                variance = max(total_squares / count - mean * mean, 0.0) * count / (count - 1)
+                half_width = CONFIDENCE_Z * math.sqrt(variance / count)
+                if mean + half_width < low or mean - half_width > high:
+                    return mean, count, True
+                if half_width < tolerance:
+                    return mean, count, False
+        return total_score / max_rollouts, max_rollouts, False
+
+    @property
+    def rollouts_per_sec(self) -> float:
+        if self.elapsed <= 0:
+            return 0.0
+        return self.rollouts / self.elapsed
+
+    @property
+    def plies_per_sec(self) -> float:
+        if self.elapsed <= 0:
+            return 0.0
+        return self.plies / self.elapsed
+
+    def reset_stats(self):
+        self.rollouts = 0
+        self.plies = 0
+        self.elapsed = 0.0
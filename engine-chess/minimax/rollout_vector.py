@@ -0,0 +1,498 @@
+"""
+Random rollouts of many positions in lockstep on NumPy bitboards.
+
+Every rollout is one lane of a Positions batch: six uint64 piece bitboards
+for the side to move and six for its opponent (swapped after each move),
+plus colour to move, castling rights, en passant square and halfmove clock.
+A ply of all running lanes is played with array operations:
+- the pseudo-legal targets of every piece of every lane are computed at
+  once (Kogge-Stone fills for sliders, attack tables for the rest),
+- each lane draws one pseudo-legal move uniformly and keeps it if its king
+  is not attacked afterwards; lanes with an illegal draw draw again, so the
+  move is still uniform over the legal moves,
+- lanes in check, or whose draws keep failing (stalemate), play that ply
+  with python-chess, which also detects mate.
+
+Games end by the rules of rollout.play_out, except that repetitions are not
+tracked: a fivefold repetition within a short rollout is vanishingly rare.
+"""
+
+import chess
+import time
+import numpy as np
+
+from .rollout import MAX_REJECTIONS
+
+ONE = np.uint64(1)
+FULL = np.uint64(chess.BB_ALL)
+NOT_FILE_A = np.uint64(~chess.BB_FILE_A & chess.BB_ALL)
+NOT_FILE_H = np.uint64(~chess.BB_FILE_H & chess.BB_ALL)
+RANK_1 = np.uint64(chess.BB_RANK_1)
+RANK_3 = np.uint64(chess.BB_RANK_3)
+RANK_6 = np.uint64(chess.BB_RANK_6)
+RANK_8 = np.uint64(chess.BB_RANK_8)
+DARK_SQUARES = np.uint64(chess.BB_DARK_SQUARES)
+LIGHT_SQUARES = np.uint64(chess.BB_LIGHT_SQUARES)
+
+KNIGHT_ATTACKS = np.array(chess.BB_KNIGHT_ATTACKS, dtype=np.uint64)
+KING_ATTACKS = np.array(chess.BB_KING_ATTACKS, dtype=np.uint64)
+# Indexed [color][square] like chess.BB_PAWN_ATTACKS (BLACK = 0, WHITE = 1)
+PAWN_ATTACKS = np.array(chess.BB_PAWN_ATTACKS, dtype=np.uint64)
+
+# Ray directions as (shifts, squares a ray may enter without wrapping), grouped
+# by shift direction so one broadcast operation extends four rays; in each
+# group the first two rays are orthogonal and the last two diagonal
+RAYS = (
+    (np.left_shift, np.array([8, 1, 9, 7], dtype=np.uint64),
+     np.array([FULL, NOT_FILE_A, NOT_FILE_A, NOT_FILE_H], dtype=np.uint64)),
+    (np.right_shift, np.array([8, 1, 7, 9], dtype=np.uint64),
+     np.array([FULL, NOT_FILE_H, NOT_FILE_A, NOT_FILE_H], dtype=np.uint64)),
+)
+
+# Column of each piece type in Positions.us / Positions.them
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+PROMOTIONS = np.array([QUEEN, ROOK, BISHOP, KNIGHT])
+
+# Castling as (king to, rook from, rook to, squares between king and rook,
+# square the king passes) for White; Black's squares are 56 higher
+CASTLES = (
+    (chess.G1, chess.H1, chess.F1, chess.BB_F1 | chess.BB_G1, chess.F1),
+    (chess.C1, chess.A1, chess.D1, chess.BB_B1 | chess.BB_C1 | chess.BB_D1, chess.D1),
+)
+
+if hasattr(np, "bitwise_count"):
+    def _popcount(bitboards):
+        return np.bitwise_count(bitboards).astype(np.int64)
+else:
+    _BYTE_COUNTS = np.array([bin(value).count("1") for value in range(256)], dtype=np.int64)
+
+    def _popcount(bitboards):
+        bitboards = np.ascontiguousarray(bitboards, dtype="<u8")
+        return _BYTE_COUNTS[bitboards.view(np.uint8).reshape(bitboards.shape + (8,))].sum(axis=-1)
+
+
+def _bits(bitboards):
+    """Unpacks an (n,) or (n, k) uint64 array into (n, 64 * k) 0/1 square flags."""
+    bitboards = np.ascontiguousarray(bitboards, dtype="<u8").reshape(len(bitboards), -1)
+    return np.unpackbits(bitboards.view(np.uint8), axis=1, bitorder="little")
+
+
+def _square(bitboards):
+    """Square index of single-square bitboards."""
+    return _popcount(bitboards - ONE)
+
+
+def _slider_attacks(sources, occupied):
+    """
+    (orthogonal, diagonal) squares attacked from the sources bitboards,
+    using Kogge-Stone fills over the empty squares.
+    """
+    sources = sources[:, None]
+    empty = ~occupied[:, None]
+    attacks = np.zeros((len(occupied), 4), dtype=np.uint64)
+    for shift, steps, masks in RAYS:
+        propagator = empty & masks
+        generator = sources | (propagator & shift(sources, steps))
+        propagator &= shift(propagator, steps)
+        generator |= propagator & shift(generator, 2 * steps)
+        propagator &= shift(propagator, 2 * steps)
+        generator |= propagator & shift(generator, 4 * steps)
+        attacks |= shift(generator, steps) & masks
+    return attacks[:, 0] | attacks[:, 1], attacks[:, 2] | attacks[:, 3]
+
+
+def _attacked(targets, attackers, occupied, attacker_white):
+    """
+    Whether each single-square bitboard of targets is attacked by the
+    pieces in the matching row of attackers (an (n, 6) array). Empty
+    targets (a missing king in a set-up position) are never attacked.
+    """
+    square = np.minimum(_square(targets), 63)
+    hits = KNIGHT_ATTACKS[square] & attackers[:, KNIGHT]
+    hits |= KING_ATTACKS[square] & attackers[:, KING]
+    # A pawn attacks the target from where an opposite pawn on the target would attack
+    hits |= PAWN_ATTACKS[(~attacker_white).astype(np.intp), square] & attackers[:, PAWN]
+    orthogonal, diagonal = _slider_attacks(targets, occupied)
+    hits |= diagonal & (attackers[:, BISHOP] | attackers[:, QUEEN])
+    hits |= orthogonal & (attackers[:, ROOK] | attackers[:, QUEEN])
+    return (hits != 0) & (targets != 0)
+
+
+def _union(pieces):
+    return np.bitwise_or.reduce(pieces, axis=1)
+
+
+def _insufficient_side(side, other, bishops, pawns, knights):
+    """Vectorized chess.Board.has_insufficient_material for side."""
+    other_pieces = _union(other) & ~other[:, KING] & ~other[:, QUEEN]
+    knight_case = (_popcount(_union(side)) <= 2) & (other_pieces == 0)
+    same_colour = ((bishops & DARK_SQUARES) == 0) | ((bishops & LIGHT_SQUARES) == 0)
+    bishop_case = same_colour & (pawns == 0) & (knights == 0)
+    mating_material = (side[:, PAWN] | side[:, ROOK] | side[:, QUEEN]) != 0
+    return ~mating_material & np.where(side[:, KNIGHT] != 0, knight_case,
+                                       np.where(side[:, BISHOP] != 0, bishop_case, True))
+
+
+class Positions:
+    """
+    Array-backed positions, one per row, seen from the side to move.
+    us and them are (n, 6) uint64 bitboards in pawn..king order.
+    """
+
+    FIELDS = ("us", "them", "white", "castling", "ep", "halfmove")
+
+    def __init__(self, us, them, white, castling, ep, halfmove):
+        self.us = us
+        self.them = them
+        self.white = white
+        self.castling = castling
+        self.ep = ep
+        self.halfmove = halfmove
+
+    @classmethod
+    def from_boards(cls, boards):
+        count = len(boards)
+        positions = cls(np.zeros((count, 6), dtype=np.uint64), np.zeros((count, 6), dtype=np.uint64),
+                        np.zeros(count, dtype=bool), np.zeros(count, dtype=np.uint64),
+                        np.zeros(count, dtype=np.int64), np.zeros(count, dtype=np.int64))
+        for index, board in enumerate(boards):
+            positions.set_board(index, board)
+        return positions
+
+    def __len__(self):
+        return len(self.white)
+
+    def select(self, rows):
+        return Positions(*(getattr(self, field)[rows] for field in self.FIELDS))
+
+    def set_board(self, index, board: chess.Board):
+        pieces = (board.pawns, board.knights, board.bishops, board.rooks, board.queens, board.kings)
+        ours = board.occupied_co[board.turn]
+        theirs = board.occupied_co[not board.turn]
+        self.us[index] = [mask & ours for mask in pieces]
+        self.them[index] = [mask & theirs for mask in pieces]
+        self.white[index] = board.turn == chess.WHITE
+        self.castling[index] = board.clean_castling_rights()
+        self.ep[index] = -1 if board.ep_square is None else board.ep_square
+        self.halfmove[index] = board.halfmove_clock
+
+    def board(self, index) -> chess.Board:
+        """Row index as a chess.Board (without move history)."""
+        turn = bool(self.white[index])
+        ours = [int(mask) for mask in self.us[index]]
+        theirs = [int(mask) for mask in self.them[index]]
+        board = chess.Board(None)
+        (board.pawns, board.knights, board.bishops,
+         board.rooks, board.queens, board.kings) = (our | their for our, their in zip(ours, theirs))
+        board.occupied_co[turn] = ours[0] | ours[1] | ours[2] | ours[3] | ours[4] | ours[5]
+        board.occupied_co[not turn] = theirs[0] | theirs[1] | theirs[2] | theirs[3] | theirs[4] | theirs[5]
+        board.occupied = board.occupied_co[chess.WHITE] | board.occupied_co[chess.BLACK]
+        board.turn = turn
+        board.castling_rights = int(self.castling[index])
+        board.ep_square = None if self.ep[index] < 0 else int(self.ep[index])
+        board.halfmove_clock = int(self.halfmove[index])
+        return board
+
+    def in_check(self):
+        occupied = _union(self.us) | _union(self.them)
+        return _attacked(self.us[:, KING], self.them, occupied, ~self.white)
+
+    def insufficient_material(self):
+        bishops = self.us[:, BISHOP] | self.them[:, BISHOP]
+        pawns = self.us[:, PAWN] | self.them[:, PAWN]
+        knights = self.us[:, KNIGHT] | self.them[:, KNIGHT]
+        return (_insufficient_side(self.us, self.them, bishops, pawns, knights)
+                & _insufficient_side(self.them, self.us, bishops, pawns, knights))
+
+
+class _MoveTable:
+    """
+    Pseudo-legal moves of a Positions batch, grouped per piece: piece rows
+    hold (lane, piece type, from square, target bitboard, move count),
+    sorted by lane. Castling candidates are counted per lane after the pieces.
+    """
+
+    def __init__(self, positions: Positions):
+        us, them, white = positions.us, positions.them, positions.white
+        ours = _union(us)
+        theirs = _union(them)
+        occupied = ours | theirs
+        flags = np.flatnonzero(_bits(us).view(bool))
+        lane, piece, square = flags // 384, (flags >> 6) % 6, flags & 63
+        sources = ONE << square.astype(np.uint64)
+        targets = np.zeros(len(lane), dtype=np.uint64)
+
+        rows = piece == KNIGHT
+        targets[rows] = KNIGHT_ATTACKS[square[rows]]
+        rows = piece == KING
+        targets[rows] = KING_ATTACKS[square[rows]]
+        rows = (piece == BISHOP) | (piece == ROOK) | (piece == QUEEN)
+        orthogonal, diagonal = _slider_attacks(sources[rows], occupied[lane[rows]])
+        sliders = piece[rows]
+        targets[rows] = (np.where(sliders == BISHOP, np.uint64(0), orthogonal)
+                         | np.where(sliders == ROOK, np.uint64(0), diagonal))
+        targets &= ~ours[lane]
+
+        pawns = piece == PAWN
+        pawn_lane = lane[pawns]
+        pawn_white = white[pawn_lane]
+        empty = ~occupied[pawn_lane]
+        pawn_sources = sources[pawns]
+        single = np.where(pawn_white, pawn_sources << np.uint64(8), pawn_sources >> np.uint64(8)) & empty
+        double = np.where(pawn_white, (single & RANK_3) << np.uint64(8), (single & RANK_6) >> np.uint64(8)) & empty
+        ep = positions.ep[pawn_lane]
+        ep_mask = np.where(ep >= 0, ONE << np.maximum(ep, 0).astype(np.uint64), np.uint64(0))
+        captures = PAWN_ATTACKS[pawn_white.astype(np.intp), square[pawns]] & (theirs[pawn_lane] | ep_mask)
+        targets[pawns] = single | double | captures
+
+        counts = _popcount(targets)
+        # Each promotion square counts once per promotion piece
+        last_rank = np.where(pawn_white, RANK_8, RANK_1)
+        counts[pawns] += (len(PROMOTIONS) - 1) * _popcount(targets[pawns] & last_rank)
+
+        king = us[:, KING]
+        home = np.where(white, chess.BB_E1, chess.BB_E8).astype(np.uint64)
+        offset = np.where(white, 0, 56)
+        self.castles = []
+        for king_to, rook_from, rook_to, between, passes in CASTLES:
+            rook = ONE << (rook_from + offset).astype(np.uint64)
+            between_mask = np.where(white, np.uint64(between), np.uint64(between << 56))
+            self.castles.append((king == home) & (positions.castling & rook & ours != 0)
+                                & (occupied & between_mask == 0))
+
+        self.positions = positions
+        self.lane, self.piece, self.square, self.targets, self.counts = lane, piece, square, targets, counts
+        self.ends = np.cumsum(counts)
+        self.piece_totals = np.bincount(lane, weights=counts, minlength=len(positions)).astype(np.int64)
+        self.totals = self.piece_totals + self.castles[0] + self.castles[1]
+        self.lane_starts = np.cumsum(self.piece_totals) - self.piece_totals
+
+    def draw(self, lanes, rng):
+        """
+        Draws a pseudo-legal move for each of lanes. Returns (from square,
+        to square, piece type, promotion type or -1, castle index or -1).
+        """
+        draws = rng.integers(0, self.totals[lanes])
+        castle = draws - self.piece_totals[lanes]
+        by_piece = castle < 0
+
+        rows = np.searchsorted(self.ends, self.lane_starts[lanes] + draws, side="right")
+        rows = np.where(by_piece, rows, 0)
+        index = self.lane_starts[lanes] + draws - (self.ends[rows] - self.counts[rows])
+        flags = _bits(self.targets[rows]).astype(np.int64)
+        weights = 1 + (len(PROMOTIONS) - 1) * (
+            _bits(self.targets[rows] & self._last_rank(rows)).astype(np.int64))
+        cumulative = np.cumsum(flags * weights, axis=1)
+        to_square = np.argmax(cumulative > index[:, None], axis=1)
+        chosen = np.arange(len(lanes))
+        promotion_index = index - (cumulative[chosen, to_square] - weights[chosen, to_square])
+        promotion = np.where(weights[chosen, to_square] > 1, PROMOTIONS[np.minimum(promotion_index, 3)], -1)
+
+        white = self.positions.white[lanes]
+        # The kingside castle comes first when both are available
+        castle = np.where(by_piece, -1, np.where(self.castles[0][lanes], castle, castle + 1))
+        from_square = np.where(by_piece, self.square[rows], np.where(white, chess.E1, chess.E8))
+        castle_to = np.array([king_to for king_to, *_ in CASTLES])[np.maximum(castle, 0)] + np.where(white, 0, 56)
+        to_square = np.where(by_piece, to_square, castle_to)
+        piece = np.where(by_piece, self.piece[rows], KING)
+        promotion = np.where(by_piece, promotion, -1)
+        return from_square, to_square, piece, promotion, castle
+
+    def _last_rank(self, rows):
+        """Promotion rank of each row that is a pawn, 0 otherwise."""
+        last_rank = np.zeros(len(rows), dtype=np.uint64)
+        pawn = self.piece[rows] == PAWN
+        white = self.positions.white[self.lane[rows[pawn]]]
+        last_rank[pawn] = np.where(white, RANK_8, RANK_1)
+        return last_rank
+
+
+def _try_moves(positions: Positions, lanes, from_square, to_square, piece, promotion, castle):
+    """
+    Plays the drawn moves of lanes that are legal, in place. Returns the
+    mask of lanes whose move was legal (and played).
+    """
+    count = len(lanes)
+    rows = np.arange(count)
+    us = positions.us[lanes]
+    them = positions.them[lanes]
+    white = positions.white[lanes]
+    from_mask = ONE << from_square.astype(np.uint64)
+    to_mask = ONE << to_square.astype(np.uint64)
+
+    captured = np.any(them & to_mask[:, None] != 0, axis=1)
+    new_them = them & ~to_mask[:, None]
+    en_passant = (piece == PAWN) & (to_square == positions.ep[lanes])
+    victim = np.where(white, to_square - 8, to_square + 8)
+    new_them[en_passant, PAWN] &= ~(ONE << victim[en_passant].astype(np.uint64))
+    new_us = us.copy()
+    new_us[rows, piece] &= ~from_mask
+    new_us[rows, np.where(promotion >= 0, promotion, piece)] |= to_mask
+    castles = castle >= 0
+    offset = np.where(white, 0, 56)
+    for index, (_, rook_from, rook_to, _, _) in enumerate(CASTLES):
+        rows_castling = castle == index
+        shift = offset[rows_castling].astype(np.uint64)
+        new_us[rows_castling, ROOK] ^= (ONE << (np.uint64(rook_from) + shift)) | (ONE << (np.uint64(rook_to) + shift))
+
+    occupied = _union(new_us) | _union(new_them)
+    legal = ~_attacked(new_us[:, KING], new_them, occupied, ~white)
+    if castles.any():
+        # The king may not castle out of or through check
+        old_occupied = _union(us[castles]) | _union(them[castles])
+        passes = np.array([passes for *_, passes in CASTLES])[castle[castles]] + offset[castles]
+        safe = ~_attacked(from_mask[castles], them[castles], old_occupied, ~white[castles])
+        safe &= ~_attacked(ONE << passes.astype(np.uint64), them[castles], old_occupied, ~white[castles])
+        legal[castles] &= safe
+
+    played = lanes[legal]
+    castling = positions.castling[played] & ~(from_mask[legal] | to_mask[legal])
+    king_moves = piece[legal] == KING
+    castling[king_moves] &= ~np.where(white[legal][king_moves], RANK_1, RANK_8)
+    pawn_moves = piece[legal] == PAWN
+    double_push = pawn_moves & (np.abs(to_square[legal] - from_square[legal]) == 16)
+    positions.us[played] = new_them[legal]
+    positions.them[played] = new_us[legal]
+    positions.white[played] = ~white[legal]
+    positions.castling[played] = castling
+    positions.ep[played] = np.where(double_push, (from_square[legal] + to_square[legal]) // 2, -1)
+    positions.halfmove[played] = np.where(pawn_moves | captured[legal] | en_passant[legal], 0,
+                                          positions.halfmove[played] + 1)
+    return legal
+
+
+def _mate_results(white):
+    """Results of checkmates against the side to move."""
+    return np.where(white, -1.0, 1.0)
+
+
+def play_random_moves(positions: Positions, rng):
+    """
+    Plays one uniformly random legal move in every lane, in place.
+    Returns (lanes without a legal move, their results).
+    """
+    in_check = positions.in_check()
+    moves = _MoveTable(positions)
+    lanes = np.flatnonzero(~in_check & (moves.totals > 0))
+    for _ in range(MAX_REJECTIONS):
+        if not len(lanes):
+            break
+        legal = _try_moves(positions, lanes, *moves.draw(lanes, rng))
+        lanes = lanes[~legal]
+
+    # In check or out of luck: python-chess lists the legal moves
+    finished = []
+    results = []
+    for lane in np.concatenate([np.flatnonzero(in_check | (moves.totals == 0)), lanes]):
+        board = positions.board(lane)
+        legal_moves = list(board.generate_legal_moves())
+        if not legal_moves:
+            finished.append(lane)
+            results.append(float(_mate_results(board.turn)) if in_check[lane] else 0.0)
+            continue
+        board.push(legal_moves[rng.integers(len(legal_moves))])
+        positions.set_board(lane, board)
+    return np.array(finished, dtype=np.int64), np.array(results, dtype=float)
+
+
+def _checkmated(positions: Positions, lanes, in_check):
+    """Which of lanes (all in check) have no legal move."""
+    return np.array([
+        not any(positions.board(lane).generate_legal_moves()) for lane in lanes[in_check[lanes]]
+    ], dtype=bool)
+
+
+def play_out_batch(positions: Positions, max_steps=20, rng=None):
+    """
+    Plays every lane of positions to the end or for max_steps plies.
+    Returns (results, plies) arrays with the results of rollout.play_out:
+    1.0 White wins, -1.0 Black wins, 0.0 otherwise.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    results = np.zeros(len(positions))
+    plies = np.zeros(len(positions), dtype=np.int64)
+    running = np.arange(len(positions))
+    batch = positions.select(running)
+    step = 0
+    while len(running):
+        long_game = batch.halfmove >= 150
+        drawn = ~long_game & batch.insufficient_material()
+        # The 75-move rule and the step limit still score a mate on the board
+        check_mate = long_game | (~drawn if step >= max_steps else np.zeros(len(batch), dtype=bool))
+        ended = long_game | drawn | check_mate
+        if check_mate.any():
+            in_check = batch.in_check()
+            candidates = np.flatnonzero(check_mate)
+            mated = candidates[in_check[candidates]][_checkmated(batch, candidates, in_check)]
+            results[running[mated]] = _mate_results(batch.white[mated])
+        plies[running[ended]] = step
+        if ended.any():
+            batch = batch.select(~ended)
+            running = running[~ended]
+            if not len(running):
+                break
+
+        finished, finished_results = play_random_moves(batch, rng)
+        step += 1
+        plies[running] = step
+        if len(finished):
+            results[running[finished]] = finished_results
+            plies[running[finished]] = step - 1
+            keep = np.ones(len(running), dtype=bool)
+            keep[finished] = False
+            batch = batch.select(keep)
+            running = running[keep]
+    return results, plies
+
+
+class VectorRollouts:
+    """
+    Rollout backend playing all rollouts of a batch in lockstep.
+    Same interface and counters as RolloutEngine's evaluate().
+
+    Args:
+        rng: numpy.random.Generator (default: a fresh unseeded one).
+    """
+
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.rollouts = 0
+        self.plies = 0
+        self.elapsed = 0.0
+
+    def play(self, boards, rollout_count=30, max_steps=20):
+        """Returns a (boards x rollout_count) array of rollout results."""
+        start = time.perf_counter()
+        positions = Positions.from_boards([board for board in boards for _ in range(rollout_count)])
+        results, plies = play_out_batch(positions, max_steps, self.rng)
+        self.elapsed += time.perf_counter() - start
+        self.rollouts += len(results)
+        self.plies += int(plies.sum())
+        return results.reshape(len(boards), rollout_count)
+
+    def evaluate(self, board: chess.Board, rollout_count=30, max_steps=20) -> float:
+        """Average result of rollout_count rollouts from board."""
+        return float(self.play([board], rollout_count, max_steps).mean())
+
+    def evaluate_many(self, boards, rollout_count=30, max_steps=20):
+        """evaluate() of each board, with all their rollouts in one batch."""
+        if not boards:
+            return []
+        return self.play(boards, rollout_count, max_steps).mean(axis=1).tolist()
+
+    @property
+    def rollouts_per_sec(self) -> float:
+        if self.elapsed <= 0:
+            return 0.0
+        return self.rollouts / self.elapsed
+
+    @property
+    def plies_per_sec(self) -> float:
+        if self.elapsed <= 0:
+            return 0.0
+        return self.plies / self.elapsed
+
+    def reset_stats(self):
+        self.rollouts = 0
+        self.plies = 0
+        self.elapsed = 0.0
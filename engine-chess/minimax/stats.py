@@ -0,0 +1,137 @@
+"""
+Counters collected during a search, and the result object returned by search().
+"""
+
+
+class SearchStats:
+    """
+    Node and cutoff counters of one search.
+    """
+
+    def __init__(self):
+        self.nodes = 0
+        self.qnodes = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.aspiration_researches = 0
+        self.null_move_cutoffs = 0
+        self.lmr_reductions = 0
+        self.lmr_researches = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.eval_cache_hits = 0
+        self.eval_cache_misses = 0
+        self.mc_evaluations = 0
+        self.mc_skipped = 0
+        self.rollouts = 0
+        self.rollout_plies = 0
+        self.rollout_time = 0.0
+
+    def merge(self, other):
+        """Adds the counters of other (e.g. from a worker process) to this one."""
+        for name, value in vars(other).items():
+            setattr(self, name, getattr(self, name) + value)
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        """Fraction of beta cutoffs produced by the first move searched."""
+        if not self.cutoffs:
+            return 0.0
+        return self.first_move_cutoffs / self.cutoffs
+
+    @property
+    def cutoff_rate(self) -> float:
+        """Fraction of searched nodes that ended in a beta cutoff."""
+        if not self.nodes:
+            return 0.0
+        return self.cutoffs / self.nodes
+
+    @property
+    def tt_hit_rate(self) -> float:
+        """Fraction of transposition table probes that found an entry."""
+        if not self.tt_probes:
+            return 0.0
+        return self.tt_hits / self.tt_probes
+
+    @property
+    def rollouts_per_leaf(self) -> float:
+        """Average rollouts played per Monte Carlo leaf evaluation."""
+        if not self.mc_evaluations:
+            return 0.0
+        return self.rollouts / self.mc_evaluations
+
+    @property
+    def mc_skip_rate(self) -> float:
+        """Fraction of hybrid leaves scored statically instead of by rollouts."""
+        leaves = self.mc_evaluations + self.mc_skipped
+        if not leaves:
+            return 0.0
+        return self.mc_skipped / leaves
+
+    @property
+    def rollouts_per_sec(self) -> float:
+        """Monte Carlo rollouts per second of rollout time."""
+        if self.rollout_time <= 0:
+            return 0.0
+        return self.rollouts / self.rollout_time
+
+    @property
+    def rollout_plies_per_sec(self) -> float:
+        if self.rollout_time <= 0:
+            return 0.0
+        return self.rollout_plies / self.rollout_time
+
+    @property
+    def eval_cache_hit_rate(self) -> float:
+        """Fraction of evaluation cache lookups answered from the cache."""
+        lookups = self.eval_cache_hits + self.eval_cache_misses
+        if not lookups:
+            return 0.0
+        return self.eval_cache_hits / lookups
+
+
+class SearchResult:
+    """
+    Outcome of one search: the chosen move, its score from White's point of
+    view, the deepest completed depth, the principal variation and counters.
+    """
+
+    def __init__(self, best_move, score, depth, pv, elapsed, stats):
+        self.best_move = best_move
+        self.score = score
+        self.depth = depth
+        self.pv = pv
+        self.elapsed = elapsed
+        self.stats = stats
+
+    @property
+    def nodes(self) -> int:
+        """Nodes searched, including quiescence nodes."""
+        return self.stats.nodes + self.stats.qnodes
+
+    @property
+    def nps(self) -> float:
+        if self.elapsed <= 0:
+            return 0.0
+        return self.nodes / self.elapsed
+
+    def to_dict(self):
+        """JSON-friendly summary, as stored in experiment logs."""
+        return {
+            "move": self.best_move.uci() if self.best_move else None,
+            "score": self.score,
+            "depth": self.depth,
+            "pv": [move.uci() for move in self.pv],
+            "time": self.elapsed,
+            "nodes": self.nodes,
+            "nps": self.nps,
+            "cutoff_rate": self.stats.cutoff_rate,
+            "first_move_cutoff_rate": self.stats.first_move_cutoff_rate,
+            "tt_hit_rate": self.stats.tt_hit_rate,
+            "eval_cache_hit_rate": self.stats.eval_cache_hit_rate,
+            "rollouts": self.stats.rollouts,
+            "rollouts_per_leaf": self.stats.rollouts_per_leaf,
+            "mc_skip_rate": self.stats.mc_skip_rate,
+            "rollouts_per_sec": self.stats.rollouts_per_sec,
+            "rollout_plies_per_sec": self.stats.rollout_plies_per_sec,
+        }
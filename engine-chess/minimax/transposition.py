@@ -0,0 +1,104 @@
+"""
+Transposition table for the alpha-beta search.
+Positions are keyed by their Polyglot Zobrist hash and stored in a fixed
+number of slots, so memory use stays bounded however long the search runs.
+"""
+
+import chess
+import chess.polyglot
+
+# Bound types
+EXACT = 0
+LOWER = 1  # Score is a lower bound (search failed high)
+UPPER = 2  # Score is an upper bound (search failed low)
+
+# Replacement policies
+REPLACE_ALWAYS = "always"
+REPLACE_DEPTH = "depth"
+
+
+def position_key(board: chess.Board) -> int:
+    """
+    Returns the Zobrist key used to index the table.
+    """
+    return chess.polyglot.zobrist_hash(board)
+
+
+class TTEntry:
+    """A single stored search result."""
+
+    __slots__ = ("key", "depth", "score", "flag", "best_move")
+
+    def __init__(self, key, depth, score, flag, best_move):
+        self.key = key
+        self.depth = depth
+        self.score = score
+        self.flag = flag
+        self.best_move = best_move
+
+
+class TranspositionTable:
+    """
+    Fixed-size hash table of search results.
+
+    Args:
+        size: Number of slots. Each key maps to exactly one slot.
+        replacement: REPLACE_DEPTH keeps the deeper of two colliding entries
+            (ties go to the newer one), REPLACE_ALWAYS overwrites on every store.
+    """
+
+    def __init__(self, size=2 ** 18, replacement=REPLACE_DEPTH):
+        if size <= 0:
+            raise ValueError("Transposition table size must be positive")
+        if replacement not in (REPLACE_ALWAYS, REPLACE_DEPTH):
+            raise ValueError(f"Unknown replacement policy: {replacement}")
+        self.size = size
+        self.replacement = replacement
+        self._slots = [None] * size
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def probe(self, key):
+        """
+        Returns the entry stored for key, or None.
+        """
+        self.probes += 1
+        entry = self._slots[key % self.size]
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def lookup(self, key):
+        """
+        Like probe(), but without counting towards the hit statistics.
+        """
+        entry = self._slots[key % self.size]
+        if entry is not None and entry.key == key:
+            return entry
+        return None
+
+    def store(self, key, depth, score, flag, best_move=None):
+        """
+        Stores a search result, subject to the replacement policy.
+        """
+        index = key % self.size
+        current = self._slots[index]
+        if (current is not None and self.replacement == REPLACE_DEPTH
+                and current.key != key and current.depth > depth):
+            return
+        if current is not None and current.key == key and best_move is None:
+            # Keep the known best move when storing a result without one
+            best_move = current.best_move
+        self._slots[index] = TTEntry(key, depth, score, flag, best_move)
+        self.stores += 1
+
+    def clear(self):
+        self._slots = [None] * self.size
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def __len__(self):
+        return sum(1 for entry in self._slots if entry is not None)
@@ -5,10 +5,55 @@ Module to run games against Stockfish.
 import chess
 import chess.engine
 import time
-from minimax.minimax_ab import select_best_move
+from minimax.minimax_ab import search
+from minimax.eval_cache import EvalCache
+from minimax.mcts import MCTS
 from simulation.metrics import measure_move_time
+from simulation.stockfish_pool import get_stockfish_pool
 
-def play_vs_stockfish(stockfish_path, engine_depth, use_mc, rollout_count, engine_color=chess.WHITE, time_limit=0.1):
+ANALYSIS_MODES = ("multipv", "two-pass", "reuse", "deferred")
+
+# Stockfish search time for analysing one engine move
+ANALYSIS_LIMIT = chess.engine.Limit(time=0.1)
+
+# Lines of the "multipv" analysis search: the best move plus a runner-up, so
+# the search stays about as deep as a single-line one
+ANALYSIS_MULTIPV = 2
+
+def _score(info):
+    """Centipawn score of an analysis info, from the side to move's point of view."""
+    return info["score"].relative.score(mate_score=10000)
+
+def analyse_move(stockfish, board, move, limit=ANALYSIS_LIMIT, mode="multipv"):
+    """
+    Scores move on board with Stockfish. Returns (best_move, best_score,
+    chosen_score), scores in centipawns for the side to move.
+
+    "multipv" searches ANALYSIS_MULTIPV lines and takes the chosen move's
+    score from them when it is among them, otherwise from a search of the
+    chosen move alone; "two-pass" always searches the position, then the
+    chosen move alone. Both score every move at the depth a single-line
+    search of limit reaches.
+    """
+    if mode == "multipv":
+        infos = stockfish.analyse(board, limit, multipv=ANALYSIS_MULTIPV)
+        if isinstance(infos, dict):
+            infos = [infos]
+        best_move = infos[0]["pv"][0]
+        best_score = _score(infos[0])
+        for info in infos:
+            if info.get("pv") and info["pv"][0] == move:
+                return best_move, best_score, _score(info)
+    else:
+        info = stockfish.analyse(board, limit)
+        best_move = info["pv"][0]
+        best_score = _score(info)
+    info_chosen = stockfish.analyse(board, limit, root_moves=[move])
+    return best_move, best_score, _score(info_chosen)
+
+def play_vs_stockfish(stockfish_path, engine_depth, use_mc, rollout_count, engine_color=chess.WHITE, time_limit=0.1,
+                      search_options=None, mcts_options=None, show_progress=True, stockfish_options=None,
+                      analysis="reuse"):
     """
     Plays a single game: Custom Engine vs Stockfish.
     
@@ -19,6 +64,23 @@ def play_vs_stockfish(stockfish_path, engine_depth, use_mc, rollout_count, engin
         rollout_count: Number of rollouts for MC.
         engine_color: chess.WHITE or chess.BLACK.
         time_limit: Time limit for Stockfish per move.
+        search_options: Extra select_best_move keyword arguments for the custom engine.
+        mcts_options: If given, the custom engine plays MCTS instead of minimax,
+            with these MCTS.search keyword arguments (iterations, time_limit, workers);
+            engine_depth, use_mc, rollout_count and search_options are then unused.
+        show_progress: Print the engine's move times on one updating line
+            (off when several games run at once).
+        stockfish_options: get_stockfish_pool keyword arguments (size, threads,
+            hash_mb, options); Stockfish is taken from this process's warm pool.
+        analysis: How the engine's moves are scored for CP loss and best-move
+            match. "reuse" (the default) costs no extra search: the best move
+            and score come from Stockfish's previous search, the chosen move's
+            score from its reply search at time_limit (multipv where there is
+            none). "multipv" and "two-pass" search each engine move (see
+            analyse_move); "multipv" only saves the second search when the
+            chosen move is one of Stockfish's best two.
+            "deferred" skips it: the game only records its moves, to be
+            analysed later in a batch (see simulation.batch_analysis).
         
     Returns:
         dict: Game result and metrics.
@@ -27,87 +89,111 @@ def play_vs_stockfish(stockfish_path, engine_depth, use_mc, rollout_count, engin
     engine_move_times = []
     engine_cp_losses = []
     engine_best_move_matches = []
+    engine_search_stats = []
+    search_options = search_options or {}
+    # Leaf evaluations (or the MCTS tree) are reused across the engine's moves of this game
+    eval_cache = EvalCache()
+    mcts_tree = MCTS() if mcts_options is not None else None
+    if analysis not in ANALYSIS_MODES:
+        raise ValueError(f"Unknown analysis mode: {analysis}")
+    analysis_time = 0.0
+    # Stockfish's last search (reuse mode) and our move waiting for its score
+    last_info = {}
+    pending = None
+
+    def record(move, best_move, best_score, chosen_score):
+        engine_cp_losses.append(max(0, best_score - chosen_score))
+        engine_best_move_matches.append(1 if move == best_move else 0)
     
+    start = time.time()
     try:
         if stockfish_path == "mock":
             class MockEngine:
-                def play(self, board, limit):
+                def play(self, board, limit, **kwargs):
                     import random
                     if not list(board.legal_moves):
                          return chess.engine.PlayResult(None, None)
                     move = random.choice(list(board.legal_moves))
-                    return chess.engine.PlayResult(move, None)
+                    return chess.engine.PlayResult(move, None, {})
                 def quit(self):
                     pass
             stockfish = MockEngine()
+            release = stockfish.quit
         else:
-            # Use simple engine for Stockfish
+            # Engines stay running between games; only the first game pays for the start-up
             # Note: User must provide valid path.
-            stockfish = chess.engine.SimpleEngine.popen_uci(stockfish_path)
+            pool = get_stockfish_pool(stockfish_path, **(stockfish_options or {}))
+            stockfish = pool.acquire()
+            release = lambda: pool.release(stockfish)
     except FileNotFoundError:
         print(f"Stockfish not found at {stockfish_path}")
         return None
+    stockfish_startup_time = time.time() - start
 
     try:
         while not board.is_game_over():
             if board.turn == engine_color:
                 # Custom Engine Move
-                move, duration = measure_move_time(
-                    select_best_move, 
-                    board, 
-                    depth=engine_depth, 
-                    use_mc=use_mc, 
-                    rollout_count=rollout_count
-                )
-                print(f"\r    Move {board.fullmove_number} (Engine): {duration:.2f}s", end="", flush=True)
+                if mcts_tree is not None:
+                    search_result, duration = measure_move_time(mcts_tree.search, board, **mcts_options)
+                else:
+                    search_result, duration = measure_move_time(
+                        search, 
+                        board, 
+                        depth=engine_depth, 
+                        use_mc=use_mc, 
+                        rollout_count=rollout_count,
+                        eval_cache=eval_cache,
+                        **search_options
+                    )
+                move = search_result.best_move
+                if show_progress:
+                    print(f"\r    Move {board.fullmove_number} (Engine): {duration:.2f}s", end="", flush=True)
                 engine_move_times.append(duration)
+                engine_search_stats.append(search_result.to_dict())
                 if move is None:
                     # Should not happen unless no legal moves (game over check handles this)
                     break
                 
                 # Analyze Move (if Stockfish is available and not mock)
-                if stockfish and not isinstance(stockfish, type) and hasattr(stockfish, 'analyse'):
+                if analysis != "deferred" and hasattr(stockfish, 'analyse'):
+                    analysis_start = time.time()
                     try:
-                        # 1. Analyze position to get Best Move & Score
-                        limit = chess.engine.Limit(time=0.1)
-                        info = stockfish.analyse(board, limit, multipv=1)
-                        
-                        # Handle case where info might be a list (though usually it's a dict for multipv=1)
-                        if isinstance(info, list):
-                            info = info[0]
-                            
-                        best_move = info["pv"][0]
-                        best_score = info["score"].relative.score(mate_score=10000)
-                        
-                        # 2. Analyze Chosen Move
-                        info_chosen = stockfish.analyse(board, limit, root_moves=[move])
-                        
-                        if isinstance(info_chosen, list):
-                            info_chosen = info_chosen[0]
-                            
-                        chosen_score = info_chosen["score"].relative.score(mate_score=10000)
-                        
-                        # Calculate Metrics
-                        cp_loss = max(0, best_score - chosen_score)
-                        is_match = (move == best_move)
-                        
-                        engine_cp_losses.append(cp_loss)
-                        engine_best_move_matches.append(1 if is_match else 0)
-                        
-                        # print(f"    Move Analysis: CP Loss={cp_loss}, Match={is_match}")
-                        
+                        if analysis == "reuse" and last_info.get("score") and len(last_info.get("pv", [])) > 1:
+                            # Stockfish's last search predicted our best reply and its score;
+                            # the chosen move is scored by its next search
+                            pending = (move, last_info["pv"][1], -_score(last_info))
+                        else:
+                            best_move, best_score, chosen_score = analyse_move(
+                                stockfish, board, move, ANALYSIS_LIMIT, "two-pass" if analysis == "two-pass" else "multipv")
+                            record(move, best_move, best_score, chosen_score)
                     except Exception as e:
-                        print(f"Analysis failed: {e} (Type: {type(info) if 'info' in locals() else 'unknown'})")
-                        
+                        print(f"Analysis failed: {e}")
+                    analysis_time += time.time() - analysis_start
+
                 board.push(move)
+                if pending is not None and board.is_game_over():
+                    # No reply to score the move with: the result is exact
+                    record(*pending, 10000 if board.is_checkmate() else 0)
+                    pending = None
             else:
                 # Stockfish Move
-                result = stockfish.play(board, chess.engine.Limit(time=time_limit))
+                if analysis == "reuse":
+                    result = stockfish.play(board, chess.engine.Limit(time=time_limit),
+                                            info=chess.engine.INFO_SCORE | chess.engine.INFO_PV)
+                    last_info = result.info
+                    if pending is not None:
+                        if last_info.get("score"):
+                            record(*pending, -_score(last_info))
+                        pending = None
+                else:
+                    result = stockfish.play(board, chess.engine.Limit(time=time_limit))
                 board.push(result.move)
                 
     finally:
-        print() # Newline after progress bar
-        stockfish.quit()
+        if show_progress:
+            print() # Newline after progress bar
+        release()
         
     # Determine result
     result_score = 0.0 # 0 for loss, 0.5 draw, 1 win (from engine perspective)
@@ -127,6 +213,11 @@ def play_vs_stockfish(stockfish_path, engine_depth, use_mc, rollout_count, engin
         "engine_move_times": engine_move_times,
         "engine_cp_losses": engine_cp_losses,
         "engine_best_move_matches": engine_best_move_matches,
+        "engine_search_stats": engine_search_stats,
+        "stockfish_startup_time": stockfish_startup_time,
+        "analysis_time": analysis_time,
+        "engine_color": engine_color,
+        "moves": [move.uci() for move in board.move_stack],
         "fen": board.fen(),
         "fen": board.fen(),
         "termination": str(outcome.termination) if outcome else "Unknown"
@@ -0,0 +1,91 @@
+"""
+Deferred post-game analysis.
+
+Games played with analysis="deferred" only record their moves and timings.
+This stage replays them afterwards and scores every engine move with
+Stockfish (CP loss and best-move match, as play_vs_stockfish does inline),
+spreading the games over worker processes with one warm engine each.
+"""
+
+import chess
+import time
+
+from simulation.auto_vs_stockfish import analyse_move, ANALYSIS_LIMIT
+from simulation.game_runner import play_games, summarize_analysis
+from simulation.metrics import save_summary_json
+from simulation.stockfish_pool import get_stockfish_pool
+
+# Modes of analyse_move (reuse needs Stockfish's own searches during the game)
+BATCH_ANALYSIS_MODES = ("multipv", "two-pass")
+
+def analyse_game(moves, engine_color, stockfish_path, stockfish_options=None, mode="multipv"):
+    """
+    Replays moves (UCI) and scores the moves played by engine_color.
+    Returns the analysis fields of a play_vs_stockfish game record
+    (engine_cp_losses, engine_best_move_matches, analysis_time); if the
+    analysis fails, they hold the moves scored until then.
+    """
+    board = chess.Board()
+    cp_losses = []
+    matches = []
+    start = None
+    try:
+        with get_stockfish_pool(stockfish_path, **(stockfish_options or {})).game() as stockfish:
+            start = time.time()
+            for uci in moves:
+                move = chess.Move.from_uci(uci)
+                if board.turn == engine_color:
+                    best_move, best_score, chosen_score = analyse_move(stockfish, board, move, ANALYSIS_LIMIT, mode)
+                    cp_losses.append(max(0, best_score - chosen_score))
+                    matches.append(1 if move == best_move else 0)
+                board.push(move)
+    except Exception as e:
+        print(f"Analysis failed after {len(cp_losses)} moves: {e}")
+    return {
+        "engine_cp_losses": cp_losses,
+        "engine_best_move_matches": matches,
+        "analysis_time": time.time() - start if start is not None else 0.0,
+    }
+
+def analyse_games(games, stockfish_path, jobs=1, stockfish_options=None, mode="multipv"):
+    """
+    Analyses the game records of an experiment summary in place (jobs
+    processes, None for all cores) and returns them.
+    """
+    tasks = [
+        {
+            "moves": game["moves"],
+            "engine_color": game["engine_color"],
+            "stockfish_path": stockfish_path,
+            "stockfish_options": stockfish_options,
+            "mode": mode
+        }
+        for game in games
+    ]
+    describe = lambda i: f"Game {i+1}/{len(games)}"
+    for done, (i, analysis) in enumerate(play_games(analyse_game, tasks, jobs, describe), 1):
+        if analysis is None:
+            print(f"    {describe(i)} ({done}/{len(games)} done) failed")
+            continue
+        games[i].update(analysis)
+        print(f"    {describe(i)} ({done}/{len(games)} done) Moves: {len(analysis['engine_cp_losses'])}, Analysis: {analysis['analysis_time']:.2f}s")
+    return games
+
+def analyse_experiment(summary, stockfish_path, jobs=1, stockfish_options=None, mode="multipv", output_file=None):
+    """
+    Analyses the games of a run_experiment summary and updates its CP loss,
+    best-move match and analysis time metrics (saved to output_file if given).
+    """
+    if mode not in BATCH_ANALYSIS_MODES:
+        raise ValueError(f"Unknown analysis mode: {mode}")
+    start = time.time()
+    games = summary.get("games", [])
+    print(f"Analysing {len(games)} games ({mode})")
+    analyse_games(games, stockfish_path, jobs, stockfish_options, mode)
+    summary["metrics"].update(summarize_analysis(games))
+    summary["config"]["analysis"] = mode
+    if output_file:
+        save_summary_json(summary, output_file)
+    print(f"Analysis finished in {time.time() - start:.1f}s. Avg CP Loss: {summary['metrics']['avg_cp_loss']:.2f}, "
+          f"Move Match: {summary['metrics']['move_match_rate']:.2%}")
+    return summary
@@ -3,49 +3,132 @@ Runner for running multiple games and collecting aggregate metrics.
 """
 
 from simulation.auto_vs_stockfish import play_vs_stockfish
-from simulation.metrics import calculate_stats, calculate_winrate, save_summary_json
+from simulation.metrics import calculate_stats, calculate_winrate, save_summary_json, summarize_search_stats
+from simulation.stockfish_pool import shutdown_stockfish_pools
 import chess
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.util import Finalize
 
-def run_experiment(n_games, stockfish_path, engine_depth, use_mc, rollout_count, output_file):
+def _init_worker():
+    """
+    Keeps the warm Stockfish engines of a worker process across its games and
+    stops them when the pool shuts the worker down (the worker's finalizers
+    run before it waits for its threads).
+    """
+    Finalize(None, shutdown_stockfish_pools, exitpriority=0)
+
+def play_games(play, games, jobs=1, describe=None):
+    """
+    Calls play(**kwargs) for each kwargs in games and yields (index, result)
+    as the games finish: in order when jobs is 1 (printing describe(index)
+    before each game), otherwise on a pool of jobs processes (None for all
+    cores) in completion order. A game that raises is logged and yields
+    None as its result, so the other games of the run are kept.
+    """
+    if jobs == 1:
+        for index, kwargs in enumerate(games):
+            if describe is not None:
+                print(f"  {describe(index)}...")
+            try:
+                result = play(**kwargs)
+            except Exception as e:
+                print(f"    Game {index + 1} failed: {e!r}")
+                result = None
+            yield index, result
+        return
+    print(f"  Playing {len(games)} games on {jobs or os.cpu_count()} processes...")
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as pool:
+        futures = {pool.submit(play, **kwargs): index for index, kwargs in enumerate(games)}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"    Game {futures[future] + 1} failed: {e!r}")
+                result = None
+            yield futures[future], result
+
+# Per-game fields kept in the experiment summary (enough to analyse the games later)
+GAME_RECORD_KEYS = ("engine_color", "moves", "result_score", "termination", "engine_move_times",
+                    "engine_cp_losses", "engine_best_move_matches", "analysis_time")
+
+def summarize_analysis(games_data):
+    """
+    CP loss, best-move match and analysis time metrics of the analysed games.
+    """
+    cp_losses = [loss for game in games_data for loss in game.get("engine_cp_losses", [])]
+    matches = [match for game in games_data for match in game.get("engine_best_move_matches", [])]
+    avg_cp_loss, std_cp_loss = calculate_stats(cp_losses)
+    return {
+        "avg_cp_loss": avg_cp_loss,
+        "std_cp_loss": std_cp_loss,
+        "move_match_rate": calculate_winrate(matches), # Reusing calculate_winrate for average
+        "avg_analysis_time_per_game": calculate_stats([game.get("analysis_time", 0.0) for game in games_data])[0],
+    }
+
+def run_experiment(n_games, stockfish_path, engine_depth, use_mc, rollout_count, output_file, search_options=None,
+                   mcts_options=None, jobs=1, stockfish_options=None, analysis="reuse"):
     """
     Runs N games against Stockfish and saves the results.
+    search_options are extra select_best_move keyword arguments for the engine;
+    with mcts_options the engine plays MCTS instead (see play_vs_stockfish).
+    jobs > 1 (or None for all cores) plays that many games at once, each in
+    its own process with its own Stockfish; colors and the summary are the
+    same as when playing them one after another.
+    stockfish_options configure the pool of warm Stockfish engines (size,
+    threads, hash_mb; see get_stockfish_pool), one pool per process.
+    analysis selects how engine moves are scored (see play_vs_stockfish);
+    its time is reported apart from the engine's move times. The summary
+    keeps the moves of every game, so analysis="deferred" games can be
+    scored afterwards with analyze.py.
     """
     results = []
     all_move_times = []
-    all_cp_losses = []
-    all_matches = []
+    all_search_stats = []
+    startup_times = []
     
-    print(f"Starting experiment: {n_games} games, Depth={engine_depth}, MC={use_mc}")
+    if mcts_options is not None:
+        print(f"Starting experiment: {n_games} games, MCTS {mcts_options}")
+    else:
+        print(f"Starting experiment: {n_games} games, Depth={engine_depth}, MC={use_mc}")
     
-    for i in range(n_games):
-        print(f"  Game {i+1}/{n_games}...")
-        # Alternate colors to be fair
-        engine_color = chess.WHITE if i % 2 == 0 else chess.BLACK
-        
-        game_data = play_vs_stockfish(
-            stockfish_path, 
-            engine_depth, 
-            use_mc, 
-            rollout_count, 
-            engine_color=engine_color
-        )
-        
+    # Alternate colors to be fair
+    games = [
+        {
+            "stockfish_path": stockfish_path,
+            "engine_depth": engine_depth,
+            "use_mc": use_mc,
+            "rollout_count": rollout_count,
+            "engine_color": chess.WHITE if i % 2 == 0 else chess.BLACK,
+            "search_options": search_options,
+            "mcts_options": mcts_options,
+            "show_progress": jobs == 1,
+            "stockfish_options": stockfish_options,
+            "analysis": analysis
+        }
+        for i in range(n_games)
+    ]
+    describe = lambda i: f"Game {i+1}/{n_games}"
+
+    # Games are summarized in game order, whatever order they finished in
+    games_data = [None] * n_games
+    for done, (i, game_data) in enumerate(play_games(play_vs_stockfish, games, jobs, describe), 1):
+        games_data[i] = game_data
         if game_data:
-            results.append(game_data["result_score"])
-            all_move_times.extend(game_data["engine_move_times"])
-            all_cp_losses.extend(game_data.get("engine_cp_losses", []))
-            all_matches.extend(game_data.get("engine_best_move_matches", []))
-            
             avg_cp = calculate_stats(game_data.get("engine_cp_losses", []))[0]
-            print(f"    Result: {game_data['result_score']}, Avg Time: {calculate_stats(game_data['engine_move_times'])[0]:.4f}s, Avg CP Loss: {avg_cp:.2f}")
+            print(f"    {describe(i)} ({done}/{n_games} done) Result: {game_data['result_score']}, Avg Time: {calculate_stats(game_data['engine_move_times'])[0]:.4f}s, Avg CP Loss: {avg_cp:.2f}, Analysis: {game_data.get('analysis_time', 0.0):.2f}s")
         else:
-            print("    Game failed (Stockfish error?)")
+            print(f"    {describe(i)} ({done}/{n_games} done) failed (Stockfish error?)")
+
+    games_data = [game_data for game_data in games_data if game_data]
+    for game_data in games_data:
+        results.append(game_data["result_score"])
+        all_move_times.extend(game_data["engine_move_times"])
+        all_search_stats.extend(game_data.get("engine_search_stats", []))
+        startup_times.append(game_data.get("stockfish_startup_time", 0.0))
 
     avg_time, std_time = calculate_stats(all_move_times)
-    avg_cp_loss, std_cp_loss = calculate_stats(all_cp_losses)
-    match_rate = calculate_winrate(all_matches) # Reusing calculate_winrate for average
     win_rate = calculate_winrate(results)
     
     summary = {
@@ -53,27 +136,36 @@ def run_experiment(n_games, stockfish_path, engine_depth, use_mc, rollout_count,
             "n_games": n_games,
             "depth": engine_depth,
             "use_mc": use_mc,
-            "rollout_count": rollout_count
+            "rollout_count": rollout_count,
+            "search_options": search_options or {},
+            "mcts_options": mcts_options,
+            "stockfish_options": stockfish_options or {},
+            "analysis": analysis
         },
         "metrics": {
             "win_rate": win_rate,
             "avg_move_time": avg_time,
             "std_move_time": std_time,
-            "avg_cp_loss": avg_cp_loss,
-            "std_cp_loss": std_cp_loss,
-            "move_match_rate": match_rate,
-            "total_moves": len(all_move_times)
-        }
+            **summarize_analysis(games_data),
+            "total_moves": len(all_move_times),
+            "avg_stockfish_startup_time": calculate_stats(startup_times)[0],
+            **summarize_search_stats(all_search_stats)
+        },
+        "games": [{key: game_data.get(key) for key in GAME_RECORD_KEYS} for game_data in games_data]
     }
     
     save_summary_json(summary, output_file)
     print(f"Experiment finished. Win Rate: {win_rate}, Avg Time: {avg_time:.4f}s")
     return summary
 
-def run_h2h_experiment(n_games, depth, rollouts, output_file):
+def run_h2h_experiment(n_games, depth, rollouts, output_file, baseline_options=None, hybrid_options=None,
+                       mcts_options=None, jobs=1):
     """
     Runs a Head-to-Head experiment: Baseline vs Hybrid.
     Swaps colors every game.
+    baseline_options / hybrid_options are extra select_best_move keyword
+    arguments for each side (see play_h2h_game); with mcts_options the
+    Hybrid side plays MCTS instead. jobs as in run_experiment.
     """
     from simulation.h2h import play_h2h_game
     
@@ -87,26 +179,43 @@ def run_h2h_experiment(n_games, depth, rollouts, output_file):
     
     print(f"Starting H2H Experiment: {n_games} games, Depth={depth}, Rollouts={rollouts}")
     
-    for i in range(n_games):
-        # Swap colors: Even games (0, 2...) -> Baseline White. Odd games -> Baseline Black.
-        baseline_is_white = (i % 2 == 0)
-        
-        print(f"  Game {i+1}/{n_games} ({'Baseline White' if baseline_is_white else 'Hybrid White'})...")
-        
-        game_data = play_h2h_game(depth, depth, rollouts, baseline_is_white)
-        
+    # Swap colors: Even games (0, 2...) -> Baseline White. Odd games -> Baseline Black.
+    games = [
+        {
+            "baseline_depth": depth,
+            "hybrid_depth": depth,
+            "hybrid_rollouts": rollouts,
+            "baseline_is_white": i % 2 == 0,
+            "baseline_options": baseline_options,
+            "hybrid_options": hybrid_options,
+            "mcts_options": mcts_options
+        }
+        for i in range(n_games)
+    ]
+    describe = lambda i: f"Game {i+1}/{n_games} ({'Baseline White' if i % 2 == 0 else 'Hybrid White'})"
+
+    finished = [None] * n_games
+    for done, (i, game_data) in enumerate(play_games(play_h2h_game, games, jobs, describe), 1):
+        finished[i] = game_data
+        if game_data:
+            print(f"    {describe(i)} ({done}/{n_games} done) Winner: {game_data['winner']}")
+        else:
+            print(f"    {describe(i)} ({done}/{n_games} done) failed")
+
+    for game_data in finished:
         if game_data:
-            winner = game_data["winner"]
-            results[winner] += 1
+            results[game_data["winner"]] += 1
             games_data.append(game_data)
-            print(f"    Winner: {winner}")
             
     summary = {
         "config": {
             "n_games": n_games,
             "depth": depth,
             "rollouts": rollouts,
-            "mode": "h2h"
+            "mode": "h2h",
+            "baseline_options": baseline_options or {},
+            "hybrid_options": hybrid_options or {},
+            "mcts_options": mcts_options
         },
         "results": results,
         "games": games_data
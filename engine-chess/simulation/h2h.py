@@ -1,13 +1,17 @@
 """
 Module to run Head-to-Head games between Baseline (Minimax) and Hybrid (Minimax + MC) engines.
+The Hybrid side can also be played by the MCTS engine.
 """
 
 import chess
 import time
 from minimax.minimax_ab import select_best_move
+from minimax.eval_cache import EvalCache
+from minimax.mcts import MCTS
 from simulation.metrics import measure_move_time
 
-def play_h2h_game(baseline_depth, hybrid_depth, hybrid_rollouts, baseline_is_white=True):
+def play_h2h_game(baseline_depth, hybrid_depth, hybrid_rollouts, baseline_is_white=True,
+                  baseline_options=None, hybrid_options=None, mcts_options=None):
     """
     Plays a single game: Baseline vs Hybrid.
     
@@ -16,6 +20,13 @@ def play_h2h_game(baseline_depth, hybrid_depth, hybrid_rollouts, baseline_is_whi
         hybrid_depth: Depth for Hybrid engine.
         hybrid_rollouts: Rollouts for Hybrid engine.
         baseline_is_white: True if Baseline plays White, False if Black.
+        baseline_options: Extra select_best_move keyword arguments for Baseline
+            (e.g. {"null_move": True, "lmr": True}), for A/B testing search features.
+        hybrid_options: Extra select_best_move keyword arguments for Hybrid;
+            {"use_mc": False} makes it plain minimax, so a feature can be
+            A/B tested against Baseline with nothing else changed.
+        mcts_options: If given, the Hybrid side plays MCTS with these
+            MCTS.search keyword arguments (iterations, time_limit, workers) instead.
         
     Returns:
         dict: Game result and metrics.
@@ -29,6 +40,12 @@ def play_h2h_game(baseline_depth, hybrid_depth, hybrid_rollouts, baseline_is_whi
     baseline_color = chess.WHITE if baseline_is_white else chess.BLACK
     hybrid_color = chess.BLACK if baseline_is_white else chess.WHITE
     
+    baseline_options = baseline_options or {}
+    hybrid_options = hybrid_options or {}
+    # Hybrid leaf evaluations (or its MCTS tree) are reused across its moves of this game
+    hybrid_cache = EvalCache()
+    hybrid_tree = MCTS() if mcts_options is not None else None
+
     outcome = None
     
     try:
@@ -39,18 +56,25 @@ def play_h2h_game(baseline_depth, hybrid_depth, hybrid_rollouts, baseline_is_whi
                     select_best_move, 
                     board, 
                     depth=baseline_depth, 
-                    use_mc=False
+                    use_mc=False,
+                    **baseline_options
                 )
                 baseline_times.append(duration)
                 baseline_moves.append(move.uci() if move else "None")
+            elif hybrid_tree is not None:
+                # Hybrid side played by MCTS
+                result, duration = measure_move_time(hybrid_tree.search, board, **mcts_options)
+                move = result.best_move
+                hybrid_times.append(duration)
+                hybrid_moves.append(move.uci() if move else "None")
             else:
-                # Hybrid Move (Minimax + MC)
+                # Hybrid Move (Minimax + MC, unless hybrid_options turn MC off)
                 move, duration = measure_move_time(
                     select_best_move, 
                     board, 
                     depth=hybrid_depth, 
-                    use_mc=True, 
-                    rollout_count=hybrid_rollouts
+                    **{"use_mc": True, "rollout_count": hybrid_rollouts, "eval_cache": hybrid_cache,
+                       **hybrid_options}
                 )
                 hybrid_times.append(duration)
                 hybrid_moves.append(move.uci() if move else "None")
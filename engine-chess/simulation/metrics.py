@@ -45,3 +45,21 @@ def calculate_stats(move_times):
     if not move_times:
         return 0.0, 0.0
     return statistics.mean(move_times), statistics.stdev(move_times) if len(move_times) > 1 else 0.0
+
+def summarize_search_stats(search_stats):
+    """
+    Averages per-move search statistics (SearchResult.to_dict() entries)
+    into summary metrics.
+    """
+    def average(key):
+        return calculate_stats([entry[key] for entry in search_stats])[0]
+
+    return {
+        "avg_nodes": average("nodes"),
+        "avg_nps": average("nps"),
+        "avg_depth": average("depth"),
+        "avg_cutoff_rate": average("cutoff_rate"),
+        "avg_first_move_cutoff_rate": average("first_move_cutoff_rate"),
+        "avg_tt_hit_rate": average("tt_hit_rate"),
+        "avg_eval_cache_hit_rate": average("eval_cache_hit_rate")
+    }
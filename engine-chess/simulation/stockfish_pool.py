@@ -0,0 +1,164 @@
+"""
+Pool of warm Stockfish processes shared across games.
+
+Starting Stockfish costs a process launch, the UCI handshake and loading the
+NNUE network. A StockfishPool starts its engines once and lends them out one
+game at a time: each lease tells the engine a new game has started
+(ucinewgame, sent by python-chess when the game token changes), and an engine
+that crashed or stopped answering is replaced before it is lent again.
+"""
+
+import chess.engine
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _stop(engine):
+    """Quits an engine, killing it if it no longer answers."""
+    try:
+        engine.quit()
+    except Exception:
+        engine.close()
+
+
+class PooledEngine:
+    """
+    An engine lent by a StockfishPool for one game. play() and analyse()
+    behave as on chess.engine.SimpleEngine, tagged with this game so the
+    engine gets ucinewgame before the first search of the game (game=None
+    leaves the engine in its current game, e.g. for unrelated positions).
+    """
+
+    def __init__(self, engine, game=None):
+        self.engine = engine
+        self.game = game
+
+    def play(self, board, limit, **kwargs):
+        return self.engine.play(board, limit, game=self.game, **kwargs)
+
+    def analyse(self, board, limit, **kwargs):
+        return self.engine.analyse(board, limit, game=self.game, **kwargs)
+
+
+class StockfishPool:
+    """
+    Keeps size Stockfish processes running.
+
+    Args:
+        path: Path to the Stockfish executable.
+        size: Number of engine processes.
+        threads: Stockfish Threads option (default: the engine's own).
+        hash_mb: Stockfish Hash option in MB (default: the engine's own).
+        options: Further UCI options to configure.
+    """
+
+    def __init__(self, path, size=1, threads=None, hash_mb=None, options=None):
+        self.path = path
+        self.size = size
+        self.options = dict(options or {})
+        if threads is not None:
+            self.options["Threads"] = threads
+        if hash_mb is not None:
+            self.options["Hash"] = hash_mb
+        self.starts = 0
+        self.restarts = 0
+        self.startup_time = 0.0
+        self._idle = queue.Queue()
+        self._closed = False
+        for _ in range(size):
+            self._idle.put(self._start())
+
+    def _start(self):
+        start = time.time()
+        engine = chess.engine.SimpleEngine.popen_uci(self.path)
+        if self.options:
+            engine.configure(self.options)
+        self.starts += 1
+        self.startup_time += time.time() - start
+        return engine
+
+    def _restart(self, engine):
+        _stop(engine)
+        self.restarts += 1
+        return self._start()
+
+    def acquire(self, timeout=None, new_game=True) -> PooledEngine:
+        """
+        Takes an idle engine (waiting up to timeout seconds for one), restarting
+        it first if it no longer answers isready. With new_game the engine
+        starts a new game on its next search. Give it back with release().
+        """
+        if self._closed:
+            raise RuntimeError("StockfishPool is closed")
+        engine = self._idle.get(timeout=timeout)
+        try:
+            engine.ping()
+        except Exception:
+            engine = self._restart(engine)
+        return PooledEngine(engine, object() if new_game else None)
+
+    def release(self, lease: PooledEngine):
+        """Returns an engine to the pool (or stops it if the pool is closed)."""
+        if self._closed:
+            _stop(lease.engine)
+        else:
+            self._idle.put(lease.engine)
+
+    @contextmanager
+    def game(self, timeout=None, new_game=True):
+        """
+        Lends an engine for one game: `with pool.game() as engine: ...`.
+        """
+        lease = self.acquire(timeout, new_game)
+        try:
+            yield lease
+        finally:
+            self.release(lease)
+
+    def close(self):
+        """Stops the idle engines; engines still lent out stop when released."""
+        self._closed = True
+        while True:
+            try:
+                engine = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            _stop(engine)
+
+
+def get_stockfish_pool(path, size=1, threads=None, hash_mb=None, options=None) -> StockfishPool:
+    """
+    Returns this process's pool for path, creating it on first use and
+    recreating it if the size or options changed.
+    """
+    with _pools_lock:
+        pool = _pools.get(path)
+        wanted = dict(options or {})
+        if threads is not None:
+            wanted["Threads"] = threads
+        if hash_mb is not None:
+            wanted["Hash"] = hash_mb
+        if pool is None or pool.size != size or pool.options != wanted:
+            if pool is not None:
+                pool.close()
+            pool = StockfishPool(path, size, threads, hash_mb, options)
+            _pools[path] = pool
+        return pool
+
+
+def shutdown_stockfish_pools():
+    """
+    Stops the engines of every pool of this process. python-chess runs each
+    engine on a non-daemon thread, so a process must call this before it
+    exits or it waits for its warm engines forever.
+    """
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
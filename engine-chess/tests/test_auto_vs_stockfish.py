@@ -0,0 +1,93 @@
+"""
+Tests for the analysis of engine moves during a game against Stockfish,
+played against a scripted in-process engine.
+"""
+
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chess
+import chess.engine
+from simulation.auto_vs_stockfish import play_vs_stockfish
+
+def _mate_in_one(board):
+    """A move that mates on board, or None."""
+    for move in board.legal_moves:
+        board.push(move)
+        mate = board.is_checkmate()
+        board.pop()
+        if mate:
+            return move
+    return None
+
+class FakeStockfish:
+    """
+    Stands in for a pooled Stockfish: plays a move that lets the opponent mate
+    in one whenever it has one, else the first legal move in UCI order that
+    does not repeat a position, and reports the reply it expects in its pv.
+    """
+
+    def __init__(self):
+        self.analyse_calls = 0
+
+    def play(self, board, limit, info=chess.engine.INFO_NONE, **kwargs):
+        moves = sorted(board.legal_moves, key=lambda move: move.uci())
+        move, reply, score = None, None, chess.engine.Cp(0)
+        for candidate in moves:
+            board.push(candidate)
+            mate = _mate_in_one(board)
+            repeated = board.is_repetition(2)
+            board.pop()
+            if mate is not None:
+                move, reply, score = candidate, mate, chess.engine.Mate(-1)
+                break
+            if move is None and not repeated:
+                move = candidate
+        move = move or moves[0]
+        if reply is None:
+            board.push(move)
+            reply = next(iter(board.legal_moves), None)
+            board.pop()
+        pv = [move] + ([reply] if reply is not None else [])
+        return chess.engine.PlayResult(move, None, {"score": chess.engine.PovScore(score, board.turn), "pv": pv})
+
+    def analyse(self, board, limit, **kwargs):
+        self.analyse_calls += 1
+        move = sorted(board.legal_moves, key=lambda move: move.uci())[0]
+        return {"score": chess.engine.PovScore(chess.engine.Cp(0), board.turn), "pv": [move]}
+
+class FakePool:
+    def __init__(self, engine):
+        self.engine = engine
+
+    def acquire(self):
+        return self.engine
+
+    def release(self, engine):
+        pass
+
+class TestReuseAnalysis(unittest.TestCase):
+    def test_reuse_scores_every_move_from_stockfish_searches(self):
+        stockfish = FakeStockfish()
+        with mock.patch("simulation.auto_vs_stockfish.get_stockfish_pool", return_value=FakePool(stockfish)):
+            game = play_vs_stockfish("fake", 1, False, 0, engine_color=chess.BLACK, show_progress=False,
+                                     analysis="reuse")
+
+        # Every engine move is scored without an extra Stockfish search
+        self.assertEqual(stockfish.analyse_calls, 0)
+        self.assertEqual(len(game["engine_cp_losses"]), len(game["engine_move_times"]))
+        self.assertEqual(len(game["engine_best_move_matches"]), len(game["engine_move_times"]))
+
+        # The engine mates as predicted: the last move is scored at the end of
+        # the game (no reply search), as the best move with no loss
+        self.assertEqual(game["result_score"], 1.0)
+        self.assertEqual(game["engine_best_move_matches"][-1], 1)
+        self.assertEqual(game["engine_cp_losses"][-1], 0)
+
+if __name__ == "__main__":
+    unittest.main()
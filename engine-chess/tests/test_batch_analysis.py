@@ -0,0 +1,61 @@
+"""
+Tests for deferred batch analysis.
+"""
+
+import unittest
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chess
+from stockfish_config import get_default_stockfish_path, validate_stockfish
+from simulation.auto_vs_stockfish import play_vs_stockfish
+from simulation.game_runner import summarize_analysis
+from simulation.batch_analysis import analyse_game, analyse_experiment
+
+STOCKFISH_PATH = get_default_stockfish_path()
+
+class TestBatchAnalysis(unittest.TestCase):
+    def test_deferred_game_records_moves(self):
+        game = play_vs_stockfish("mock", 1, False, 0, engine_color=chess.BLACK, show_progress=False,
+                                 analysis="deferred")
+        board = chess.Board()
+        for uci in game["moves"]:
+            board.push_uci(uci)
+        self.assertTrue(board.is_game_over())
+        self.assertEqual(game["engine_color"], chess.BLACK)
+        self.assertEqual(len(game["engine_move_times"]), len(game["moves"]) // 2)
+        self.assertEqual(game["engine_cp_losses"], [])
+
+    def test_summarize_analysis(self):
+        metrics = summarize_analysis([
+            {"engine_cp_losses": [0, 20], "engine_best_move_matches": [1, 0], "analysis_time": 1.0},
+            {"engine_cp_losses": [40], "engine_best_move_matches": [1], "analysis_time": 3.0},
+        ])
+        self.assertEqual(metrics["avg_cp_loss"], 20)
+        self.assertAlmostEqual(metrics["move_match_rate"], 2 / 3)
+        self.assertEqual(metrics["avg_analysis_time_per_game"], 2.0)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            analyse_experiment({"games": [], "metrics": {}, "config": {}}, "stockfish", mode="reuse")
+
+    def test_failed_analysis_returns_empty(self):
+        analysis = analyse_game(["e2e4", "e7e5"], chess.BLACK, "/nonexistent/stockfish")
+        self.assertEqual(analysis["engine_cp_losses"], [])
+        self.assertEqual(analysis["engine_best_move_matches"], [])
+        self.assertEqual(analysis["analysis_time"], 0.0)
+
+    @unittest.skipUnless(STOCKFISH_PATH and validate_stockfish(STOCKFISH_PATH), "Stockfish not installed")
+    def test_analyse_game(self):
+        # Fool's mate: Black's moves are analysed, the last one (Qh4#) is mate
+        moves = ["f2f3", "e7e5", "g2g4", "d8h4"]
+        analysis = analyse_game(moves, chess.BLACK, STOCKFISH_PATH)
+        self.assertEqual(len(analysis["engine_cp_losses"]), 2)
+        self.assertEqual(analysis["engine_best_move_matches"][-1], 1)
+        self.assertEqual(analysis["engine_cp_losses"][-1], 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Tests for the LRU evaluation cache.
+"""
+
+import unittest
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chess
+from minimax.eval_cache import EvalCache, ENTRY_BYTES
+from minimax.minimax_ab import search
+
+class TestEvalCache(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = EvalCache()
+        self.assertIsNone(cache.get(1, ("mc", 10)))
+        cache.put(1, ("mc", 10), 0.5)
+        self.assertEqual(cache.get(1, ("mc", 10)), 0.5)
+        # Same position under another evaluator config is a different entry
+        self.assertIsNone(cache.get(1, ("mc", 20)))
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertAlmostEqual(cache.hit_rate, 1 / 3)
+
+    def test_lru_eviction(self):
+        cache = EvalCache(max_entries=2)
+        cache.put(1, "c", 1.0)
+        cache.put(2, "c", 2.0)
+        cache.get(1, "c")  # 2 is now the least recently used
+        cache.put(3, "c", 3.0)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+        self.assertIsNone(cache.get(2, "c"))
+        self.assertEqual(cache.get(1, "c"), 1.0)
+        self.assertEqual(cache.get(3, "c"), 3.0)
+
+    def test_memory_budget(self):
+        cache = EvalCache(max_bytes=10 * ENTRY_BYTES)
+        self.assertEqual(cache.max_entries, 10)
+        for key in range(25):
+            cache.put(key, "c", 0.0)
+        self.assertEqual(len(cache), 10)
+        with self.assertRaises(ValueError):
+            EvalCache(max_entries=0)
+
+    def test_reused_across_searches(self):
+        cache = EvalCache()
+        board = chess.Board("r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4")
+        first = search(board, depth=2, use_mc=True, rollout_count=2, eval_cache=cache)
+        self.assertGreater(len(cache), 0)
+        # Every miss stored one entry (re-searched leaves may already hit)
+        self.assertEqual(first.stats.eval_cache_misses, len(cache))
+
+        second = search(board, depth=2, use_mc=True, rollout_count=2, eval_cache=cache)
+        self.assertEqual(second.stats.eval_cache_misses, 0)
+        self.assertEqual(second.stats.eval_cache_hit_rate, 1.0)
+        self.assertEqual(second.best_move, first.best_move)
+        self.assertEqual(second.score, first.score)
+
+        # Static evaluation does not touch the cache
+        static = search(board, depth=2, eval_cache=cache)
+        self.assertEqual(static.stats.eval_cache_hits + static.stats.eval_cache_misses, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Tests for the piece-square-table evaluator.
+"""
+
+import unittest
+import sys
+import os
+import random
+
+# Add parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chess
+from minimax.evaluator_pst import evaluate_pst, pst_state, PSTTracker, MAX_PHASE
+from minimax.minimax_ab import search, SearchContext
+
+FENS = [
+    chess.STARTING_FEN,
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+    "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+]
+
+class TestEvaluatorPST(unittest.TestCase):
+    def test_initial_position_is_equal(self):
+        board = chess.Board()
+        self.assertEqual(evaluate_pst(board), 0)
+        self.assertEqual(pst_state(board)[2], MAX_PHASE)
+
+    def test_mirrored_position_negates_score(self):
+        for fen in FENS:
+            board = chess.Board(fen)
+            self.assertAlmostEqual(evaluate_pst(board), -evaluate_pst(board.mirror()))
+
+    def test_centralized_knight_scores_higher(self):
+        rim = chess.Board("4k3/pppp4/8/8/8/8/PPPP4/N3K3 w - - 0 1")
+        center = chess.Board("4k3/pppp4/8/8/3N4/8/PPPP4/4K3 w - - 0 1")
+        self.assertGreater(evaluate_pst(center), evaluate_pst(rim))
+
+    def test_incremental_matches_full_computation(self):
+        rng = random.Random(3)
+        for fen in FENS:
+            for _ in range(5):
+                board = chess.Board(fen)
+                tracker = PSTTracker()
+                tracker.reset(board)
+                for _ in range(150):
+                    moves = list(board.legal_moves)
+                    if not moves:
+                        break
+                    move = rng.choice(moves)
+                    tracker.push(board, move)
+                    board.push(move)
+                    self.assertEqual((tracker.mg, tracker.eg, tracker.phase), pst_state(board), board.fen())
+                while board.move_stack:
+                    tracker.pop()
+                    board.pop()
+                self.assertEqual((tracker.mg, tracker.eg, tracker.phase), pst_state(board))
+
+    def test_search_with_pst(self):
+        context = SearchContext(evaluator="pst")
+        board = chess.Board(FENS[1])
+        context.set_root(board)
+        self.assertEqual(context.evaluate(board), evaluate_pst(board))
+
+        # Mate in one is still found
+        board = chess.Board("4k3/R7/4K3/8/8/8/8/8 w - - 0 1")
+        result = search(board, depth=2, evaluator="pst")
+        self.assertEqual(result.best_move, chess.Move.from_uci("a7a8"))
+
+    def test_unknown_evaluator(self):
+        with self.assertRaises(ValueError):
+            SearchContext(evaluator="nnue")
+
+if __name__ == '__main__':
+    unittest.main()
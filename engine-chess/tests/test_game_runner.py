@@ -0,0 +1,50 @@
+"""
+Tests for the experiment runner.
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+# Add parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation.game_runner import run_experiment, play_games
+
+def _game(index):
+    return {"index": index, "pid": os.getpid()}
+
+def _failing_game(index):
+    if index == 2:
+        raise RuntimeError("engine crashed")
+    return _game(index)
+
+class TestGameRunner(unittest.TestCase):
+    def test_play_games_returns_every_game(self):
+        games = [{"index": index} for index in range(6)]
+        self.assertEqual([index for index, _ in play_games(_game, games)], list(range(6)))
+        finished = dict(play_games(_game, games, jobs=2))
+        self.assertEqual(sorted(finished), list(range(6)))
+        self.assertTrue(all(finished[index]["index"] == index for index in finished))
+        self.assertNotIn(os.getpid(), {data["pid"] for data in finished.values()})
+
+    def test_failed_game_keeps_the_others(self):
+        games = [{"index": index} for index in range(4)]
+        for jobs in (1, 2):
+            finished = dict(play_games(_failing_game, games, jobs=jobs))
+            self.assertEqual(sorted(finished), list(range(4)))
+            self.assertIsNone(finished[2])
+            self.assertEqual([finished[index]["index"] for index in (0, 1, 3)], [0, 1, 3])
+
+    def test_parallel_experiment_keeps_summary(self):
+        with tempfile.TemporaryDirectory() as directory:
+            serial = run_experiment(2, "mock", 1, False, 0, os.path.join(directory, "serial.json"))
+            parallel = run_experiment(2, "mock", 1, False, 0, os.path.join(directory, "parallel.json"), jobs=2)
+            self.assertTrue(os.path.exists(os.path.join(directory, "parallel.json")))
+        self.assertEqual(parallel["config"], serial["config"])
+        self.assertEqual(set(parallel["metrics"]), set(serial["metrics"]))
+        self.assertGreater(parallel["metrics"]["total_moves"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
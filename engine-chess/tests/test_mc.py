@@ -5,12 +5,17 @@ Tests for Monte Carlo Evaluation.
 import unittest
 import sys
 import os
+import random
+import collections
 
 # Add parent directory to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import chess
 from minimax.evaluator_mc import evaluate_mc, simulate_random
+from minimax.rollout import RolloutEngine, _random_legal_move, MIN_ROLLOUTS
+from minimax.minimax_ab import search, _needs_rollouts, MC_BAND
+from minimax.evaluator_static import evaluate_static
 
 class TestMC(unittest.TestCase):
     def test_simulate_random_range(self):
@@ -23,5 +28,104 @@ class TestMC(unittest.TestCase):
         score = evaluate_mc(board, rollout_count=5)
         self.assertTrue(-1.0 <= score <= 1.0, "Average score should be between -1 and 1")
 
+    def test_random_move_is_uniform_over_legal_moves(self):
+        rng = random.Random(0)
+        for fen in [
+            "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R b KQkq - 0 1",
+            "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 b kq - 0 1",
+            "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+            "r3k2r/8/8/8/8/5b2/8/R3K2R w KQkq - 0 1",
+        ]:
+            board = chess.Board(fen)
+            legal = set(board.legal_moves)
+            counts = collections.Counter(_random_legal_move(board, rng) for _ in range(200 * len(legal)))
+            self.assertEqual(set(counts), legal, fen)
+            # Each move expects 200 draws; 4 standard deviations is about 57
+            self.assertLess(max(abs(count - 200) for count in counts.values()), 60, fen)
+
+        # Checkmate and stalemate have no move
+        self.assertIsNone(_random_legal_move(chess.Board("k7/1Q6/1K6/8/8/8/8/8 b - - 0 1"), rng))
+        self.assertIsNone(_random_legal_move(chess.Board("k7/8/1Q6/8/8/8/8/7K b - - 0 1"), rng))
+
+    def test_rollout_engine_terminal_positions(self):
+        engine = RolloutEngine(random.Random(1))
+        self.assertEqual(engine.rollout(chess.Board("k7/1Q6/1K6/8/8/8/8/8 b - - 0 1")), 1.0)
+        self.assertEqual(engine.rollout(chess.Board("K7/1q6/1k6/8/8/8/8/8 w - - 0 1")), -1.0)
+        self.assertEqual(engine.rollout(chess.Board("k7/8/1Q6/8/8/8/8/7K b - - 0 1")), 0.0)
+        self.assertEqual(engine.rollout(chess.Board("k7/8/8/8/8/8/8/6NK w - - 0 1")), 0.0)
+        # A mate on the last allowed ply still counts
+        self.assertEqual(engine.rollout(chess.Board("k7/1Q6/1K6/8/8/8/8/8 b - - 0 1"), max_steps=0), 1.0)
+        self.assertEqual(engine.rollouts, 5)
+
+    def test_rollout_engine_matches_simulate_random(self):
+        board = chess.Board("k7/8/1K6/8/8/8/8/7Q w - - 0 1")
+        random.seed(1)
+        reference = sum(simulate_random(board) for _ in range(2000)) / 2000
+        engine = RolloutEngine(random.Random(2))
+        fast = engine.evaluate(board, 2000)
+        # Mate rate is about 18%; 4 standard deviations of the difference is about 0.05
+        self.assertAlmostEqual(fast, reference, delta=0.05)
+        self.assertGreater(engine.plies, 0)
+        self.assertGreater(engine.rollouts_per_sec, 0)
+        self.assertGreater(engine.plies_per_sec, 0)
+
+    def test_search_reports_rollouts(self):
+        result = search(chess.Board(), depth=1, use_mc=True, rollout_count=2)
+        self.assertEqual(result.stats.rollouts, 2 * 20)
+        self.assertGreater(result.to_dict()["rollouts_per_sec"], 0)
+
+    def test_adaptive_stops_when_rollouts_agree(self):
+        engine = RolloutEngine(random.Random(3))
+        # Random games from the start almost never finish within 20 plies
+        mean, used, outside = engine.evaluate_adaptive(chess.Board(), max_rollouts=30)
+        self.assertEqual((mean, used, outside), (0.0, MIN_ROLLOUTS, False))
+        self.assertEqual(engine.rollouts, MIN_ROLLOUTS)
+
+    def test_adaptive_stops_outside_window(self):
+        board = chess.Board("k7/8/1K6/8/8/8/8/7Q w - - 0 1")
+        engine = RolloutEngine(random.Random(4))
+        # White mates in some rollouts and never loses: the mean is far above -0.5
+        mean, used, outside = engine.evaluate_adaptive(board, 100, high=-0.5, tolerance=0.0)
+        self.assertTrue(outside)
+        self.assertEqual(used, MIN_ROLLOUTS)
+        self.assertGreaterEqual(mean, 0.0)
+        # Inside the window with no tolerance all rollouts are played
+        mean, used, outside = engine.evaluate_adaptive(board, 100, tolerance=0.0)
+        self.assertEqual((used, outside), (100, False))
+
+    def test_adaptive_search_uses_fewer_rollouts(self):
+        board = chess.Board("r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4")
+        result = search(board, depth=2, use_mc=True, rollout_count=30, adaptive_rollouts=True)
+        self.assertGreater(result.stats.mc_evaluations, 0)
+        self.assertLess(result.stats.rollouts_per_leaf, 30)
+        self.assertGreaterEqual(result.to_dict()["rollouts_per_leaf"], MIN_ROLLOUTS)
+
+    def test_selective_needs_rollouts(self):
+        def needs(fen):
+            board = chess.Board(fen)
+            return _needs_rollouts(board, evaluate_static(board), MC_BAND)
+
+        # Level material
+        self.assertTrue(needs(chess.STARTING_FEN))
+        # A quiet queen up
+        self.assertFalse(needs("4k3/pppp4/8/8/8/8/PPPP4/3QK3 b - - 0 1"))
+        # A queen up but in check, or able to take a hanging rook
+        self.assertTrue(needs("4k3/pppp4/8/8/8/8/PPPP4/3QK1r1 w - - 0 1"))
+        self.assertTrue(needs("4k2r/pppp4/8/8/8/8/PPPP3R/3QK3 b - - 0 1"))
+        # En passant does not count as a capture of a piece
+        self.assertFalse(needs("4k3/8/8/3pP3/8/8/8/3QK3 w - d6 0 2"))
+
+    def test_selective_search_skips_clear_leaves(self):
+        board = chess.Board("4k3/pppp4/8/8/8/8/PPPP4/3QK3 w - - 0 1")
+        result = search(board, depth=2, use_mc=True, rollout_count=4, selective_mc=True)
+        self.assertGreater(result.stats.mc_skipped, 0)
+        self.assertGreater(result.to_dict()["mc_skip_rate"], 0.5)
+        self.assertGreater(result.score, 0)
+
+        # Mate is still found
+        board = chess.Board("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+        result = search(board, depth=2, use_mc=True, rollout_count=4, selective_mc=True)
+        self.assertEqual(result.best_move, chess.Move.from_uci("a1a8"))
+
 if __name__ == "__main__":
     unittest.main()
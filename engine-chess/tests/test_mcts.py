@@ -0,0 +1,63 @@
+"""
+Tests for the MCTS engine.
+"""
+
+import unittest
+import random
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chess
+from minimax.mcts import MCTS, mcts_search, select_best_move_mcts
+
+class TestMCTS(unittest.TestCase):
+    def test_finds_mate_in_one(self):
+        result = mcts_search(chess.Board("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1"), iterations=300,
+                             rng=random.Random(0))
+        self.assertEqual(result.best_move, chess.Move.from_uci("a1a8"))
+        self.assertEqual(result.score, 1000)
+
+        result = mcts_search(chess.Board("k7/8/8/8/8/8/1r3PPP/6K1 b - - 0 1"), iterations=300,
+                             rng=random.Random(0))
+        self.assertEqual(result.best_move, chess.Move.from_uci("b2b1"))
+        self.assertEqual(result.score, -1000)
+
+    def test_stops_by_iterations_or_time(self):
+        tree = MCTS(rng=random.Random(1))
+        result = tree.search(chess.Board(), iterations=50)
+        self.assertEqual(result.stats.nodes, 50)
+        self.assertEqual(tree.root.visits, 50)
+        self.assertGreater(result.stats.rollouts, 0)
+        self.assertIn(result.best_move, chess.Board().legal_moves)
+
+        result = MCTS().search(chess.Board(), time_limit=0.2)
+        self.assertGreater(result.stats.nodes, 0)
+        self.assertLess(result.elapsed, 1.0)
+
+    def test_tree_is_reused_after_move_and_reply(self):
+        tree = MCTS(rng=random.Random(2))
+        board = chess.Board()
+        result = tree.search(board, iterations=400)
+        board.push(result.best_move)
+        reply = tree.root.most_visited().most_visited()
+        board.push(reply.move)
+        kept = reply.visits
+
+        tree.search(board, iterations=100)
+        self.assertIs(tree.root, reply)
+        self.assertEqual(tree.root.visits, kept + 100)
+        self.assertIsNone(tree.root.parent)
+
+        # An unrelated position starts a new tree
+        tree.search(chess.Board("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1"), iterations=10)
+        self.assertEqual(tree.root.visits, 10)
+
+    def test_select_best_move_mcts(self):
+        move = select_best_move_mcts(chess.Board("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1"), iterations=300)
+        self.assertEqual(move, chess.Move.from_uci("a1a8"))
+
+if __name__ == '__main__':
+    unittest.main()
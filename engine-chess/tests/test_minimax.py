@@ -5,13 +5,39 @@ Tests for Minimax and Static Evaluation.
 import unittest
 import sys
 import os
+import time
+import math
+import random
 
 # Add parent directory to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import chess
-from minimax.evaluator_static import evaluate_static
-from minimax.minimax_ab import minimax, select_best_move
+from minimax.evaluator_static import evaluate_static, material_score, PIECE_VALUES
+from minimax.minimax_ab import minimax, search, select_best_move, SearchContext, _has_legal_move
+from minimax.stats import SearchStats
+from minimax.transposition import TranspositionTable
+
+def square_scan_material(board):
+    """Reference material count looping over every square."""
+    score = 0
+    for square in chess.SQUARES:
+        piece = board.piece_at(square)
+        if piece:
+            value = PIECE_VALUES[piece.piece_type]
+            score += value if piece.color == chess.WHITE else -value
+    return score
+
+def plain_minimax(board, depth):
+    """Reference search without pruning, from White's point of view."""
+    if depth == 0 or board.is_game_over():
+        return evaluate_static(board)
+    scores = []
+    for move in list(board.legal_moves):
+        board.push(move)
+        scores.append(plain_minimax(board, depth - 1))
+        board.pop()
+    return max(scores) if board.turn == chess.WHITE else min(scores)
 
 class TestMinimax(unittest.TestCase):
     def test_static_eval_initial(self):
@@ -26,6 +52,43 @@ class TestMinimax(unittest.TestCase):
         score = evaluate_static(board)
         self.assertGreater(score, 0, "White should be winning with extra pawn")
 
+    def test_material_matches_square_scan(self):
+        rng = random.Random(7)
+        for fen in [chess.STARTING_FEN, "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1"]:
+            board = chess.Board(fen)
+            context = SearchContext()
+            context.set_root(board)
+            for _ in range(200):
+                self.assertEqual(material_score(board), square_scan_material(board))
+                self.assertEqual(context.tracker.score(), square_scan_material(board))
+                self.assertEqual(context.evaluate(board), evaluate_static(board))
+                moves = list(board.legal_moves)
+                if not moves:
+                    break
+                context.push(board, rng.choice(moves))
+            while board.move_stack:
+                context.pop(board)
+            self.assertEqual(context.tracker.score(), material_score(board))
+
+    def test_has_legal_move(self):
+        # Stalemate, a rook pinned with the king boxed in, checkmate, and random games
+        fens = ["7k/5Q2/6K1/8/8/8/8/8 b - - 0 1", "k7/r7/1Q6/8/8/8/8/R5K1 b - - 0 1",
+                "rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3"]
+        rng = random.Random(11)
+        for _ in range(300):
+            board = chess.Board()
+            for _ in range(rng.randrange(1, 150)):
+                moves = list(board.legal_moves)
+                if not moves:
+                    break
+                board.push(rng.choice(moves))
+            fens.append(board.fen())
+        for fen in fens:
+            board = chess.Board(fen)
+            self.assertEqual(_has_legal_move(board), any(board.generate_legal_moves()), fen)
+        self.assertFalse(_has_legal_move(chess.Board(fens[0])))
+        self.assertTrue(_has_legal_move(chess.Board(fens[1])))
+
     def test_minimax_mate_in_one(self):
         # White to move and mate
         board = chess.Board("7k/R7/8/8/8/8/8/7K w - - 0 1")
@@ -40,5 +103,117 @@ class TestMinimax(unittest.TestCase):
         best_move = select_best_move(board, depth=1)
         self.assertEqual(best_move, chess.Move.from_uci("a7a8"), "Should find mate in 1")
 
+    def test_minimax_matches_plain_search(self):
+        for fen in ["r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+                    "2r3k1/pp3ppp/8/3p4/8/1P3NP1/P4P1P/4R1K1 b - - 0 1",
+                    # Mates and stalemates within reach
+                    "7k/8/5Q1K/8/8/8/8/8 w - - 0 1",
+                    "k7/2Q5/1K6/8/8/8/8/8 b - - 0 1",
+                    # Capturing the last rook leaves insufficient material
+                    "8/8/4k3/3r4/8/3NK3/8/8 w - - 0 1",
+                    # Seventy-five-move rule on the next reversible ply
+                    "8/8/4k3/8/8/3RK3/8/8 w - - 149 120"]:
+            board = chess.Board(fen)
+            expected = plain_minimax(board, 2)
+            maximizing = board.turn == chess.WHITE
+            self.assertEqual(minimax(board, 2, -math.inf, math.inf, maximizing), expected, fen)
+            self.assertEqual(minimax(board, 2, -math.inf, math.inf, maximizing, tt=TranspositionTable()), expected)
+
+    def test_hybrid_mode_still_works(self):
+        board = chess.Board("4k3/R7/8/8/8/8/8/4K3 w - - 0 1")
+        best_move = select_best_move(board, depth=1, use_mc=True, rollout_count=5)
+        self.assertEqual(best_move, chess.Move.from_uci("a7a8"))
+
+    def test_quiescence_avoids_defended_pawn(self):
+        # The d5 pawn is defended by c6; grabbing it with the queen loses the queen
+        board = chess.Board("4k3/8/2p5/3p4/8/8/8/3QK3 w - - 0 1")
+        grab = chess.Move.from_uci("d1d5")
+        self.assertEqual(select_best_move(board, depth=1), grab, "Horizon effect without quiescence")
+        self.assertNotEqual(select_best_move(board, depth=1, quiescence=True), grab)
+
+        stats = SearchStats()
+        move = select_best_move(board, depth=1, use_mc=True, rollout_count=2, quiescence=True, stats=stats)
+        self.assertIn(move, board.legal_moves)
+        self.assertGreater(stats.qnodes, 0, "Hybrid mode should run the quiescence search too")
+
+    def test_quiescence_node_limit(self):
+        board = chess.Board("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+        limited, unlimited = SearchStats(), SearchStats()
+        select_best_move(board, depth=2, quiescence=True, qsearch_node_limit=2, stats=limited)
+        select_best_move(board, depth=2, quiescence=True, stats=unlimited)
+        self.assertGreater(limited.qnodes, 0)
+        self.assertLess(limited.qnodes, unlimited.qnodes)
+
+    def test_null_move_and_lmr_reduce_nodes(self):
+        board = chess.Board("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+        plain, pruned = SearchStats(), SearchStats()
+        select_best_move(board, depth=4, stats=plain)
+        move = select_best_move(board, depth=4, null_move=True, lmr=True, stats=pruned)
+        self.assertIn(move, board.legal_moves)
+        self.assertLess(pruned.nodes, plain.nodes)
+        self.assertGreater(pruned.lmr_reductions, 0)
+
+    def test_null_move_keeps_mate(self):
+        board = chess.Board("4k3/R7/8/8/8/8/8/4K3 w - - 0 1")
+        self.assertEqual(select_best_move(board, depth=3, null_move=True, lmr=True), chess.Move.from_uci("a7a8"))
+
+    def test_no_null_move_in_pawn_endings(self):
+        # Zugzwang: only king and pawns for the side to move
+        board = chess.Board("8/8/p7/P7/8/1K6/8/k7 w - - 0 1")
+        stats = SearchStats()
+        select_best_move(board, depth=5, null_move=True, stats=stats)
+        self.assertEqual(stats.null_move_cutoffs, 0)
+
+    def test_search_result(self):
+        board = chess.Board("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+        result = search(board, depth=3)
+        self.assertEqual(result.best_move, select_best_move(board, depth=3))
+        self.assertEqual(result.depth, 3)
+        self.assertEqual(result.pv[0], result.best_move)
+        self.assertEqual(len(result.pv), 3)
+        self.assertGreater(result.nodes, 0)
+        self.assertGreater(result.stats.tt_probes, 0)
+        self.assertTrue(0.0 <= result.stats.tt_hit_rate <= 1.0)
+        summary = result.to_dict()
+        self.assertEqual(summary["move"], result.best_move.uci())
+        self.assertEqual(summary["pv"][0], summary["move"])
+
+    def test_search_result_score_is_white_relative(self):
+        board = chess.Board("4k3/8/8/8/8/8/r7/4K3 b - - 0 1")
+        self.assertLess(search(board, depth=1).score, 0, "Black is a rook up")
+
+    def test_time_limit_finds_mate(self):
+        board = chess.Board("4k3/R7/8/8/8/8/8/4K3 w - - 0 1")
+        best_move = select_best_move(board, depth=3, time_limit=5.0)
+        self.assertEqual(best_move, chess.Move.from_uci("a7a8"))
+
+    def test_time_limit_matches_fixed_depth(self):
+        board = chess.Board("r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4")
+        self.assertEqual(select_best_move(board, depth=3, time_limit=60.0), select_best_move(board, depth=3))
+
+    def test_time_limit_aborts_cleanly(self):
+        board = chess.Board("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+        fen = board.fen()
+        start = time.time()
+        best_move = select_best_move(board, depth=None, time_limit=0.3)
+        self.assertLess(time.time() - start, 2.0)
+        self.assertIn(best_move, board.legal_moves)
+        self.assertEqual(board.fen(), fen, "Board must be restored after an aborted search")
+        self.assertEqual(len(board.move_stack), 0)
+
+    def test_terminal_root(self):
+        # White is checkmated (fool's mate); Black is stalemated
+        mate = chess.Board("rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3")
+        stalemate = chess.Board("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1")
+        for options in ({"depth": None, "time_limit": 1.0}, {"depth": 3}, {"depth": 3, "use_mc": True}):
+            result = search(mate, **options)
+            self.assertIsNone(result.best_move)
+            self.assertEqual(result.depth, 0)
+            self.assertLess(result.score, 0)
+            result = search(stalemate, **options)
+            self.assertIsNone(result.best_move)
+            self.assertEqual(result.depth, 0)
+            self.assertEqual(result.score, 0)
+
 if __name__ == "__main__":
     unittest.main()
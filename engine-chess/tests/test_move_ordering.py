@@ -0,0 +1,76 @@
+"""
+Tests for Move Ordering.
+"""
+
+import unittest
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chess
+from minimax.minimax_ab import select_best_move
+from minimax.move_ordering import MoveOrderer, mvv_lva
+from minimax.stats import SearchStats
+
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+
+class TestMoveOrdering(unittest.TestCase):
+    def test_mvv_lva(self):
+        # Pawn and queen can both take the rook on d5
+        board = chess.Board("4k3/8/8/3r4/4P3/8/8/3QK3 w - - 0 1")
+        pawn_takes = chess.Move.from_uci("e4d5")
+        queen_takes = chess.Move.from_uci("d1d5")
+        self.assertGreater(mvv_lva(board, pawn_takes), mvv_lva(board, queen_takes))
+
+    def test_order_moves(self):
+        board = chess.Board("4k3/8/8/3r4/4P3/8/8/3QK3 w - - 0 1")
+        orderer = MoveOrderer()
+        hash_move = chess.Move.from_uci("e1f2")
+        ordered = orderer.order_moves(board, list(board.legal_moves), 0, hash_move)
+        self.assertEqual(ordered[0], hash_move)
+        self.assertEqual(ordered[1], chess.Move.from_uci("e4d5"))
+        self.assertEqual(ordered[2], chess.Move.from_uci("d1d5"))
+        self.assertEqual(len(ordered), board.legal_moves.count())
+
+    def test_killer_and_history(self):
+        board = chess.Board()
+        orderer = MoveOrderer()
+        killer = chess.Move.from_uci("g1f3")
+        orderer.record_cutoff(board, killer, 2, 3)
+        self.assertEqual(orderer.order_moves(board, list(board.legal_moves), 2)[0], killer)
+        self.assertGreater(orderer.history[orderer._history_index(chess.WHITE, killer)], 0)
+
+    def test_staged_moves_cover_legal_moves(self):
+        board = chess.Board("r3k3/1P6/8/8/8/8/8/R3K2R w KQq - 0 1")
+        orderer = MoveOrderer()
+        killer = chess.Move.from_uci("e1g1")
+        orderer.record_cutoff(board, killer, 0, 2)
+        hash_move = chess.Move.from_uci("a1a7")
+        staged = list(orderer.staged_moves(board, 0, hash_move))
+        self.assertEqual(sorted(staged, key=str), sorted(board.legal_moves, key=str))
+        self.assertEqual(staged[0], hash_move)
+        captures = [move for move in staged[1:] if board.is_capture(move)]
+        self.assertEqual(staged[1:1 + len(captures)], captures, "Captures come right after the hash move")
+        self.assertLess(staged.index(chess.Move.from_uci("b7b8q")), staged.index(killer))
+
+    def test_staged_moves_are_lazy(self):
+        board = chess.Board(KIWIPETE)
+        moves = MoveOrderer().staged_moves(board)
+        first = next(moves)
+        self.assertTrue(board.is_capture(first), "Quiet moves are not generated before the captures are used up")
+
+    def test_ordering_reduces_nodes(self):
+        board = chess.Board(KIWIPETE)
+        before, after = SearchStats(), SearchStats()
+        move_before = select_best_move(board, depth=3, use_ordering=False, stats=before)
+        move_after = select_best_move(board, depth=3, stats=after)
+        print(f"\nDepth 3 nodes: {before.nodes} -> {after.nodes}, "
+              f"first-move cutoff rate: {before.first_move_cutoff_rate:.2f} -> {after.first_move_cutoff_rate:.2f}")
+        self.assertEqual(move_before, move_after)
+        self.assertLess(after.nodes, before.nodes)
+        self.assertGreater(after.first_move_cutoff_rate, before.first_move_cutoff_rate)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+"""
+Tests for Root-Parallel Search.
+"""
+
+import unittest
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chess
+from minimax.minimax_ab import select_best_move
+from minimax.parallel import select_best_move_parallel, shutdown_pool
+from minimax.stats import SearchStats
+
+POSITIONS = [
+    "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "2r3k1/pp3ppp/8/3p4/8/1P3NP1/P4P1P/4R1K1 b - - 0 1",
+]
+
+class TestParallel(unittest.TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutdown_pool()
+
+    def test_matches_serial_search(self):
+        for fen in POSITIONS:
+            board = chess.Board(fen)
+            self.assertEqual(select_best_move(board, depth=3, workers=2), select_best_move(board, depth=3), fen)
+
+    def test_mate_in_one(self):
+        board = chess.Board("4k3/R7/8/8/8/8/8/4K3 w - - 0 1")
+        self.assertEqual(select_best_move_parallel(board, depth=2, workers=2), chess.Move.from_uci("a7a8"))
+
+    def test_collects_worker_nodes(self):
+        stats = SearchStats()
+        board = chess.Board(POSITIONS[0])
+        select_best_move_parallel(board, depth=2, workers=2, stats=stats)
+        self.assertGreater(stats.nodes, board.legal_moves.count())
+        self.assertEqual(len(board.move_stack), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Tests for parallel Monte Carlo rollouts.
+"""
+
+import unittest
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chess
+from minimax.parallel_mc import ParallelRollouts, get_rollout_backend, shutdown_rollout_backend
+from minimax.minimax_ab import search
+
+FENS = [
+    chess.STARTING_FEN,
+    "k7/8/1K6/8/8/8/8/7Q w - - 0 1",
+    "r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4",
+]
+
+class TestParallelMC(unittest.TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutdown_rollout_backend()
+
+    def test_reproducible_with_seed(self):
+        boards = [chess.Board(fen) for fen in FENS]
+        runs = []
+        for _ in range(2):
+            backend = ParallelRollouts(workers=2, seed=7)
+            runs.append((backend.evaluate_many(boards, 20), backend.evaluate(boards[1], 25)))
+            self.assertEqual(backend.rollouts, 3 * 20 + 25)
+            backend.shutdown()
+        self.assertEqual(runs[0], runs[1])
+        for score in runs[0][0]:
+            self.assertTrue(-1.0 <= score <= 1.0)
+
+    def test_scores_do_not_depend_on_earlier_use(self):
+        boards = [chess.Board(fen) for fen in FENS]
+        fresh = ParallelRollouts(workers=2, seed=3)
+        expected = fresh.evaluate_many(boards, 10)
+        fresh.shutdown()
+
+        used = ParallelRollouts(workers=2, seed=3)
+        used.evaluate(boards[0], 15)
+        used.evaluate_many(boards[1:], 5)
+        self.assertEqual(used.evaluate_many(boards, 10), expected)
+        # Nor on how the leaves are batched
+        self.assertEqual(used.evaluate_many(boards[1:], 10), expected[1:])
+        used.shutdown()
+
+    def test_backend_is_persistent(self):
+        backend = get_rollout_backend(2, seed=1)
+        self.assertIs(get_rollout_backend(2, seed=1), backend)
+        self.assertIsNot(get_rollout_backend(2, seed=2), backend)
+
+    def test_search_with_parallel_rollouts(self):
+        board = chess.Board("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+        result = search(board, depth=2, use_mc=True, rollout_count=4, mc_workers=2)
+        # Ra8 mates, whatever the rollouts say
+        self.assertEqual(result.best_move, chess.Move.from_uci("a1a8"))
+        self.assertGreater(result.stats.rollouts, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+Tests for Root-Parallel MCTS.
+"""
+
+import unittest
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chess
+from minimax.mcts import MCTS, select_best_move_mcts
+from minimax.parallel_mcts import search_mcts_parallel, shutdown_pool
+
+class TestParallelMCTS(unittest.TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutdown_pool()
+
+    def test_mate_in_one(self):
+        board = chess.Board("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+        self.assertEqual(select_best_move_mcts(board, iterations=400, workers=2), chess.Move.from_uci("a1a8"))
+        board = chess.Board("k7/8/8/8/8/8/1r3PPP/6K1 b - - 0 1")
+        result = search_mcts_parallel(board, iterations=400, workers=2)
+        self.assertEqual(result.best_move, chess.Move.from_uci("b2b1"))
+        self.assertEqual(result.score, -1000)
+
+    def test_merges_worker_iterations(self):
+        board = chess.Board()
+        result = search_mcts_parallel(board, iterations=101, workers=2, seed=1)
+        self.assertEqual(result.stats.nodes, 101)
+        self.assertIn(result.best_move, board.legal_moves)
+        self.assertEqual(result.pv[0], result.best_move)
+        self.assertEqual(len(board.move_stack), 0)
+
+        # Each worker gets the whole time budget
+        result = search_mcts_parallel(board, time_limit=0.3, workers=2)
+        self.assertGreater(result.stats.nodes, 0)
+        self.assertLess(result.elapsed, 2.0)
+
+    def test_tree_search_dispatches_to_workers(self):
+        board = chess.Board("r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4")
+        board.push_uci("e1g1")
+        tree = MCTS()
+        result = tree.search(board, iterations=60, workers=2)
+        self.assertEqual(result.stats.nodes, 60)
+        self.assertIsNone(tree.root)
+
+        # A finished game has no move
+        result = search_mcts_parallel(chess.Board("k7/1Q6/1K6/8/8/8/8/8 b - - 0 1"), iterations=10, workers=2)
+        self.assertIsNone(result.best_move)
+
+if __name__ == "__main__":
+    unittest.main()
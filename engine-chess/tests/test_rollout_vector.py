@@ -0,0 +1,90 @@
+"""
+Tests for the vectorized rollout simulator.
+"""
+
+import unittest
+import random
+import collections
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chess
+import numpy as np
+from minimax.rollout_vector import Positions, VectorRollouts, play_random_moves
+from minimax.evaluator_mc import evaluate_mc, simulate_random
+from minimax.minimax_ab import search
+
+class TestVectorRollouts(unittest.TestCase):
+    def test_positions_round_trip(self):
+        for fen in [
+            chess.STARTING_FEN,
+            "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+            "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 b kq - 3 1",
+        ]:
+            board = chess.Board(fen)
+            positions = Positions.from_boards([board])
+            self.assertEqual(positions.board(0).epd(), board.epd())
+            self.assertEqual(positions.board(0).halfmove_clock, board.halfmove_clock)
+
+    def test_random_move_is_uniform_over_legal_moves(self):
+        rng = np.random.default_rng(0)
+        for fen in [
+            "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R b KQkq - 0 1",
+            "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 b kq - 0 1",
+            "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+            "r3k2r/8/8/8/8/5b2/8/R3K2R w KQkq - 0 1",
+            "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        ]:
+            board = chess.Board(fen)
+            children = {}
+            for move in board.legal_moves:
+                board.push(move)
+                children[board.epd()] = move
+                board.pop()
+            positions = Positions.from_boards([board] * (200 * len(children)))
+            finished, _ = play_random_moves(positions, rng)
+            self.assertEqual(len(finished), 0)
+            counts = collections.Counter(positions.board(index).epd() for index in range(len(positions)))
+            self.assertEqual(set(counts), set(children), fen)
+            # Each move expects 200 draws; 4 standard deviations is about 57
+            self.assertLess(max(abs(count - 200) for count in counts.values()), 60, fen)
+
+    def test_terminal_positions(self):
+        engine = VectorRollouts(np.random.default_rng(1))
+        boards = [
+            chess.Board("k7/1Q6/1K6/8/8/8/8/8 b - - 0 1"),
+            chess.Board("K7/1q6/1k6/8/8/8/8/8 w - - 0 1"),
+            chess.Board("k7/8/1Q6/8/8/8/8/7K b - - 0 1"),
+            chess.Board("k7/8/8/8/8/8/8/6NK w - - 0 1"),
+        ]
+        self.assertEqual(engine.evaluate_many(boards, 3), [1.0, -1.0, 0.0, 0.0])
+        # A mate on the last allowed ply still counts
+        self.assertEqual(engine.evaluate(boards[0], 2, max_steps=0), 1.0)
+        self.assertEqual(engine.rollouts, 4 * 3 + 2)
+        self.assertEqual(engine.plies, 0)
+
+    def test_matches_simulate_random(self):
+        board = chess.Board("k7/8/1K6/8/8/8/8/6Q1 w - - 0 1")
+        random.seed(1)
+        reference = sum(simulate_random(board) for _ in range(2000)) / 2000
+        engine = VectorRollouts(np.random.default_rng(2))
+        vector = evaluate_mc(board, 4000, engine=engine)
+        # Mate rate is about 14%; 4 standard deviations of the difference is about 0.04
+        self.assertAlmostEqual(vector, reference, delta=0.04)
+        self.assertGreater(engine.plies, 0)
+        self.assertGreater(engine.rollouts_per_sec, 0)
+
+    def test_search_with_vector_rollouts(self):
+        board = chess.Board("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+        result = search(board, depth=2, use_mc=True, rollout_count=4, mc_backend="vector")
+        # Ra8 mates, whatever the rollouts say
+        self.assertEqual(result.best_move, chess.Move.from_uci("a1a8"))
+        self.assertGreater(result.stats.rollouts, 0)
+        with self.assertRaises(ValueError):
+            search(board, depth=1, use_mc=True, mc_backend="gpu")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Tests for the Stockfish engine pool (skipped when Stockfish is not installed).
+"""
+
+import unittest
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chess
+import chess.engine
+from stockfish_config import get_default_stockfish_path, validate_stockfish
+from simulation.stockfish_pool import StockfishPool, get_stockfish_pool, shutdown_stockfish_pools
+from simulation.auto_vs_stockfish import analyse_move
+
+STOCKFISH_PATH = get_default_stockfish_path()
+LIMIT = chess.engine.Limit(depth=1)
+
+@unittest.skipUnless(STOCKFISH_PATH and validate_stockfish(STOCKFISH_PATH), "Stockfish not installed")
+class TestStockfishPool(unittest.TestCase):
+    def test_engines_are_reused_across_games(self):
+        pool = StockfishPool(STOCKFISH_PATH, size=1, threads=1, hash_mb=16)
+        try:
+            for _ in range(3):
+                with pool.game() as engine:
+                    self.assertIn(engine.play(chess.Board(), LIMIT).move, chess.Board().legal_moves)
+            self.assertEqual(pool.starts, 1)
+            self.assertEqual(pool.options, {"Threads": 1, "Hash": 16})
+        finally:
+            pool.close()
+
+    def test_crashed_engine_is_restarted(self):
+        pool = StockfishPool(STOCKFISH_PATH, size=1)
+        try:
+            with pool.game() as engine:
+                engine.engine.close()
+            with pool.game() as engine:
+                self.assertIsNotNone(engine.analyse(chess.Board(), LIMIT)["score"])
+            self.assertEqual(pool.restarts, 1)
+        finally:
+            pool.close()
+
+    def test_single_pass_analysis(self):
+        pool = StockfishPool(STOCKFISH_PATH, size=1)
+        board = chess.Board("6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1")
+        try:
+            with pool.game() as engine:
+                best_move, best_score, chosen_score = analyse_move(engine, board, chess.Move.from_uci("a1a8"), LIMIT)
+                self.assertEqual(best_move, chess.Move.from_uci("a1a8"))
+                self.assertEqual(best_score, chosen_score)
+                for mode in ["multipv", "two-pass"]:
+                    best_move, best_score, chosen_score = analyse_move(engine, board, chess.Move.from_uci("a1a2"),
+                                                                       LIMIT, mode)
+                    self.assertGreater(best_score - chosen_score, 1000)
+        finally:
+            pool.close()
+
+    def test_shared_pool(self):
+        pool = get_stockfish_pool(STOCKFISH_PATH)
+        self.assertIs(get_stockfish_pool(STOCKFISH_PATH), pool)
+        self.assertIsNot(get_stockfish_pool(STOCKFISH_PATH, threads=1), pool)
+        shutdown_stockfish_pools()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+Tests for the Transposition Table.
+"""
+
+import unittest
+import sys
+import os
+
+# Add parent directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chess
+from minimax.minimax_ab import select_best_move
+from minimax.stats import SearchStats
+from minimax.transposition import (
+    TranspositionTable, position_key, EXACT, LOWER, REPLACE_ALWAYS
+)
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_store_and_probe(self):
+        tt = TranspositionTable(size=16)
+        board = chess.Board()
+        key = position_key(board)
+        move = chess.Move.from_uci("e2e4")
+        tt.store(key, 3, 12, EXACT, move)
+        entry = tt.probe(key)
+        self.assertEqual((entry.depth, entry.score, entry.flag, entry.best_move), (3, 12, EXACT, move))
+        self.assertIsNone(tt.probe(key + 1))
+
+    def test_depth_preferred_replacement(self):
+        tt = TranspositionTable(size=1)
+        tt.store(1, 5, 10, EXACT)
+        tt.store(2, 2, 20, LOWER)
+        self.assertIsNotNone(tt.probe(1), "Shallower entry should not evict a deeper one")
+        tt.store(2, 5, 20, LOWER)
+        self.assertIsNotNone(tt.probe(2), "Equal depth should replace")
+
+    def test_always_replacement(self):
+        tt = TranspositionTable(size=1, replacement=REPLACE_ALWAYS)
+        tt.store(1, 5, 10, EXACT)
+        tt.store(2, 1, 20, EXACT)
+        self.assertIsNone(tt.probe(1))
+        self.assertEqual(len(tt), 1)
+
+    def test_same_move_with_and_without_tt(self):
+        board = chess.Board("r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4")
+        self.assertEqual(select_best_move(board, depth=3), select_best_move(board, depth=3, use_tt=False))
+
+    def test_fewer_nodes(self):
+        def count_nodes(fen, depth, **kwargs):
+            stats = SearchStats()
+            select_best_move(chess.Board(fen), depth=depth, use_ordering=False, stats=stats, **kwargs)
+            return stats.nodes
+
+        # Start position at depth 5 (measured 0.65), and Fine #70, a pawn
+        # ending full of transpositions, at depth 8 (measured 0.14)
+        for fen, depth, ratio in [(chess.STARTING_FEN, 5, 0.75),
+                                  ("8/k7/3p4/p2P1p2/P2P1P2/8/8/K7 w - - 0 1", 8, 0.25)]:
+            without_tt = count_nodes(fen, depth, use_tt=False)
+            with_tt = count_nodes(fen, depth)
+            print(f"\nDepth {depth} nodes: {without_tt} without TT, {with_tt} with TT ({fen})")
+            self.assertLess(with_tt, ratio * without_tt, fen)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,9 @@ import os
 import chess
 import chess.engine
 import json
+import threading
 import uuid
+from collections import OrderedDict
 from datetime import datetime
 
 # Add engine directory to path
@@ -11,10 +13,59 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'e
 
 from flask import Flask, render_template, request, jsonify, send_from_directory
 from minimax.minimax_ab import select_best_move
+from minimax.eval_cache import EvalCache
+from minimax.mcts import MCTS
+from minimax.parallel_mc import get_rollout_backend, shutdown_rollout_backend
+from minimax.parallel_mcts import shutdown_pool as shutdown_mcts_pool
 from stockfish_config import get_default_stockfish_path
+from simulation.stockfish_pool import get_stockfish_pool
 
 app = Flask(__name__)
 
+# Default thinking time (seconds) per hybrid or MCTS move
+HYBRID_TIME_LIMIT = 5.0
+MCTS_TIME_LIMIT = 5.0
+
+def worker_count(name):
+    """Reads a worker count from the environment, clamped to 1..cpu_count()."""
+    try:
+        workers = int(os.environ.get(name, 1))
+    except ValueError:
+        workers = 1
+    return max(1, min(workers, os.cpu_count() or 1))
+
+# Opt-in with MC_WORKERS=<processes>: hybrid rollouts run on one pool of
+# worker processes, started here and shared by all requests
+MC_WORKERS = worker_count("MC_WORKERS")
+if MC_WORKERS > 1:
+    get_rollout_backend(MC_WORKERS)
+
+# Opt-in with MCTS_WORKERS=<processes>: root-parallel MCTS, one tree per process
+MCTS_WORKERS = worker_count("MCTS_WORKERS")
+
+# Hybrid leaf evaluations, kept for the lifetime of this worker process so
+# consecutive /move requests of a game reuse them
+eval_cache = EvalCache()
+
+# One MCTS tree per game (the game_id sent by the client), re-rooted on the
+# position of each /move request so a game keeps the statistics of the line
+# played; a new game id starts a new tree, and only the MCTS_GAMES most
+# recently used trees are kept
+MCTS_GAMES = 32
+mcts_trees = OrderedDict()
+mcts_lock = threading.Lock()
+
+def get_mcts_tree(game_id):
+    """Returns (tree, lock) of game_id, a fresh tree if game_id is None."""
+    if game_id is None:
+        return MCTS(), threading.Lock()
+    with mcts_lock:
+        entry = mcts_trees.pop(game_id, None) or (MCTS(), threading.Lock())
+        mcts_trees[game_id] = entry
+        while len(mcts_trees) > MCTS_GAMES:
+            mcts_trees.popitem(last=False)
+        return entry
+
 # Setup directories for logs and charts
 RESULTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'engine-chess', 'results'))
 LOGS_DIR = os.path.join(RESULTS_DIR, 'logs')
@@ -72,19 +123,36 @@ class GameLogger:
                 return json.load(f)
         return None
 
-# Initialize Stockfish
-# stockfish_path = get_default_stockfish_path()
-stockfish_engine = None
-print("Stockfish disabled for H2H mode.")
+# Initialize Stockfish: a pool of warm engines shared by the request threads,
+# opt-in with STOCKFISH_ENGINES=<number of engines>
+stockfish_pool = None
+stockfish_engines = int(os.environ.get("STOCKFISH_ENGINES", 0))
+stockfish_path = get_default_stockfish_path() if stockfish_engines else None
+
+if stockfish_path:
+    try:
+        threads = os.environ.get("STOCKFISH_THREADS")
+        hash_mb = os.environ.get("STOCKFISH_HASH")
+        stockfish_pool = get_stockfish_pool(stockfish_path, stockfish_engines,
+                                            threads=int(threads) if threads else None,
+                                            hash_mb=int(hash_mb) if hash_mb else None)
+        print(f"✓ Stockfish loaded from: {stockfish_path} ({stockfish_engines} engines)")
+    except Exception as e:
+        print(f"✗ Failed to load Stockfish: {e}")
+elif stockfish_engines:
+    print("✗ Stockfish not found")
+else:
+    print("Stockfish disabled for H2H mode.")
+
+def stockfish_analyse(board, limit):
+    """Analyses board on an idle engine of the pool."""
+    with stockfish_pool.game(new_game=False) as engine:
+        return engine.analyse(board, limit)
 
-# if stockfish_path:
-#     try:
-#         stockfish_engine = chess.engine.SimpleEngine.popen_uci(stockfish_path)
-#         print(f"✓ Stockfish loaded from: {stockfish_path}")
-#     except Exception as e:
-#         print(f"✗ Failed to load Stockfish: {e}")
-# else:
-#     print("✗ Stockfish not found")
+def stockfish_play(board, limit):
+    """Plays a move on an idle engine of the pool."""
+    with stockfish_pool.game(new_game=False) as engine:
+        return engine.play(board, limit)
 
 @app.route('/')
 def index():
@@ -106,9 +174,9 @@ def move():
 
     # Get evaluation before move (if requested and Stockfish available)
     eval_before = None
-    if evaluate_move and stockfish_engine:
+    if evaluate_move and stockfish_pool:
         try:
-            info = stockfish_engine.analyse(board, chess.engine.Limit(time=0.1))
+            info = stockfish_analyse(board, chess.engine.Limit(time=0.1))
             score = info.get('score')
             if score:
                 eval_before = score.relative.score(mate_score=10000) if score.relative else 0
@@ -117,25 +185,37 @@ def move():
 
     use_mc = (mode == 'hybrid')
     
-    # Optimize parameters for Hybrid mode to prevent timeout
+    # Hybrid mode searches under a time budget to prevent timeout;
+    # depth is then the deepest iteration it may reach
+    time_limit = None
     if use_mc:
-        depth = min(depth, 2)
         rollout_count = rollout
+        time_limit = float(data.get('time_limit', HYBRID_TIME_LIMIT))
     else:
         rollout_count = 30
 
     # Run engine
-    best_move = select_best_move(board, depth=depth, use_mc=use_mc, rollout_count=rollout_count)
+    if mode == 'mcts':
+        # MCTS thinks for a time budget (or a number of iterations), not to a depth
+        iterations = data.get('iterations')
+        tree, tree_lock = get_mcts_tree(data.get('game_id'))
+        with tree_lock:
+            best_move = tree.search(board, iterations=int(iterations) if iterations else None,
+                                    time_limit=float(data.get('time_limit', MCTS_TIME_LIMIT)),
+                                    workers=MCTS_WORKERS).best_move
+    else:
+        best_move = select_best_move(board, depth=depth, use_mc=use_mc, rollout_count=rollout_count, time_limit=time_limit,
+                                     eval_cache=eval_cache, mc_workers=MC_WORKERS)
     
     if best_move:
         # Get evaluation after move (if requested and Stockfish available)
         eval_after = None
         move_quality = None
         
-        if evaluate_move and stockfish_engine and eval_before is not None:
+        if evaluate_move and stockfish_pool and eval_before is not None:
             try:
                 board.push(best_move)
-                info = stockfish_engine.analyse(board, chess.engine.Limit(time=0.1))
+                info = stockfish_analyse(board, chess.engine.Limit(time=0.1))
                 score = info.get('score')
                 if score:
                     # Flip perspective since we moved
@@ -183,7 +263,7 @@ def move():
 
 @app.route('/stockfish_move', methods=['POST'])
 def stockfish_move():
-    if not stockfish_engine:
+    if not stockfish_pool:
         return jsonify({'error': 'Stockfish not available'}), 500
     
     data = request.json
@@ -200,7 +280,7 @@ def stockfish_move():
     eval_before = None
     if evaluate_move:
         try:
-            info = stockfish_engine.analyse(board, chess.engine.Limit(time=0.1))
+            info = stockfish_analyse(board, chess.engine.Limit(time=0.1))
             score = info.get('score')
             if score:
                 eval_before = score.relative.score(mate_score=10000) if score.relative else 0
@@ -208,7 +288,7 @@ def stockfish_move():
             eval_before = None
     
     try:
-        result = stockfish_engine.play(board, chess.engine.Limit(time=time_limit))
+        result = stockfish_play(board, chess.engine.Limit(time=time_limit))
         if result.move:
             # Get evaluation after move (if requested)
             eval_after = None
@@ -217,7 +297,7 @@ def stockfish_move():
             if evaluate_move and eval_before is not None:
                 try:
                     board.push(result.move)
-                    info = stockfish_engine.analyse(board, chess.engine.Limit(time=0.1))
+                    info = stockfish_analyse(board, chess.engine.Limit(time=0.1))
                     score = info.get('score')
                     if score:
                         # Flip perspective since we moved
@@ -502,5 +582,7 @@ if __name__ == '__main__':
         port = int(os.environ.get("PORT", 5000))
         app.run(host="0.0.0.0", port=port, debug=False)
     finally:
-        if stockfish_engine:
-            stockfish_engine.quit()
+        if stockfish_pool:
+            stockfish_pool.close()
+        shutdown_rollout_backend()
+        shutdown_mcts_pool()
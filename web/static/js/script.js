@@ -25,6 +25,11 @@ var currentBatchGame = 0
 var totalBatchGames = 1
 var currentGameMoves = 0
 var moveHistory = [] // Track moves for display and logging
+var gameId = newGameId() // Lets the server keep this game's MCTS tree
+
+function newGameId() {
+    return Date.now().toString(36) + Math.random().toString(36).slice(2, 8)
+}
 
 function onDragStart(source, piece, position, orientation) {
     return false
@@ -49,6 +54,7 @@ function makeAIMove() {
         contentType: 'application/json',
         data: JSON.stringify({
             fen: game.fen(),
+            game_id: gameId,
             depth: depth,
             mode: algorithm,
             rollout: rollout,
@@ -182,6 +188,7 @@ function handleGameEnd() {
         // Use custom FEN for batch games
         var customFEN = getCustomFEN()
         game = new Chess(customFEN)
+        gameId = newGameId()
         board.position(customFEN)
         updateGameStatus('running', game.turn())
         setTimeout(function () {
@@ -351,6 +358,7 @@ $('#newGameBtn').on('click', function () {
     skipMode = false
     if (demoTimeout) clearTimeout(demoTimeout)
     game.reset()
+    gameId = newGameId()
     board.start()
     $status.html('Siap untuk memulai')
     $thinking.addClass('hidden')
@@ -402,6 +410,8 @@ $('#startGameBtn').on('click', function () {
     if (isDemoRunning) return
 
     game.reset()
+
+    gameId = newGameId()
     board.start()
     skipMode = false
 
@@ -541,6 +551,7 @@ $('#newGameBtn').off('click').on('click', function () {
     skipMode = false
     if (demoTimeout) clearTimeout(demoTimeout)
     game.reset()
+    gameId = newGameId()
     board.start()
     $status.html('Siap untuk memulai')
     $thinking.addClass('hidden')
@@ -611,6 +622,7 @@ $('#startGameBtn').off('click').on('click', function () {
 
     // Reset game with custom position
     game = new Chess(customFEN)
+    gameId = newGameId()
     board.position(customFEN)
 
     skipMode = false